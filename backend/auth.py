@@ -1,15 +1,21 @@
-from fastapi import APIRouter, Request, Form, HTTPException, Depends
+import os
+
+from fastapi import APIRouter, Request, Form, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
-from passlib.context import CryptContext
 
 from database import SessionLocal  
 from models import User            
+from password_hashing import hasher, HashingBusy, busy_response
+import schemas, sessions
 
 router = APIRouter()
-pwd_ctx = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 SESSION_COOKIE = "care_for_plants_session"
 
+# Wartungs-Endpoints unter /admin: nur für diese Usernamen (kommagetrennt), Standard: niemand
+ADMIN_USERS = {u.strip() for u in os.getenv("ADMIN_USERS", "").split(",") if u.strip()}
+
 
 def get_db():
     db = SessionLocal()
@@ -19,20 +25,49 @@ def get_db():
         db.close()
 
 
+def _load_user(username: str):
+    db = SessionLocal()
+    try:
+        return db.query(User.id, User.password_hash, User.session_version).filter(User.username == username).first()
+    finally:
+        db.close()
+
+
+def _store_password_hash(user_id: int, password_hash: str):
+    db = SessionLocal()
+    try:
+        db.query(User).filter(User.id == user_id).update({"password_hash": password_hash})
+        db.commit()
+    finally:
+        db.close()
+
+
 @router.post("/login")
-def login(
+async def login(
     username: str = Form(...),
-    password: str = Form(...),
-    db=Depends(get_db)
+    password: str = Form(...)
 ):
-    user = db.query(User).filter(User.username == username).first()
-    if not user or not pwd_ctx.verify(password, user.password_hash):
+    # DB kurz im Threadpool, bcrypt auf dem eigenen begrenzten Pool -> Event-Loop bleibt frei
+    user = await run_in_threadpool(_load_user, username)
+    if not user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
+    try:
+        ok, new_hash = await hasher.verify_and_update(password, user.password_hash)
+    except HashingBusy:
+        raise busy_response()
+    if not ok:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+
+    # Kostenfaktor hat sich geändert -> Hash transparent erneuern
+    if new_hash:
+        await run_in_threadpool(_store_password_hash, user.id, new_hash)
+
     resp = JSONResponse({"message": "login successful"})
     resp.set_cookie(
         key=SESSION_COOKIE,
-        value=str(user.id),   # << user_id in cookie
+        value=sessions.issue(user.id, username, user.session_version or 0),   # << signiertes Token statt roher user_id
+        max_age=sessions.SESSION_TTL_SECONDS,
         httponly=True,
         samesite="lax"
     )
@@ -40,25 +75,38 @@ def login(
 
 
 @router.post("/logout")
-def logout():
+def logout(request: Request):
+    token = request.cookies.get(SESSION_COOKIE)
+    principal = sessions.principal_cache.get(token) if token else None
+    if principal is not None:
+        # Session-Version hochzählen: das Token (und alle anderen des Users) gilt ab jetzt nicht mehr
+        sessions.revoke(principal.user_id)
     resp = JSONResponse({"message": "logged out"})
     resp.delete_cookie(SESSION_COOKIE)
     return resp
 
 
-@router.get("/me")
-def me(request: Request, db=Depends(get_db)):
-    uid = request.cookies.get(SESSION_COOKIE)
-    if not uid:
+def current_principal(request: Request):
+    # Token wird im Prozess geprüft (HMAC + Ablauf) und gecacht -> keine DB-Abfrage
+    token = request.cookies.get(SESSION_COOKIE)
+    principal = sessions.principal_cache.get(token) if token else None
+    if principal is None:
         raise HTTPException(status_code=401, detail="Not authenticated")
-    user = db.query(User).filter(User.id == int(uid)).first()
-    if not user:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    return {"id": user.id, "username": user.username}
+    return principal
+
+
+@router.get("/me", response_model=schemas.MeOut)
+def me(request: Request):
+    principal = current_principal(request)
+    return {"id": principal.user_id, "username": principal.username}
 
 
 def require_login(request: Request):
-    uid = request.cookies.get(SESSION_COOKIE)
-    if not uid:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    return int(uid)
\ No newline at end of file
+    return current_principal(request).user_id
+
+
+def require_admin(request: Request):
+    principal = current_principal(request)
+    if principal.username not in ADMIN_USERS:
+        raise HTTPException(status_code=403, detail="Admin rights required")
+    return principal.user_id
@@ -0,0 +1,474 @@
+# backend/bulk_import.py
+"""
+Sammel-Import von Standorten, Wunschliste und Pflanzen aus CSV oder JSONL (z.B. Bestand eines Ladens).
+
+Satzarten (Feld/Spalte "type", sonst default_type):
+- location:   name, light_level, humidity_level, temperature_avg, available_space_cm, has_pets_or_children
+- plant_info: eigene Pflegewerte (trefle_id, Namen, *_frequency_days, Anforderungen) -> Fork des Users
+- wishlist:   trefle_id
+- plant:      nickname, trefle_id, location (Name) oder location_id, optional date_acquired, last_watered ...
+Standorte und PlantInfos müssen vor den Zeilen stehen, die sie verwenden (wie im Export).
+
+Dateien aus GET /export lassen sich direkt wieder importieren, auch in ein anderes Konto:
+die "id" der Standort- und PlantInfo-Zeilen wird auf die neuen (oder gleichnamig schon vorhandenen)
+Einträge abgebildet, location_id/plant_info_id späterer Zeilen darüber aufgelöst.
+Eine exportierte plant_info_id ohne PlantInfo-Zeile verweist auf den geteilten Katalog-Eintrag.
+
+Ablauf:
+- die Datei wird zeilenweise gelesen und validiert, nie komplett geladen
+- gültige Zeilen werden in Batches je Transaktion geschrieben (Sammel-INSERTs)
+- unbekannte trefle_ids werden pro Batch parallel bei Trefle nachgeladen (begrenzt auf CONCURRENCY)
+- Kompatibilität (plant_location_compatibility) wird im selben Batch nachgezogen -> bricht der Import ab
+  (Client weg, Fehler), passen die schon geschriebenen Batches trotzdem
+- nach jedem Batch ein Fortschritts-Event, fehlerhafte Zeilen als eigene Events mit Zeilennummer
+"""
+import csv
+import io
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from types import SimpleNamespace
+
+import orjson
+from pydantic import BaseModel, ValidationError, root_validator
+from sqlalchemy import insert, or_
+
+import care_schedule
+import compatibility
+import data_version
+import enrichment
+import models
+from database import SessionLocal
+from services import trefle_service
+
+# Gültige Zeilen pro Transaktion
+BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "500"))
+# Gleichzeitige Trefle-Abfragen für unbekannte trefle_ids
+CONCURRENCY = int(os.getenv("IMPORT_TREFLE_CONCURRENCY", "4"))
+# Danach werden Fehler nur noch gezählt
+MAX_REPORTED_ERRORS = 1000
+
+FORMATS = ("csv", "jsonl")
+INTERVAL_FIELDS = [interval_field for _, _, interval_field, _, _ in care_schedule.TASKS]
+
+
+class LocationRow(BaseModel):
+    id: int = None  # id im Export -> location_id der Pflanzen-Zeilen
+    name: str
+    light_level: int = 5
+    humidity_level: int = 5
+    temperature_avg: int = 20
+    available_space_cm: int = 200
+    has_pets_or_children: bool = False
+
+
+class PlantInfoRow(BaseModel):
+    id: int = None  # id im Export -> plant_info_id der Wunschlisten-/Pflanzen-Zeilen
+    trefle_id: int = None
+    scientific_name: str = None
+    common_name: str = None
+    family: str = None
+    genus: str = None
+    image_url: str = None
+    water_frequency_days: int = 7
+    fertilize_frequency_days: int = 30
+    repot_frequency_days: int = 730
+    prune_frequency_days: int = 90
+    propagate_frequency_days: int = 180
+    sunlight_requirement: int = 5
+    humidity_requirement: int = 5
+    temperature_min: int = 15
+    temperature_max: int = 25
+    max_height_cm: int = 100
+    soil_type: str = "universal"
+    is_toxic: bool = False
+
+
+class WishlistRow(BaseModel):
+    trefle_id: int
+    plant_info_id: int = None
+
+
+class PlantRow(BaseModel):
+    nickname: str
+    trefle_id: int = None
+    plant_info_id: int = None
+    location: str = None
+    location_id: int = None
+    date_acquired: date = None
+    last_watered: date = None
+    last_fertilized: date = None
+    last_repotted: date = None
+    last_pruned: date = None
+    last_propagated: date = None
+
+    @root_validator(skip_on_failure=True)
+    def needs_references(cls, values):
+        if values.get("trefle_id") is None and values.get("plant_info_id") is None:
+            raise ValueError("trefle_id fehlt")
+        if values.get("location") is None and values.get("location_id") is None:
+            raise ValueError("location oder location_id fehlt")
+        return values
+
+
+ROW_MODELS = {"location": LocationRow, "plant_info": PlantInfoRow, "wishlist": WishlistRow, "plant": PlantRow}
+
+
+def _validation_message(error: ValidationError):
+    return "; ".join(f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in error.errors())
+
+
+def iter_rows(fileobj, fmt: str):
+    """(Zeilennummer, dict oder None, Fehlertext) je Datensatz, liest die (Binär-)Datei zeilenweise"""
+    if fmt == "jsonl":
+        for line_no, line in enumerate(fileobj, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = orjson.loads(line)
+            except orjson.JSONDecodeError as e:
+                yield line_no, None, f"ungültiges JSON: {e}"
+                continue
+            if isinstance(record, dict):
+                yield line_no, record, None
+            else:
+                yield line_no, None, "Zeile ist kein JSON-Objekt"
+        return
+
+    text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+    try:
+        reader = csv.DictReader(text)
+        for record in reader:
+            # Leere Zellen wie fehlende Felder behandeln (-> Defaults)
+            yield reader.line_num, {k: v for k, v in record.items() if k and v not in ("", None)}, None
+    except (UnicodeDecodeError, csv.Error) as e:
+        yield None, None, f"Datei nicht lesbar: {e}"
+    finally:
+        text.detach()  # Upload-Datei gehört dem Aufrufer
+
+
+def parse(kind: str, record: dict):
+    """Validiert einen Datensatz der Satzart kind -> Row-Modell oder ValueError (unbekannte Felder wie id werden ignoriert)"""
+    if kind not in ROW_MODELS:
+        raise ValueError(f"unbekannte Satzart: {kind!r}" if kind else "type fehlt")
+    try:
+        return ROW_MODELS[kind](**{k: v for k, v in record.items() if k != "type"})
+    except ValidationError as e:
+        raise ValueError(_validation_message(e))
+
+
+class Importer:
+    """Zustand eines Imports über alle Batches: bekannte Standorte, Wunschliste, PlantInfos"""
+
+    def __init__(self, user_id: int, executor):
+        self.user_id = user_id
+        self.executor = executor
+        self.created = {"location": 0, "plant_info": 0, "wishlist": 0, "plant": 0}
+        self.skipped = {"location": 0, "plant_info": 0, "wishlist": 0}
+        self.locations = {}      # Name -> id
+        self.location_ids = set()
+        self.wished = set()      # trefle_ids auf der Wunschliste
+        self.forks = {}          # trefle_id -> id der eigenen PlantInfo
+        self.in_use = set()      # plant_info_ids auf Wunschliste/im Bestand (haben Kompatibilitäts-Zeilen)
+        self.infos = {}          # trefle_id -> SimpleNamespace(id, *_frequency_days) oder None (nicht gefunden)
+        self.shared_infos = {}   # wie infos, aber nur Katalog-Einträge (ohne owner)
+        self.info_by_id = {}     # plant_info_id -> SimpleNamespace (eigene PlantInfos aus der Datei)
+        # ids aus der Datei -> ids in der DB (nur aus erfolgreich geschriebenen Batches)
+        self.location_map = {}
+        self.info_map = {}
+        self.enriched = 0
+
+    def load(self, db):
+        """(Neu) laden, auch nach einem verworfenen Batch: dessen ids gibt es dann nicht mehr"""
+        self.locations = {}
+        self.location_ids = set()
+        self.infos = {}
+        self.shared_infos = {}
+        self.info_by_id = {}
+        for location_id, name in db.query(models.Location.id, models.Location.name).filter(
+                models.Location.user_id == self.user_id):
+            self.locations.setdefault(name, location_id)
+            self.location_ids.add(location_id)
+        self.wished = {t for (t,) in db.query(models.Wishlist.trefle_id).filter(models.Wishlist.user_id == self.user_id)}
+        self.forks = {}
+        for info_id, trefle_id in (
+            db.query(models.PlantInfo.id, models.PlantInfo.trefle_id)
+            .filter(models.PlantInfo.owner_user_id == self.user_id, models.PlantInfo.trefle_id.isnot(None))
+            .order_by(models.PlantInfo.id)
+        ):
+            self.forks.setdefault(trefle_id, info_id)
+        self.in_use = {i for (i,) in db.query(models.Wishlist.plant_info_id).filter(models.Wishlist.user_id == self.user_id)}
+        self.in_use |= {i for (i,) in db.query(models.MyPlant.plant_info_id).filter(models.MyPlant.user_id == self.user_id)}
+
+    def _resolve_infos(self, db, trefle_ids, shared: bool = False):
+        """
+        trefle_ids -> PlantInfo (eigener Fork vor Katalog, mit shared=True nur Katalog);
+        fehlende parallel bei Trefle holen
+        """
+        cache = self.shared_infos if shared else self.infos
+        missing = {t for t in trefle_ids if t not in cache}
+        if not missing:
+            return
+        owner_filter = (
+            models.PlantInfo.owner_user_id.is_(None) if shared
+            else or_(models.PlantInfo.owner_user_id.is_(None), models.PlantInfo.owner_user_id == self.user_id)
+        )
+        rows = (
+            db.query(models.PlantInfo.id, models.PlantInfo.trefle_id, models.PlantInfo.owner_user_id,
+                     *[getattr(models.PlantInfo, f) for f in INTERVAL_FIELDS])
+            .filter(models.PlantInfo.trefle_id.in_(missing), owner_filter)
+            .order_by(models.PlantInfo.owner_user_id.is_(None), models.PlantInfo.id)
+            .all()
+        )
+        for row in rows:
+            if row.trefle_id in missing:
+                cache[row.trefle_id] = SimpleNamespace(id=row.id, **{f: getattr(row, f) for f in INTERVAL_FIELDS})
+                missing.discard(row.trefle_id)
+        if not missing:
+            return
+
+        # Unbekannt im Katalog -> Trefle, höchstens CONCURRENCY Anfragen gleichzeitig
+        ordered = sorted(missing)
+        created = []
+        for trefle_id, details in zip(ordered, self.executor.map(trefle_service.get_plant_details, ordered)):
+            if not details:
+                cache[trefle_id] = None
+                continue
+            info = models.PlantInfo(trefle_id=trefle_id)
+            enrichment.apply_details(info, details)
+            db.add(info)
+            created.append(info)
+        db.flush()
+        for info in created:
+            cache[info.trefle_id] = SimpleNamespace(id=info.id, **{f: getattr(info, f) for f in INTERVAL_FIELDS})
+        self.enriched += len(created)
+
+    def _info_for(self, row, info_map):
+        """PlantInfo einer Wunschlisten-/Pflanzen-Zeile (nach _resolve_infos), None = nicht gefunden"""
+        if row.plant_info_id is None:
+            return self.infos.get(row.trefle_id)
+        mapped = info_map.get(row.plant_info_id)
+        if mapped is not None:
+            return self.info_by_id.get(mapped)
+        # Exportierter Verweis ohne eigene PlantInfo-Zeile -> geteilter Katalog-Eintrag
+        return self.shared_infos.get(row.trefle_id)
+
+    def _load_info_namespaces(self, db, info_ids):
+        missing = [i for i in info_ids if i not in self.info_by_id]
+        if not missing:
+            return
+        for row in (
+            db.query(models.PlantInfo.id, *[getattr(models.PlantInfo, f) for f in INTERVAL_FIELDS])
+            .filter(models.PlantInfo.id.in_(missing))
+        ):
+            self.info_by_id[row.id] = SimpleNamespace(id=row.id, **{f: getattr(row, f) for f in INTERVAL_FIELDS})
+
+    def run_batch(self, db, batch):
+        """Schreibt einen Batch gültiger Zeilen [(Zeilennummer, Satzart, Row)], gibt Zeilenfehler zurück"""
+        errors = []
+        today = date.today()
+
+        # Abbildung der Datei-ids gilt erst nach dem Commit (ein verworfener Batch hinterlässt keine ids)
+        location_map = dict(self.location_map)
+        info_map = dict(self.info_map)
+
+        # 1) Standorte und eigene PlantInfos zuerst, damit Zeilen im selben Batch sie finden
+        new_locations = []
+        mapped_locations = []
+        new_infos = []
+        mapped_infos = []
+        for line_no, kind, row in batch:
+            if kind == "location":
+                if row.name in self.locations:
+                    # Gleichnamiger Standort existiert schon -> den verwenden
+                    self.skipped["location"] += 1
+                    mapped_locations.append((row.id, row.name))
+                    continue
+                location = models.Location(user_id=self.user_id, **row.dict(exclude={"id"}))
+                db.add(location)
+                self.locations[row.name] = None
+                new_locations.append((row.id, location))
+            elif kind == "plant_info":
+                if row.trefle_id is not None and row.trefle_id in self.forks:
+                    # Eigene Version dieser Pflanze gibt es schon -> die verwenden
+                    self.skipped["plant_info"] += 1
+                    mapped_infos.append((row.id, self.forks[row.trefle_id]))
+                    continue
+                info = models.PlantInfo(owner_user_id=self.user_id, enrichment_status="ready",
+                                        **row.dict(exclude={"id"}))
+                db.add(info)
+                new_infos.append((row.id, info))
+        if new_locations or new_infos:
+            db.flush()
+        for file_id, location in new_locations:
+            self.locations[location.name] = location.id
+            self.location_ids.add(location.id)
+            if file_id is not None:
+                location_map[file_id] = location.id
+        for file_id, name in mapped_locations:
+            if file_id is not None:
+                location_map[file_id] = self.locations[name]
+        for file_id, info in new_infos:
+            namespace = SimpleNamespace(id=info.id, **{f: getattr(info, f) for f in INTERVAL_FIELDS})
+            self.info_by_id[info.id] = namespace
+            if info.trefle_id is not None:
+                self.forks.setdefault(info.trefle_id, info.id)
+                self.infos[info.trefle_id] = namespace  # eigener Fork geht vor
+            if file_id is not None:
+                info_map[file_id] = info.id
+        for file_id, info_id in mapped_infos:
+            if file_id is not None:
+                info_map[file_id] = info_id
+
+        # 2) Alle PlantInfos des Batches auf einmal auflösen
+        refs = [row for _, kind, row in batch if kind in ("wishlist", "plant")]
+        self._load_info_namespaces(db, {info_map[r.plant_info_id] for r in refs if r.plant_info_id in info_map})
+        self._resolve_infos(db, {r.trefle_id for r in refs if r.plant_info_id is None})
+        self._resolve_infos(db, {r.trefle_id for r in refs if r.plant_info_id is not None
+                                 and r.plant_info_id not in info_map and r.trefle_id is not None}, shared=True)
+
+        wishlist_rows = []
+        plant_rows = []
+        for line_no, kind, row in batch:
+            if kind not in ("wishlist", "plant"):
+                continue
+            info = self._info_for(row, info_map)
+            if info is None:
+                what = row.trefle_id if row.trefle_id is not None else f"(plant_info_id {row.plant_info_id})"
+                errors.append({"row": line_no, "type": kind, "error": f"Pflanze {what} nicht gefunden"})
+                continue
+
+            if kind == "wishlist":
+                if row.trefle_id in self.wished:
+                    self.skipped["wishlist"] += 1
+                    continue
+                self.wished.add(row.trefle_id)
+                wishlist_rows.append({"user_id": self.user_id, "trefle_id": row.trefle_id,
+                                      "plant_info_id": info.id, "added_date": today})
+                continue
+
+            if row.location_id is not None and row.location_id in location_map:
+                location_id = location_map[row.location_id]
+            elif row.location is not None:
+                location_id = self.locations.get(row.location)
+            else:
+                location_id = row.location_id  # vorhandener Standort des Users
+            if location_id not in self.location_ids:
+                errors.append({"row": line_no, "type": kind, "error": "Standort nicht gefunden"})
+                continue
+            acquired = row.date_acquired or today
+            values = {
+                "user_id": self.user_id,
+                "nickname": row.nickname,
+                "plant_info_id": info.id,
+                "location_id": location_id,
+                "date_acquired": acquired,
+            }
+            for _, last_col, _, _, _ in care_schedule.TASKS:
+                # Wie beim Anlegen über die Wunschliste: ohne Angabe gilt "heute erledigt"
+                values[last_col] = getattr(row, last_col) or acquired
+            values.update(care_schedule.due_dates(values, acquired, info))
+            plant_rows.append(values)
+
+        # 3) Sammel-INSERTs (laufen am Flush vorbei -> Version selbst hochzählen)
+        if wishlist_rows:
+            db.execute(insert(models.Wishlist), wishlist_rows)
+        if plant_rows:
+            db.execute(insert(models.MyPlant), plant_rows)
+        if wishlist_rows or plant_rows:
+            data_version.bump(db, self.user_id)
+
+        # 4) Kompatibilität in derselben Transaktion: neue Standorte gegen alles, neu verwendete PlantInfos
+        #    gegen die bisherigen Standorte
+        added_infos = {r["plant_info_id"] for r in wishlist_rows + plant_rows} - self.in_use
+        compatibility.refresh_user_additions(db, self.user_id, [l for _, l in new_locations], added_infos)
+        db.commit()
+
+        self.in_use |= added_infos
+        self.location_map = location_map
+        self.info_map = info_map
+        self.created["location"] += len(new_locations)
+        self.created["plant_info"] += len(new_infos)
+        self.created["wishlist"] += len(wishlist_rows)
+        self.created["plant"] += len(plant_rows)
+        return errors
+
+
+def run(fileobj, fmt: str, user_id: int, default_type: str = None, batch_size: int = BATCH_SIZE):
+    """
+    Generator: importiert die Datei und liefert Events (dicts):
+    {"event": "error", "row", "type", "error"}, {"event": "progress", ...} nach jedem Batch, zum Schluss {"event": "done", ...}
+    """
+    started = time.perf_counter()
+    rows_read = 0
+    error_count = 0
+    db = SessionLocal()
+    executor = ThreadPoolExecutor(max_workers=CONCURRENCY, thread_name_prefix="import-trefle")
+    importer = Importer(user_id, executor)
+
+    def error_event(error):
+        nonlocal error_count
+        error_count += 1
+        if error_count <= MAX_REPORTED_ERRORS:
+            return {"event": "error", **error}
+        return None
+
+    def progress(event="progress"):
+        return {
+            "event": event,
+            "rows": rows_read,
+            "created": dict(importer.created),
+            "skipped": dict(importer.skipped),
+            "enriched": importer.enriched,
+            "errors": error_count,
+            "seconds": round(time.perf_counter() - started, 3),
+        }
+
+    def flush(batch):
+        try:
+            errors = importer.run_batch(db, batch)
+        except Exception as e:
+            db.rollback()
+            importer.load(db)
+            lines = [line_no for line_no, _, _ in batch]
+            errors = [{"row": lines[0], "type": None, "error": f"Batch bis Zeile {lines[-1]} verworfen: {e}"}]
+        for error in errors:
+            event = error_event(error)
+            if event:
+                yield event
+        yield progress()
+
+    try:
+        importer.load(db)
+        batch = []
+        for line_no, record, problem in iter_rows(fileobj, fmt):
+            rows_read += 1
+            kind = (record.get("type") or default_type) if record is not None else None
+            if problem is None:
+                try:
+                    row = parse(kind, record)
+                except ValueError as e:
+                    problem = str(e)
+            if problem is not None:
+                event = error_event({"row": line_no, "type": kind, "error": problem})
+                if event:
+                    yield event
+                continue
+
+            batch.append((line_no, kind, row))
+            if len(batch) >= batch_size:
+                yield from flush(batch)
+                batch = []
+        if batch:
+            yield from flush(batch)
+        yield progress("done")
+    finally:
+        executor.shutdown(wait=False)
+        db.close()
+
+
+def stream(fileobj, fmt: str, user_id: int, default_type: str = None):
+    """run() als NDJSON für StreamingResponse"""
+    for event in run(fileobj, fmt, user_id, default_type):
+        yield orjson.dumps(event) + b"\n"
@@ -0,0 +1,150 @@
+# backend/care_events.py
+import os
+import threading
+from datetime import datetime, timezone
+
+from sqlalchemy import insert
+
+import models
+from database import SessionLocal
+
+# Puffer wird geschrieben, sobald so viele Events anliegen ...
+BATCH_SIZE = int(os.getenv("CARE_EVENTS_BATCH_SIZE", "200"))
+# ... oder spätestens nach so vielen Sekunden
+FLUSH_SECONDS = float(os.getenv("CARE_EVENTS_FLUSH_SECONDS", "2"))
+# Obergrenze für den Puffer, falls die DB länger nicht erreichbar ist: älteste Events fallen weg
+MAX_PENDING = int(os.getenv("CARE_EVENTS_MAX_PENDING", "10000"))
+
+
+def _utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class CareEventBuffer:
+    """
+    Write-Behind-Puffer für das Pflege-Journal: Endpoints hängen Events nur im Speicher an,
+    ein Hintergrund-Thread schreibt sie gesammelt mit einem INSERT (executemany) in care_events.
+    Beim Herunterfahren wird der Rest geschrieben; bei einem harten Absturz gehen höchstens
+    die Events der letzten FLUSH_SECONDS verloren.
+    """
+
+    def __init__(self, batch_size: int = BATCH_SIZE, flush_seconds: float = FLUSH_SECONDS,
+                 max_pending: int = MAX_PENDING):
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.max_pending = max_pending
+        self.written = 0
+        self.flushes = 0
+        self.dropped = 0
+        self._pending = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="care-events-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def record(self, plant_id: int, user_id: int, action: str, occurred_at: datetime = None):
+        self.record_many([plant_id], user_id, action, occurred_at)
+
+    def record_many(self, plant_ids, user_id: int, action: str, occurred_at: datetime = None):
+        occurred_at = occurred_at or _utcnow()
+        with self._lock:
+            self._pending.extend(
+                {"plant_id": pid, "user_id": user_id, "action": action, "occurred_at": occurred_at}
+                for pid in plant_ids
+            )
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self._wakeup.set()
+
+    def flush(self):
+        """Schreibt alle gepufferten Events in einer Transaktion. Gibt die Anzahl zurück."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return 0
+            db = SessionLocal()
+            try:
+                db.execute(insert(models.CareEvent), batch)
+                db.commit()
+            except Exception:
+                # Nicht verlieren: vorne wieder einreihen, nächster Versuch beim nächsten Flush
+                db.rollback()
+                with self._lock:
+                    self._pending[:0] = batch
+                    overflow = len(self._pending) - self.max_pending
+                    if overflow > 0:
+                        del self._pending[:overflow]
+                        self.dropped += overflow
+                if overflow > 0:
+                    print(f"Care-Events Puffer voll: {overflow} älteste Events verworfen")
+                raise
+            finally:
+                db.close()
+            self.written += len(batch)
+            self.flushes += 1
+            return len(batch)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wakeup.wait(self.flush_seconds)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Care-Events Flush Fehler: {e}")
+
+    def stats(self):
+        with self._lock:
+            pending = len(self._pending)
+        return {"pending": pending, "written": self.written, "flushes": self.flushes, "dropped": self.dropped,
+                "batch_size": self.batch_size, "flush_seconds": self.flush_seconds,
+                "max_pending": self.max_pending}
+
+
+def history(db, user_id: int, plant_id: int, since: datetime = None, until: datetime = None,
+            limit: int = 50, before_id: int = None):
+    """
+    Events einer Pflanze, neueste zuerst. Blättern per Keyset: before_id = next_before_id der Vorseite.
+    (ids werden beim Flush in Aufnahme-Reihenfolge vergeben)
+    """
+    query = db.query(models.CareEvent).filter(
+        models.CareEvent.plant_id == plant_id,
+        models.CareEvent.user_id == user_id
+    )
+    if since is not None:
+        query = query.filter(models.CareEvent.occurred_at >= since)
+    if until is not None:
+        query = query.filter(models.CareEvent.occurred_at < until)
+    if before_id is not None:
+        query = query.filter(models.CareEvent.id < before_id)
+
+    events = query.order_by(models.CareEvent.id.desc()).limit(limit + 1).all()
+    has_more = len(events) > limit
+    events = events[:limit]
+    return {
+        "events": [
+            {"id": e.id, "action": e.action, "occurred_at": e.occurred_at.isoformat()}
+            for e in events
+        ],
+        "next_before_id": events[-1].id if has_more else None,
+    }
+
+
+buffer = CareEventBuffer()
@@ -0,0 +1,180 @@
+# backend/care_schedule.py
+from datetime import date, timedelta
+
+from sqlalchemy import update
+
+import models
+from services import image_service
+
+# (Aufgabe, last_*-Spalte, Intervall-Feld in PlantInfo, gespeicherte Fälligkeit, Feld im Dashboard)
+TASKS = [
+    ("water", "last_watered", "water_frequency_days", "next_water_due", "days_until_watering"),
+    ("fertilize", "last_fertilized", "fertilize_frequency_days", "next_fertilize_due", "days_until_fertilizing"),
+    ("repot", "last_repotted", "repot_frequency_days", "next_repot_due", "days_until_repotting"),
+    ("prune", "last_pruned", "prune_frequency_days", "next_prune_due", "days_until_pruning"),
+    ("propagate", "last_propagated", "propagate_frequency_days", "next_propagate_due", "days_until_propagating"),
+]
+
+# Pflege-Aktion -> last_*-Spalte
+CARE_ACTIONS = {task: last_col for task, last_col, _, _, _ in TASKS}
+
+# Aktionen, die es auch als Sammelaktion gibt -> Datumsfeld in der Antwort (wie bei den Einzel-Endpoints)
+BULK_ACTIONS = {"water": "watered_on", "fertilize": "fertilized_on", "repot": "repotted_on", "prune": "pruned_on"}
+
+
+def due_dates(last_values: dict, date_acquired, info):
+    """{due_col: Datum} plus "next_any_due" aus last_*-Werten und den Intervallen der PlantInfo"""
+    dues = {}
+    earliest = None
+    for _, last_col, interval_field, due_col, _ in TASKS:
+        last = last_values.get(last_col) or date_acquired
+        interval = getattr(info, interval_field)
+        due = last + timedelta(days=interval) if last is not None and interval is not None else None
+        dues[due_col] = due
+        if due is not None and (earliest is None or due < earliest):
+            earliest = due
+    dues["next_any_due"] = earliest
+    return dues
+
+
+def recompute(plant, plant_info=None):
+    """Setzt next_*_due und next_any_due einer Pflanze aus last_* + Intervallen neu"""
+    info = plant_info or plant.plant_info
+    if info is None:
+        return
+
+    last_values = {last_col: getattr(plant, last_col) for _, last_col, _, _, _ in TASKS}
+    for col, due in due_dates(last_values, plant.date_acquired, info).items():
+        setattr(plant, col, due)
+
+
+def apply_bulk(db, user_id: int, task: str, today: date, plant_ids=None, location_id: int = None):
+    """
+    Eine Pflege-Aktion für viele Pflanzen eines Users (per id-Liste oder ganzer Standort):
+    ein SELECT der betroffenen Zeilen + ein UPDATE über den Primärschlüssel (executemany).
+    Commit macht der Aufrufer. Gibt {plant_id: nickname} der aktualisierten Pflanzen zurück.
+    """
+    last_cols = [last_col for _, last_col, _, _, _ in TASKS]
+    query = (
+        db.query(
+            models.MyPlant.id, models.MyPlant.nickname, models.MyPlant.date_acquired,
+            *[getattr(models.MyPlant, col) for col in last_cols],
+            models.PlantInfo
+        )
+        .outerjoin(models.PlantInfo, models.MyPlant.plant_info_id == models.PlantInfo.id)
+        .filter(models.MyPlant.user_id == user_id)
+    )
+    if plant_ids is not None:
+        if not plant_ids:
+            return {}
+        query = query.filter(models.MyPlant.id.in_(plant_ids))
+    if location_id is not None:
+        query = query.filter(models.MyPlant.location_id == location_id)
+
+    last_col = CARE_ACTIONS[task]
+    updated = {}
+    rows = []
+    for row in query.all():
+        last_values = dict(zip(last_cols, row[3:3 + len(last_cols)]))
+        last_values[last_col] = today
+        values = {"id": row.id, last_col: today}
+        info = row[-1]
+        if info is not None:
+            values.update(due_dates(last_values, row.date_acquired, info))
+        rows.append(values)
+        updated[row.id] = row.nickname
+
+    if rows:
+        db.execute(update(models.MyPlant), rows)
+    return updated
+
+
+def recompute_for_plant_info(db, plant_info):
+    """Nach Änderung einer PlantInfo: alle Pflanzen, die sie verwenden"""
+    db.flush()
+    plants = db.query(models.MyPlant).filter(models.MyPlant.plant_info_id == plant_info.id).all()
+    for plant in plants:
+        recompute(plant, plant_info)
+    return len(plants)
+
+
+def recompute_for_plant_infos(db, plant_infos):
+    """Wie recompute_for_plant_info, für viele PlantInfos mit einer Abfrage (z.B. Katalog-Import)"""
+    by_id = {info.id: info for info in plant_infos}
+    if not by_id:
+        return 0
+    db.flush()
+    plants = db.query(models.MyPlant).filter(models.MyPlant.plant_info_id.in_(list(by_id))).all()
+    for plant in plants:
+        recompute(plant, by_id[plant.plant_info_id])
+    return len(plants)
+
+
+def backfill(db):
+    """Fälligkeiten für Alt-Daten ohne gespeicherte Werte nachtragen"""
+    plants = db.query(models.MyPlant).filter(models.MyPlant.next_any_due.is_(None)).all()
+    for plant in plants:
+        recompute(plant)
+    db.commit()
+    return len(plants)
+
+
+# Felder der PlantInfo, die das Dashboard unter "plant_info_full" mitschickt
+PLANT_INFO_FULL_FIELDS = [
+    "water_frequency_days", "fertilize_frequency_days", "sunlight_requirement", "humidity_requirement",
+    "temperature_min", "temperature_max", "max_height_cm", "soil_type", "is_toxic",
+]
+
+
+def task_query(db, user_id: int):
+    """
+    Spalten für build_task als Tupel-Abfrage (keine ORM-Objekte, keine Identity-Map).
+    Pflanzen ohne PlantInfo oder Standort fallen durch die Joins heraus.
+    """
+    return (
+        db.query(
+            models.MyPlant.id, models.MyPlant.nickname,
+            *[getattr(models.MyPlant, due_col) for _, _, _, due_col, _ in TASKS],
+            models.Location.name.label("location_name"),
+            models.PlantInfo.id.label("plant_info_id"), models.PlantInfo.common_name,
+            models.PlantInfo.scientific_name, models.PlantInfo.image_url,
+            *[getattr(models.PlantInfo, field) for field in PLANT_INFO_FULL_FIELDS]
+        )
+        .join(models.PlantInfo, models.MyPlant.plant_info_id == models.PlantInfo.id)
+        .join(models.Location, models.MyPlant.location_id == models.Location.id)
+        .filter(models.MyPlant.user_id == user_id)
+    )
+
+
+def build_task(row, today: date):
+    """Dashboard-Eintrag einer Pflanze aus einer Zeile von task_query"""
+    days = {}
+    for task, _, _, due_col, _ in TASKS:
+        due = getattr(row, due_col)
+        days[task] = (due - today).days if due is not None else None
+
+    # Nächste fällige Aufgabe (bei Gleichstand gilt die Reihenfolge in TASKS)
+    candidates = [(task, d) for task, d in days.items() if d is not None]
+    next_task = min(candidates, key=lambda x: x[1]) if candidates else (None, None)
+
+    status = "OK"
+    if next_task[1] is not None and next_task[1] < 0: status = "ÜBERFÄLLIG"
+    elif next_task[1] == 0: status = "HEUTE"
+
+    result = {
+        "id": row.id,
+        "plant": row.nickname,
+        "species": row.common_name or row.scientific_name,
+        "location": row.location_name,
+        "image": row.image_url,
+        "thumbnail": image_service.thumbnail_url(row.plant_info_id, row.image_url),
+    }
+    for task, _, _, _, field in TASKS:
+        result[field] = days[task]
+    result.update({
+        "next_task": next_task[0],
+        "next_task_days": next_task[1],
+        "status": status,
+        "plant_info_full": {field: getattr(row, field) for field in PLANT_INFO_FULL_FIELDS}
+    })
+    return result
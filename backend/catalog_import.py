@@ -0,0 +1,217 @@
+# backend/catalog_import.py
+"""
+Bulk-Import eines Pflanzenkatalogs (Trefle-Dump) in plant_infos.
+
+Aufruf (aus backend/):
+    python catalog_import.py ../data/plant_seed.json
+    python catalog_import.py dump.jsonl --batch-size 2000
+
+Die Datei wird gestreamt (JSON-Array oder JSONL, ein Trefle-Datensatz pro Zeile),
+die Pflegeprofile batchweise abgeleitet (services.care_profile) und in Batches je Transaktion geschrieben.
+Bereits vorhandene Katalog-Einträge (gleiche trefle_id, ohne owner) werden aktualisiert.
+"""
+import argparse
+import json
+import time
+from pathlib import Path
+
+from sqlalchemy import insert, or_, select, update
+
+import care_schedule
+import catalog_search
+import compatibility
+import data_version
+import database
+import migrations
+import models
+from services import care_profile
+
+DEFAULT_SEED = Path(__file__).resolve().parent.parent / "data" / "plant_seed.json"
+CHUNK_SIZE = 1 << 16
+
+
+def iter_records(path):
+    """Liefert die Datensätze einer JSON- oder JSONL-Datei, ohne sie komplett zu laden."""
+    path = Path(path)
+    with open(path, "r", encoding="utf-8") as f:
+        if path.suffix in (".jsonl", ".ndjson"):
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+            return
+        yield from _iter_json_array(f)
+
+
+def _iter_json_array(f):
+    """Streamt die Elemente eines (großen) JSON-Arrays. Auch {"data": [...]} wird akzeptiert."""
+    decoder = json.JSONDecoder()
+    buf = f.read(CHUNK_SIZE)
+    eof = not buf
+    pos = 0
+
+    def skip(chars):
+        nonlocal buf, pos, eof
+        while True:
+            while pos < len(buf) and buf[pos] in chars:
+                pos += 1
+            if pos < len(buf) or eof:
+                return
+            buf, pos = f.read(CHUNK_SIZE), 0
+            eof = not buf
+
+    skip(" \t\r\n")
+    if eof and pos >= len(buf):
+        return  # leere Datei
+
+    if buf[pos] == "{":
+        # Kein Array -> kleines Objekt komplett lesen (z.B. {"data": [...]})
+        doc = json.loads(buf[pos:] + f.read())
+        yield from doc.get("data", [])
+        return
+
+    if buf[pos] != "[":
+        raise ValueError("Katalog-Datei muss ein JSON-Array oder JSONL sein")
+    pos += 1
+
+    while True:
+        skip(" \t\r\n,")
+        if pos < len(buf) and buf[pos] == "]":
+            return
+        if eof and pos >= len(buf):
+            raise ValueError("Unerwartetes Dateiende im JSON-Array")
+        try:
+            obj, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            # Objekt geht über die Chunk-Grenze -> nachladen
+            more = f.read(CHUNK_SIZE)
+            eof = not more
+            buf, pos = buf[pos:] + more, 0
+            continue
+        yield obj
+        pos = end
+        if pos > CHUNK_SIZE:
+            buf, pos = buf[pos:], 0
+
+
+def record_to_row(record: dict, profile: dict):
+    """Trefle-Datensatz + abgeleitetes Pflegeprofil -> Spaltenwerte für plant_infos"""
+    trefle_id = record.get("id")
+    row = {field: profile.get(field) for field in (
+        "scientific_name", "common_name", "family", "genus", "image_url",
+        "water_frequency_days", "fertilize_frequency_days", "repot_frequency_days", "prune_frequency_days",
+        "sunlight_requirement", "humidity_requirement", "temperature_min", "temperature_max",
+        "max_height_cm", "soil_type", "is_toxic",
+    )}
+    row["trefle_id"] = int(trefle_id)
+    row["owner_user_id"] = None
+    row["catalog_imported"] = True
+    row["enrichment_status"] = "ready"
+    return row
+
+
+def _rows_for(records, stats):
+    """Pflegeprofile für einen Batch Datensätze in einem Aufruf ableiten; unbrauchbare zählen als übersprungen"""
+    errors = []
+    profiles = care_profile.derive_care_profiles(records, errors)
+    for index, e in errors:
+        print(f"Datensatz übersprungen ({records[index].get('id')}): {e}")
+    rows = []
+    for record, profile in zip(records, profiles):
+        if profile is None:
+            stats["skipped"] += 1
+            continue
+        rows.append(record_to_row(record, profile))
+    return rows
+
+
+def _flush(db, records, stats):
+    rows = _rows_for(records, stats)
+    if rows:
+        inserted, updated = _flush_batch(db, rows)
+        stats["inserted"] += inserted
+        stats["updated"] += updated
+
+
+def _flush_batch(db, rows):
+    by_trefle_id = {r["trefle_id"]: r for r in rows}  # Duplikate im Batch: letzter gewinnt
+    existing = dict(
+        db.query(models.PlantInfo.trefle_id, models.PlantInfo.id)
+        .filter(
+            models.PlantInfo.trefle_id.in_(list(by_trefle_id)),
+            models.PlantInfo.owner_user_id.is_(None)
+        )
+        .all()
+    )
+
+    new_rows = [r for tid, r in by_trefle_id.items() if tid not in existing]
+    changed_rows = [dict(r, id=existing[tid]) for tid, r in by_trefle_id.items() if tid in existing]
+
+    if new_rows:
+        db.execute(insert(models.PlantInfo), new_rows)
+    if changed_rows:
+        changed_ids = [r["id"] for r in changed_rows]
+        db.execute(update(models.PlantInfo), changed_rows)
+        # Geänderte Einträge können auf Wunschlisten/bei Pflanzen stehen -> deren ETags ungültig machen
+        data_version.bump_for_plant_infos(db, changed_ids)
+        _refresh_in_use(db, changed_ids)
+    db.commit()
+    return len(new_rows), len(changed_rows)
+
+
+def _refresh_in_use(db, plant_info_ids):
+    """Kompatibilität und gespeicherte Fälligkeiten der verwendeten Einträge neu berechnen (gleiche Transaktion)"""
+    in_use = (
+        db.query(models.PlantInfo)
+        .filter(
+            models.PlantInfo.id.in_(plant_info_ids),
+            or_(models.PlantInfo.id.in_(select(models.Wishlist.plant_info_id)),
+                models.PlantInfo.id.in_(select(models.MyPlant.plant_info_id)))
+        )
+        .populate_existing()  # Sammel-UPDATE lief an der Session vorbei
+        .all()
+    )
+    compatibility.refresh_plant_infos(db, in_use)
+    care_schedule.recompute_for_plant_infos(db, in_use)
+
+
+def import_catalog(path, batch_size: int = 1000, engine=None):
+    """Importiert den Katalog. Gibt eine Statistik zurück."""
+    engine = engine or database.engine
+    migrations.upgrade(engine)
+    catalog_search.ensure_index(engine)
+
+    stats = {"records": 0, "inserted": 0, "updated": 0, "skipped": 0}
+    started = time.perf_counter()
+
+    db = database.SessionLocal(bind=engine)
+    try:
+        batch = []
+        for record in iter_records(path):
+            stats["records"] += 1
+            if record.get("id") is None:
+                stats["skipped"] += 1
+                continue
+            batch.append(record)
+            if len(batch) >= batch_size:
+                _flush(db, batch, stats)
+                batch = []
+        if batch:
+            _flush(db, batch, stats)
+    finally:
+        db.close()
+
+    catalog_search.rebuild_index(engine)
+    stats["seconds"] = round(time.perf_counter() - started, 2)
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pflanzenkatalog in plant_infos importieren")
+    parser.add_argument("path", nargs="?", default=str(DEFAULT_SEED), help="JSON-Array oder JSONL-Datei")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    print(import_catalog(args.path, batch_size=args.batch_size))
@@ -0,0 +1,148 @@
+# backend/catalog_search.py
+import re
+
+from sqlalchemy import text
+
+# Volltext-Index über den lokalen Pflanzenkatalog (importierte plant_infos ohne owner_user_id)
+# SQLite: FTS5-Tabelle mit external content + Triggern
+# Postgres: GIN-Index auf to_tsvector(...)
+
+FTS_TABLE = "plant_infos_fts"
+PG_INDEX = "ix_plant_infos_fulltext"
+PG_VECTOR = (
+    "to_tsvector('simple', coalesce(scientific_name, '') || ' ' || coalesce(common_name, '') "
+    "|| ' ' || coalesce(family, '') || ' ' || coalesce(genus, ''))"
+)
+
+# Treffer pro Suche (= Seitengröße der Trefle-Suche)
+SEARCH_LIMIT = 20
+
+_fts_available = None
+
+
+def ensure_index(engine):
+    """Legt den Volltext-Index an (idempotent). Bestehende Zeilen werden beim ersten Mal indiziert."""
+    global _fts_available
+
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            conn.execute(text(f"CREATE INDEX IF NOT EXISTS {PG_INDEX} ON plant_infos USING GIN ({PG_VECTOR})"))
+        _fts_available = True
+        return
+
+    if engine.dialect.name != "sqlite":
+        _fts_available = False
+        return
+
+    with engine.begin() as conn:
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :n"), {"n": FTS_TABLE}
+        ).first()
+        if exists:
+            _fts_available = True
+            return
+        try:
+            conn.execute(text(f"""
+                CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+                    scientific_name, common_name, family, genus,
+                    content='plant_infos', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2'
+                )
+            """))
+        except Exception as e:
+            print(f"FTS5 nicht verfügbar, lokale Suche deaktiviert: {e}")
+            _fts_available = False
+            return
+
+        # Trigger halten den Index bei INSERT/UPDATE/DELETE auf plant_infos aktuell
+        conn.execute(text(f"""
+            CREATE TRIGGER IF NOT EXISTS plant_infos_fts_ai AFTER INSERT ON plant_infos BEGIN
+                INSERT INTO {FTS_TABLE}(rowid, scientific_name, common_name, family, genus)
+                VALUES (new.id, new.scientific_name, new.common_name, new.family, new.genus);
+            END
+        """))
+        conn.execute(text(f"""
+            CREATE TRIGGER IF NOT EXISTS plant_infos_fts_ad AFTER DELETE ON plant_infos BEGIN
+                INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, scientific_name, common_name, family, genus)
+                VALUES ('delete', old.id, old.scientific_name, old.common_name, old.family, old.genus);
+            END
+        """))
+        conn.execute(text(f"""
+            CREATE TRIGGER IF NOT EXISTS plant_infos_fts_au AFTER UPDATE ON plant_infos BEGIN
+                INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, scientific_name, common_name, family, genus)
+                VALUES ('delete', old.id, old.scientific_name, old.common_name, old.family, old.genus);
+                INSERT INTO {FTS_TABLE}(rowid, scientific_name, common_name, family, genus)
+                VALUES (new.id, new.scientific_name, new.common_name, new.family, new.genus);
+            END
+        """))
+        conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+    _fts_available = True
+
+
+def rebuild_index(engine):
+    """Index komplett neu aufbauen (z.B. nach einem Import mit abgeschalteten Triggern)"""
+    if engine.dialect.name == "sqlite" and _fts_available:
+        with engine.begin() as conn:
+            conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+            conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')"))
+    elif engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            conn.execute(text("ANALYZE plant_infos"))
+
+
+def _tokens(query: str):
+    return [t for t in re.split(r"[^\w]+", (query or "").lower()) if t]
+
+
+def search(db, query: str, limit: int = SEARCH_LIMIT):
+    """
+    Sucht im lokalen Katalog. Liefert Treffer im Format der Trefle-Suche
+    (id = trefle_id), oder eine leere Liste.
+    Nur importierte Katalog-Einträge: über Wunschlisten angelegte PlantInfos sind zufällige
+    Einzelstücke und würden die Trefle-Suche sonst verdrängen.
+    """
+    tokens = _tokens(query)
+    if not tokens or not _fts_available:
+        return []
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        # Präfix-Suche: "mon del" -> "mon"* AND "del"*
+        match = " AND ".join(f'"{t}"*' for t in tokens)
+        rows = db.execute(text(f"""
+            SELECT p.trefle_id, p.scientific_name, p.common_name, p.image_url, p.family, p.genus
+            FROM {FTS_TABLE} f
+            JOIN plant_infos p ON p.id = f.rowid
+            WHERE {FTS_TABLE} MATCH :match
+              AND p.owner_user_id IS NULL
+              AND p.catalog_imported = :imported
+              AND p.trefle_id IS NOT NULL
+            ORDER BY f.rank
+            LIMIT :limit
+        """), {"match": match, "imported": True, "limit": limit}).all()
+    elif dialect == "postgresql":
+        tsquery = " & ".join(f"{t}:*" for t in tokens)
+        rows = db.execute(text(f"""
+            SELECT trefle_id, scientific_name, common_name, image_url, family, genus
+            FROM plant_infos
+            WHERE {PG_VECTOR} @@ to_tsquery('simple', :q)
+              AND owner_user_id IS NULL
+              AND catalog_imported = :imported
+              AND trefle_id IS NOT NULL
+            ORDER BY ts_rank({PG_VECTOR}, to_tsquery('simple', :q)) DESC
+            LIMIT :limit
+        """), {"q": tsquery, "imported": True, "limit": limit}).all()
+    else:
+        return []
+
+    return [
+        {
+            "id": r.trefle_id,
+            "scientific_name": r.scientific_name,
+            "common_name": r.common_name,
+            "image_url": r.image_url,
+            "family": r.family,
+            "genus": r.genus,
+        }
+        for r in rows
+    ]
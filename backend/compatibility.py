@@ -0,0 +1,271 @@
+# backend/compatibility.py
+import numpy as np
+from sqlalchemy import delete, insert, or_, select
+
+import models
+
+# Gemeinsame Kompatibilitätsprüfung Pflanze <-> Standort.
+# Alle Pflanzen x alle Standorte werden in einem vektorisierten Durchlauf geprüft,
+# das Ergebnis ist eine Bitmaske pro Paar (0 = passt).
+
+LIGHT = 1
+HUMIDITY = 2
+TEMPERATURE = 4
+SPACE = 8
+TOXIC = 16
+
+REASON_LABELS = [
+    (LIGHT, "Licht passt nicht"),
+    (HUMIDITY, "Feuchtigkeit passt nicht"),
+    (TEMPERATURE, "Temperatur passt nicht"),
+    (SPACE, "Zu wenig Platz"),
+    (TOXIC, "Giftig bei Haustieren/Kinder"),
+]
+
+LIGHT_TOLERANCE = 2
+HUMIDITY_TOLERANCE = 2
+
+# Defaults wie in models.py, falls alte Zeilen NULL enthalten
+_PLANT_FIELDS = [
+    ("sunlight_requirement", 5),
+    ("humidity_requirement", 5),
+    ("temperature_min", 15),
+    ("temperature_max", 25),
+    ("max_height_cm", 100),
+    ("is_toxic", False),
+]
+_LOCATION_FIELDS = [
+    ("light_level", 5),
+    ("humidity_level", 5),
+    ("temperature_avg", 20),
+    ("available_space_cm", 200),
+    ("has_pets_or_children", False),
+]
+
+
+def _column(objs, field, default, dtype):
+    values = (getattr(o, field) for o in objs)
+    return np.fromiter((default if v is None else v for v in values), dtype=dtype, count=len(objs))
+
+
+def plant_arrays(plants):
+    """PlantInfo-Objekte (oder Zeilen mit gleichen Attributen) -> dict von Spalten-Arrays"""
+    return {
+        field: _column(plants, field, default, np.bool_ if isinstance(default, bool) else np.int32)
+        for field, default in _PLANT_FIELDS
+    }
+
+
+def location_arrays(locations):
+    """Location-Objekte (oder Zeilen mit gleichen Attributen) -> dict von Spalten-Arrays"""
+    return {
+        field: _column(locations, field, default, np.bool_ if isinstance(default, bool) else np.int32)
+        for field, default in _LOCATION_FIELDS
+    }
+
+
+def evaluate(plants, locations):
+    """
+    Prüft alle Pflanzen gegen alle Standorte.
+    Gibt eine uint8-Matrix (len(plants) x len(locations)) mit Grund-Bits zurück.
+    """
+    if not len(plants) or not len(locations):
+        return np.zeros((len(plants), len(locations)), dtype=np.uint8)
+
+    p = plant_arrays(plants)
+    l = location_arrays(locations)
+
+    # Spalten (Pflanzen) gegen Zeilen (Standorte) broadcasten
+    light = np.abs(p["sunlight_requirement"][:, None] - l["light_level"][None, :]) > LIGHT_TOLERANCE
+    humidity = np.abs(p["humidity_requirement"][:, None] - l["humidity_level"][None, :]) > HUMIDITY_TOLERANCE
+    temp = l["temperature_avg"][None, :]
+    temperature = (temp < p["temperature_min"][:, None]) | (temp > p["temperature_max"][:, None])
+    space = p["max_height_cm"][:, None] > l["available_space_cm"][None, :]
+    toxic = p["is_toxic"][:, None] & l["has_pets_or_children"][None, :]
+
+    reasons = light.astype(np.uint8) * LIGHT
+    reasons |= humidity.astype(np.uint8) * HUMIDITY
+    reasons |= temperature.astype(np.uint8) * TEMPERATURE
+    reasons |= space.astype(np.uint8) * SPACE
+    reasons |= toxic.astype(np.uint8) * TOXIC
+    return reasons
+
+
+def reason_labels(bits: int):
+    """Bitmaske -> Liste lesbarer Gründe (Reihenfolge wie bisher in der API)"""
+    return [label for bit, label in REASON_LABELS if bits & bit]
+
+
+def recommendations(plant, locations):
+    """Eine Pflanze gegen alle Standorte -> Liste für die recommended-locations Endpoints"""
+    row = evaluate([plant], locations)[0] if locations else []
+    result = [
+        {
+            "id": loc.id,
+            "name": loc.name,
+            "recommended": bool(bits == 0),
+            "reasons": reason_labels(int(bits))
+        }
+        for loc, bits in zip(locations, row)
+    ]
+    result.sort(key=lambda x: (not x["recommended"], x["name"].lower()))
+    return result
+
+
+# --- Materialisierte Tabelle plant_location_compatibility ---------------------
+
+STORE_CHUNK = 500  # Pflanzen pro DELETE/INSERT (SQLite-Parameterlimit)
+
+
+def store(db, plants, locations):
+    """Berechnet die Paare plants x locations und schreibt sie (ohne commit) in die Tabelle"""
+    plants = [p for p in plants if p is not None]
+    if not plants or not locations:
+        return 0
+    db.flush()  # neue Objekte brauchen ihre IDs
+
+    total = 0
+    for start in range(0, len(plants), STORE_CHUNK):
+        total += _store_chunk(db, plants[start:start + STORE_CHUNK], locations)
+    return total
+
+
+def _store_chunk(db, plants, locations):
+    reasons = evaluate(plants, locations)
+    plant_ids = [p.id for p in plants]
+    location_ids = [l.id for l in locations]
+
+    db.execute(
+        delete(models.PlantLocationCompatibility)
+        .where(
+            models.PlantLocationCompatibility.plant_info_id.in_(plant_ids),
+            models.PlantLocationCompatibility.location_id.in_(location_ids)
+        )
+    )
+    rows = [
+        {"plant_info_id": pid, "location_id": lid, "ok": bool(bits == 0), "reasons": int(bits)}
+        for pid, row in zip(plant_ids, reasons)
+        for lid, bits in zip(location_ids, row)
+    ]
+    db.execute(insert(models.PlantLocationCompatibility), rows)
+    return len(rows)
+
+
+def _user_plant_infos(db, user_id: int):
+    """Alle PlantInfos, die ein User auf der Wunschliste oder im Bestand hat"""
+    wished = select(models.Wishlist.plant_info_id).where(models.Wishlist.user_id == user_id)
+    owned = select(models.MyPlant.plant_info_id).where(models.MyPlant.user_id == user_id)
+    return db.query(models.PlantInfo).filter(
+        or_(models.PlantInfo.id.in_(wished), models.PlantInfo.id.in_(owned))
+    ).all()
+
+
+def refresh_location(db, location):
+    """Nach Anlegen/Ändern eines Standorts: nur die Zeilen dieses Standorts neu berechnen"""
+    db.flush()
+    return store(db, _user_plant_infos(db, location.user_id), [location])
+
+
+def refresh_plant_for_user(db, plant_info, user_id: int):
+    """Nach Hinzufügen zur Wunschliste: Pflanze gegen die Standorte des Users"""
+    locations = db.query(models.Location).filter(models.Location.user_id == user_id).all()
+    return store(db, [plant_info], locations)
+
+
+def refresh_plant_infos(db, plant_infos):
+    """Nach Änderung von PlantInfos: gegen die Standorte aller User, die sie verwenden"""
+    plant_infos = [p for p in plant_infos if p is not None]
+    if not plant_infos:
+        return 0
+    db.flush()
+    ids = [p.id for p in plant_infos]
+    users = select(models.Wishlist.user_id).where(models.Wishlist.plant_info_id.in_(ids)).union(
+        select(models.MyPlant.user_id).where(models.MyPlant.plant_info_id.in_(ids))
+    )
+    locations = db.query(models.Location).filter(models.Location.user_id.in_(users)).all()
+    return store(db, plant_infos, locations)
+
+
+def suitable_location_names(db, user_id: int):
+    """(plant_info_id, location_name) aller passenden Paare eines Users, sortiert nach Standort"""
+    c = models.PlantLocationCompatibility
+    return (
+        db.query(c.plant_info_id, models.Location.name)
+        .join(models.Location, models.Location.id == c.location_id)
+        .filter(models.Location.user_id == user_id, c.ok.is_(True))
+        .order_by(models.Location.id)
+        .all()
+    )
+
+
+def _compatible_wishlist_query(db, user_id: int):
+    c = models.PlantLocationCompatibility
+    return (
+        db.query(models.Wishlist.id, models.PlantInfo.common_name,
+                 models.PlantInfo.scientific_name, models.PlantInfo.image_url, models.PlantInfo.id,
+                 c.location_id)
+        .join(c, c.plant_info_id == models.Wishlist.plant_info_id)
+        .join(models.PlantInfo, models.PlantInfo.id == models.Wishlist.plant_info_id)
+        .filter(models.Wishlist.user_id == user_id, c.ok.is_(True))
+    )
+
+
+def compatible_wishlist_rows(db, user_id: int, location_id: int):
+    """(wishlist_id, common_name, scientific_name, image_url, plant_info_id) der Wunschliste, die an den Standort passen"""
+    c = models.PlantLocationCompatibility
+    rows = (
+        _compatible_wishlist_query(db, user_id)
+        .filter(c.location_id == location_id)
+        .order_by(models.Wishlist.id)
+        .all()
+    )
+    return [row[:5] for row in rows]
+
+
+def compatible_wishlist_by_location(db, user_id: int):
+    """Wie compatible_wishlist_rows, aber für alle Standorte des Users in einer Abfrage: {location_id: [rows]}"""
+    result = {}
+    for row in _compatible_wishlist_query(db, user_id).order_by(models.Wishlist.id).all():
+        result.setdefault(row[5], []).append(row[:5])
+    return result
+
+
+def refresh_user_additions(db, user_id: int, new_locations, new_plant_info_ids):
+    """
+    Nach einem Import-Batch: neue Standorte gegen alle PlantInfos des Users,
+    neu verwendete PlantInfos gegen die übrigen Standorte
+    """
+    total = 0
+    new_location_ids = {l.id for l in new_locations}
+    if new_locations:
+        total += store(db, _user_plant_infos(db, user_id), new_locations)
+    if new_plant_info_ids:
+        plant_infos = db.query(models.PlantInfo).filter(models.PlantInfo.id.in_(new_plant_info_ids)).all()
+        locations = db.query(models.Location).filter(
+            models.Location.user_id == user_id, models.Location.id.notin_(new_location_ids)
+        ).all()
+        total += store(db, plant_infos, locations)
+    return total
+
+
+def rebuild_user(db, user_id: int):
+    locations = db.query(models.Location).filter(models.Location.user_id == user_id).all()
+    return store(db, _user_plant_infos(db, user_id), locations)
+
+
+def rebuild_all(db):
+    """Komplett neu aufbauen (Backfill für bestehende Daten)"""
+    db.execute(delete(models.PlantLocationCompatibility))
+    user_ids = [uid for (uid,) in db.query(models.Location.user_id).distinct()]
+    total = sum(rebuild_user(db, uid) for uid in user_ids)
+    db.commit()
+    return total
+
+
+def ensure_populated(db):
+    """Beim Start: Tabelle einmalig füllen, wenn sie leer ist, es aber Standorte gibt"""
+    has_rows = db.query(models.PlantLocationCompatibility.plant_info_id).first()
+    has_locations = db.query(models.Location.id).first()
+    if has_rows is None and has_locations is not None:
+        return rebuild_all(db)
+    return 0
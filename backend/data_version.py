@@ -0,0 +1,112 @@
+# backend/data_version.py
+from itertools import chain
+
+from fastapi import Response
+from sqlalchemy import event, func, select, union, update
+
+import models
+
+# Änderungen an diesen Objekten betreffen die Listen ihres Users (user_id-Spalte)
+TRACKED_MODELS = (models.MyPlant, models.Location, models.Wishlist)
+
+
+def _version_expr():
+    return func.coalesce(models.User.data_version, 0)
+
+
+def bump(db, *user_ids):
+    """Zählt die Version der User hoch (im laufenden Transaktions-Kontext, ohne commit)"""
+    ids = {uid for uid in user_ids if uid is not None}
+    if not ids:
+        return
+    db.execute(
+        update(models.User)
+        .where(models.User.id.in_(ids))
+        .values(data_version=_version_expr() + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _users_referencing(conn, plant_info_ids):
+    query = union(
+        select(models.Wishlist.user_id).where(models.Wishlist.plant_info_id.in_(plant_info_ids)),
+        select(models.MyPlant.user_id).where(models.MyPlant.plant_info_id.in_(plant_info_ids)),
+    )
+    return {row[0] for row in conn.execute(query)}
+
+
+def bump_for_plant_infos(db, plant_info_ids):
+    """Für Massen-Updates geteilter PlantInfos (z.B. Katalog-Import): alle User, die sie verwenden"""
+    ids = list(plant_info_ids)
+    if ids:
+        bump(db, *_users_referencing(db, ids))
+
+
+def _after_flush(session, flush_context):
+    """
+    Erkennt geänderte Pflanzen/Standorte/Wunschlisten-Einträge beim Flush und zählt die
+    Version der betroffenen User in derselben Transaktion hoch -> kein Endpoint kann es vergessen.
+    Geteilte PlantInfos (owner_user_id NULL, z.B. aus der Anreicherung) betreffen alle User,
+    die sie auf der Wunschliste oder als Pflanze haben.
+    """
+    user_ids = set()
+    shared_infos = set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+        if isinstance(obj, TRACKED_MODELS):
+            user_ids.add(obj.user_id)
+        elif isinstance(obj, models.PlantInfo):
+            if obj.owner_user_id is not None:
+                user_ids.add(obj.owner_user_id)
+            elif obj not in session.new:
+                shared_infos.add(obj.id)
+
+    conn = session.connection()
+    if shared_infos:
+        user_ids |= _users_referencing(conn, shared_infos)
+    user_ids.discard(None)
+    if user_ids:
+        conn.execute(
+            update(models.User.__table__)
+            .where(models.User.__table__.c.id.in_(user_ids))
+            .values(data_version=func.coalesce(models.User.__table__.c.data_version, 0) + 1)
+        )
+
+
+def install(session_factory):
+    """Hängt die automatische Versionierung an alle Sessions dieser Factory"""
+    if not event.contains(session_factory, "after_flush", _after_flush):
+        event.listen(session_factory, "after_flush", _after_flush)
+
+
+def current(db, user_id: int):
+    return db.query(_version_expr()).filter(models.User.id == user_id).scalar() or 0
+
+
+def etag(db, user_id: int, scope: str, *parts):
+    """Starker ETag aus User, Datenstand und weiteren Bestandteilen (z.B. Datum, Query-Parameter)"""
+    suffix = "".join(f"-{p}" for p in parts if p is not None)
+    return f'"{scope}-{user_id}-{current(db, user_id)}{suffix}"'
+
+
+def _matches(if_none_match: str, tag: str):
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Vergleich nach RFC 9110 (If-None-Match: schwacher Vergleich, W/ ignorieren)
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    return any((c[2:] if c.startswith("W/") else c) == tag for c in candidates)
+
+
+def conditional(request, response, tag: str):
+    """
+    Setzt ETag/Cache-Control auf die Antwort. Passt If-None-Match, kommt eine fertige
+    304-Antwort zurück - der Endpoint gibt sie direkt zurück, ohne seine Queries auszuführen.
+    """
+    headers = {"ETag": tag, "Cache-Control": "private, no-cache", "Vary": "Cookie"}
+    if _matches(request.headers.get("if-none-match"), tag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
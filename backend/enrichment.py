@@ -0,0 +1,183 @@
+# backend/enrichment.py
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import update
+
+import care_schedule
+import compatibility
+import models
+from database import SessionLocal
+from services import trefle_service
+
+WORKER_COUNT = int(os.getenv("ENRICHMENT_WORKERS", "2"))
+MAX_ATTEMPTS = int(os.getenv("ENRICHMENT_MAX_ATTEMPTS", "5"))
+POLL_SECONDS = float(os.getenv("ENRICHMENT_POLL_SECONDS", "5"))
+RETRY_BASE_SECONDS = int(os.getenv("ENRICHMENT_RETRY_BASE_SECONDS", "30"))
+
+# Felder, die aus den Trefle-Details in PlantInfo übernommen werden
+DETAIL_FIELDS = [
+    "scientific_name", "common_name", "family", "genus", "image_url",
+    "water_frequency_days", "fertilize_frequency_days", "repot_frequency_days", "prune_frequency_days",
+    "sunlight_requirement", "humidity_requirement", "temperature_min", "temperature_max",
+    "max_height_cm", "soil_type", "is_toxic",
+]
+
+
+def _utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def apply_details(plant_info, details: dict):
+    """Überträgt ein Detail-Dict aus trefle_service auf eine PlantInfo"""
+    for field in DETAIL_FIELDS:
+        if field in details:
+            setattr(plant_info, field, details[field])
+    plant_info.enrichment_status = "ready"
+
+
+def enqueue(db, plant_info):
+    """Legt einen Anreicherungs-Job an (ohne commit) und markiert die PlantInfo als pending"""
+    plant_info.enrichment_status = "pending"
+    job = models.EnrichmentJob(
+        plant_info_id=plant_info.id,
+        trefle_id=plant_info.trefle_id,
+        status="queued",
+        attempts=0,
+        max_attempts=MAX_ATTEMPTS,
+        next_attempt_at=_utcnow(),
+    )
+    db.add(job)
+    return job
+
+
+class EnrichmentWorkerPool:
+    """
+    Feste Anzahl Worker-Threads, die Jobs aus der Tabelle enrichment_jobs abarbeiten.
+    Die Queue liegt in der DB -> überlebt Neustarts; "running"-Jobs eines abgestürzten
+    Prozesses werden beim Start wieder auf "queued" gesetzt.
+    """
+
+    def __init__(self, worker_count: int = WORKER_COUNT):
+        self.worker_count = worker_count
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        if self._threads:
+            return
+        self._recover()
+        self._stop.clear()
+        self._wakeup.clear()
+        for i in range(self.worker_count):
+            t = threading.Thread(target=self._run, name=f"enrichment-worker-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        self._wakeup.set()
+        for t in self._threads:
+            t.join(timeout)
+        self._threads = []
+
+    def notify(self):
+        """Nach einem commit aufrufen, damit neue Jobs sofort abgeholt werden"""
+        self._wakeup.set()
+
+    def _recover(self):
+        db = SessionLocal()
+        try:
+            db.execute(
+                update(models.EnrichmentJob)
+                .where(models.EnrichmentJob.status == "running")
+                .values(status="queued")
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                worked = self.run_once()
+            except Exception as e:
+                print(f"Enrichment Worker Fehler: {e}")
+                worked = False
+            if not worked:
+                self._wakeup.wait(POLL_SECONDS)
+                # Nach stop() gesetzt lassen, sonst schläft ein anderer Worker noch POLL_SECONDS
+                if not self._stop.is_set():
+                    self._wakeup.clear()
+
+    def run_once(self):
+        """Holt einen fälligen Job und bearbeitet ihn. Gibt False zurück, wenn nichts zu tun war."""
+        db = SessionLocal()
+        try:
+            job = self._claim(db)
+            if job is None:
+                return False
+            self._process(db, job)
+            return True
+        finally:
+            db.close()
+
+    def _claim(self, db):
+        candidate = (
+            db.query(models.EnrichmentJob.id)
+            .filter(
+                models.EnrichmentJob.status == "queued",
+                models.EnrichmentJob.next_attempt_at <= _utcnow()
+            )
+            .order_by(models.EnrichmentJob.id)
+            .first()
+        )
+        if candidate is None:
+            return None
+
+        # Atomar übernehmen - ein anderer Worker könnte schneller gewesen sein
+        claimed = db.execute(
+            update(models.EnrichmentJob)
+            .where(models.EnrichmentJob.id == candidate.id, models.EnrichmentJob.status == "queued")
+            .values(status="running", attempts=models.EnrichmentJob.attempts + 1)
+        ).rowcount
+        db.commit()
+        if claimed != 1:
+            return None
+        return db.get(models.EnrichmentJob, candidate.id)
+
+    def _process(self, db, job):
+        info = db.get(models.PlantInfo, job.plant_info_id)
+        if info is None:
+            job.status = "done"
+            job.last_error = "PlantInfo existiert nicht mehr"
+            db.commit()
+            return
+
+        try:
+            details = trefle_service.get_plant_details(job.trefle_id)
+            error = None if details else "Keine Details von Trefle"
+        except Exception as e:
+            details, error = None, str(e)
+
+        if details:
+            apply_details(info, details)
+            compatibility.refresh_plant_infos(db, [info])
+            care_schedule.recompute_for_plant_info(db, info)
+            job.status = "done"
+            job.last_error = None
+        elif job.attempts >= job.max_attempts:
+            info.enrichment_status = "failed"
+            job.status = "failed"
+            job.last_error = error
+        else:
+            # Exponentielles Backoff: 30s, 60s, 120s, ...
+            job.status = "queued"
+            job.last_error = error
+            job.next_attempt_at = _utcnow() + timedelta(seconds=RETRY_BASE_SECONDS * 2 ** (job.attempts - 1))
+        db.commit()
+
+
+worker_pool = EnrichmentWorkerPool()
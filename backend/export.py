@@ -0,0 +1,100 @@
+# backend/export.py
+"""
+Export aller Daten eines Users als JSONL oder CSV, gestreamt:
+- pro Tabelle eine Abfrage mit serverseitigem Cursor (stream_results + yield_per)
+- jede Partition wird sofort kodiert und an den Client geschickt
+-> Speicherverbrauch bleibt konstant, egal wie viele Zeilen exportiert werden.
+
+Reihenfolge: Standorte, eigene PlantInfos, Wunschliste, Pflanzen (Abhängigkeiten zuerst, für den Import).
+"""
+import csv
+import io
+import os
+
+import orjson
+from sqlalchemy import select
+
+import models
+from database import SessionLocal
+
+# Zeilen pro Fetch vom Cursor (= pro geschriebenem Block)
+BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+MEDIA_TYPES = {"jsonl": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+# Satzart -> (Tabelle, Spalte mit der user_id)
+TABLES = {
+    "location": (models.Location, models.Location.user_id),
+    "plant_info": (models.PlantInfo, models.PlantInfo.owner_user_id),  # nur vom User geforkte Einträge
+    "wishlist": (models.Wishlist, models.Wishlist.user_id),
+    "plant": (models.MyPlant, models.MyPlant.user_id),
+}
+
+
+# Zusatzspalten für den Re-Import (bulk_import): Pflanzen tragen trefle_id und Standort-Namen,
+# weil die ids im Zielkonto andere sind -> (Tabelle, Spalte, Join-Bedingung)
+EXTRA_COLUMNS = {
+    "plant": [
+        (models.PlantInfo, models.PlantInfo.trefle_id, models.PlantInfo.id == models.MyPlant.plant_info_id),
+        (models.Location, models.Location.name.label("location"), models.Location.id == models.MyPlant.location_id),
+    ],
+}
+
+
+def columns(kind: str):
+    return [c.name for c in TABLES[kind][0].__table__.columns] + [c.name for _, c, _ in EXTRA_COLUMNS.get(kind, [])]
+
+
+def csv_header(kinds):
+    """Eine CSV für alle Satzarten: "type" + Vereinigung aller Spalten (fehlende Felder bleiben leer)"""
+    header = ["type"]
+    for kind in kinds:
+        header += [name for name in columns(kind) if name not in header]
+    return header
+
+
+def _partitions(db, kind: str, user_id: int, batch_size: int):
+    model, owner_col = TABLES[kind]
+    extra = EXTRA_COLUMNS.get(kind, [])
+    stmt = select(*model.__table__.columns, *[column for _, column, _ in extra])
+    for table, _, onclause in extra:
+        stmt = stmt.outerjoin(table, onclause)
+    stmt = (
+        stmt
+        .where(owner_col == user_id)
+        .order_by(model.id)
+        .execution_options(stream_results=True, yield_per=batch_size)
+    )
+    return db.execute(stmt).partitions()
+
+
+def _jsonl_block(kind: str, rows):
+    return b"".join(orjson.dumps({"type": kind, **row._mapping}) + b"\n" for row in rows)
+
+
+def _csv_block(kind: str, rows, header):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=header, extrasaction="ignore")
+    for row in rows:
+        writer.writerow({"type": kind, **row._mapping})
+    return buffer.getvalue().encode("utf-8")
+
+
+def stream(user_id: int, fmt: str, kinds=None, batch_size: int = BATCH_SIZE):
+    """
+    Generator für StreamingResponse. Öffnet eine eigene Session: die des Requests ist schon
+    geschlossen, wenn der Body gestreamt wird. Alle Tabellen in einer Transaktion gelesen.
+    """
+    kinds = list(kinds or TABLES)
+    header = csv_header(kinds) if fmt == "csv" else None
+    db = SessionLocal()
+    try:
+        if header:
+            buffer = io.StringIO()
+            csv.writer(buffer).writerow(header)
+            yield buffer.getvalue().encode("utf-8")
+        for kind in kinds:
+            for rows in _partitions(db, kind, user_id, batch_size):
+                yield _csv_block(kind, rows, header) if header else _jsonl_block(kind, rows)
+    finally:
+        db.close()
@@ -0,0 +1,108 @@
+# backend/live_updates.py
+import asyncio
+import json
+import os
+import threading
+from collections import defaultdict
+
+# Maximal gepufferte Events pro Verbindung; läuft die Queue über, bekommt der Client "resync"
+QUEUE_SIZE = int(os.getenv("LIVE_UPDATES_QUEUE_SIZE", "100"))
+# Kommentarzeile gegen Proxy-Timeouts, wenn länger nichts passiert
+KEEPALIVE_SECONDS = float(os.getenv("LIVE_UPDATES_KEEPALIVE_SECONDS", "15"))
+
+
+class Subscriber:
+    """Eine offene SSE-Verbindung: asyncio-Queue auf dem Event-Loop des Servers"""
+
+    def __init__(self, user_id: int, loop, queue_size: int = QUEUE_SIZE):
+        self.user_id = user_id
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.next_id = 0
+
+    def offer(self, message):
+        # Läuft auf dem Event-Loop (call_soon_threadsafe)
+        if self.queue.full():
+            # Client kommt nicht hinterher -> Rückstand verwerfen, komplett neu laden lassen
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            message = ("resync", "{}")
+        self.queue.put_nowait(message)
+
+
+class EventBroker:
+    """
+    Verteilt kleine Delta-Events pro User an alle offenen Verbindungen dieses Users.
+    publish() ist threadsicher (die Endpoints laufen im Threadpool).
+    Gilt pro Prozess: bei mehreren Workern erreicht ein Event nur die Clients desselben Workers.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+        self.published = 0
+
+    def subscribe(self, user_id: int):
+        subscriber = Subscriber(user_id, asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers[user_id].add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            subs = self._subscribers.get(subscriber.user_id)
+            if subs is not None:
+                subs.discard(subscriber)
+                if not subs:
+                    del self._subscribers[subscriber.user_id]
+
+    def has_subscribers(self, user_id: int):
+        """Damit Endpoints das Event gar nicht erst bauen, wenn niemand zuhört"""
+        return bool(self._subscribers.get(user_id))
+
+    def publish(self, user_id: int, event: str, data: dict):
+        with self._lock:
+            subs = list(self._subscribers.get(user_id, ()))
+        if not subs:
+            return 0
+        message = (event, json.dumps(data, default=str))
+        for sub in subs:
+            try:
+                sub.loop.call_soon_threadsafe(sub.offer, message)
+            except RuntimeError:
+                # Event-Loop schon geschlossen
+                self.unsubscribe(sub)
+        self.published += 1
+        return len(subs)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "users": len(self._subscribers),
+                "connections": sum(len(s) for s in self._subscribers.values()),
+                "published": self.published,
+            }
+
+
+def _format(event_id: int, event: str, payload: str):
+    return f"id: {event_id}\nevent: {event}\ndata: {payload}\n\n"
+
+
+async def stream(user_id: int, keepalive: float = KEEPALIVE_SECONDS):
+    """SSE-Stream einer Verbindung; meldet sich beim Beenden (Disconnect) wieder ab"""
+    subscriber = broker.subscribe(user_id)
+    try:
+        yield "retry: 3000\n" + _format(0, "ready", "{}")
+        while True:
+            try:
+                event, payload = await asyncio.wait_for(subscriber.queue.get(), keepalive)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            subscriber.next_id += 1
+            yield _format(subscriber.next_id, event, payload)
+    finally:
+        broker.unsubscribe(subscriber)
+
+
+broker = EventBroker()
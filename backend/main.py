@@ -1,25 +1,31 @@
 # backend/main.py
-from fastapi import FastAPI, Depends, HTTPException
+from fastapi import FastAPI, Depends, File, HTTPException, Query, Request, Response, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse, ORJSONResponse
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
 from pydantic import BaseModel
-from auth import router as auth_router, require_login
-from passlib.context import CryptContext
+from typing import Any, Dict, List
+from auth import router as auth_router, require_login, require_admin
 from database import SessionLocal  
 from models import User
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 from datetime import date
+import os
 
 # Eigene Module
-import models, database
-from services import trefle_service
+import models, schemas, database, sessions, enrichment, catalog_search, compatibility, care_schedule, care_events, live_updates, data_version, propagation, export, bulk_import, query_budget, static_assets, migrations
+from password_hashing import hasher
+from services import trefle_service, image_service
 
-# Datenbank Tabellen erstellen
-models.Base.metadata.create_all(bind=database.engine)
+# Wunschliste: Trefle-Details im Hintergrund nachladen statt den Request zu blockieren
+BACKGROUND_ENRICHMENT = os.getenv("WISHLIST_BACKGROUND_ENRICHMENT", "0") == "1"
 
-app = FastAPI(title="Care For Plants API")
+# orjson statt json.dumps für alle Antworten; Schemas der Antworten stehen in schemas.py
+app = FastAPI(title="Care For Plants API", default_response_class=ORJSONResponse)
 app.include_router(auth_router, prefix="/auth")
 
 BASE_DIR = Path(__file__).resolve().parent.parent  # Repo-Root 
@@ -29,25 +35,53 @@ FRONTEND_DIR = BASE_DIR / "frontend"
 app.mount("/img", StaticFiles(directory=FRONTEND_DIR / "img"), name="img")
 
 # Testuser seeden
-pwd_ctx = CryptContext(schemes=["bcrypt"], deprecated="auto")
+TEST_USERS = [("student", "student123"), ("tutor", "tutor123")]
 
 def seed_test_users():
     db = SessionLocal()
     try:
-        def ensure(username: str, pw: str):
-            u = db.query(User).filter(User.username == username).first()
-            if not u:
-                db.add(User(username=username, password_hash=pwd_ctx.hash(pw)))
-                db.commit()
-
-        ensure("student", "student123")
-        ensure("tutor", "tutor123")
+        existing = {u for (u,) in db.query(User.username).filter(User.username.in_([u for u, _ in TEST_USERS]))}
+        missing = [(u, pw) for u, pw in TEST_USERS if u not in existing]
+        if not missing:
+            return
+
+        # Hashes parallel auf dem Passwort-Pool
+        hashes = hasher.hash_many([pw for _, pw in missing])
+        for (username, _), password_hash in zip(missing, hashes):
+            db.add(User(username=username, password_hash=password_hash))
+        db.commit()
     finally:
         db.close()
 
 @app.on_event("startup")
 def on_startup():
+    # Datenbank-Schema auf Stand bringen (neue Tabellen + versionierte Migrationen)
+    migrations.upgrade(database.engine)
+    catalog_search.ensure_index(database.engine)
+
     seed_test_users()
+    db = SessionLocal()
+    try:
+        compatibility.ensure_populated(db)
+        care_schedule.backfill(db)
+    finally:
+        db.close()
+    enrichment.worker_pool.start()
+    care_events.buffer.start()
+    assets.build()
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    enrichment.worker_pool.stop()
+    care_events.buffer.stop()
+    await trefle_service.close_clients_async()
+
+# Änderungen an Pflanzen/Standorten/Wunschliste zählen users.data_version hoch (ETags)
+data_version.install(database.SessionLocal)
+
+# SQL-Statements pro Request zählen (Header X-SQL-Queries, Log bei Budget-Überschreitung)
+query_budget.install(database.engine)
+app.add_middleware(query_budget.QueryBudgetMiddleware)
 
 # CORS Middleware
 app.add_middleware(
@@ -111,6 +145,8 @@ def fork_plant_info_for_user(db, base_info, user_id: int):
         trefle_id=base_info.trefle_id,
         scientific_name=base_info.scientific_name,
         common_name=base_info.common_name,
+        family=base_info.family,
+        genus=base_info.genus,
         image_url=base_info.image_url,
 
         water_frequency_days=base_info.water_frequency_days,
@@ -136,11 +172,27 @@ def fork_plant_info_for_user(db, base_info, user_id: int):
 
 # --- API ENDPOINTS ---
 
-@app.get("/plants/search/{query}")
-def search_plants(query: str):
-    return trefle_service.search_plants(query)
+def search_local_catalog(query: str):
+    db = database.SessionLocal()
+    try:
+        return catalog_search.search(db, query)
+    finally:
+        db.close()
 
-@app.post("/locations/")
+@app.get("/plants/search/{query}", response_model=List[schemas.PlantSearchResult])
+async def search_plants(query: str, fill: bool = False):
+    """
+    Sucht im lokalen Katalog (Volltext-Index); Trefle wird nur gefragt, wenn es lokal keinen Treffer gibt.
+    Mit ?fill=true werden weniger als eine volle Seite lokaler Treffer mit Trefle-Treffern aufgefüllt (ohne Duplikate).
+    """
+    local = await run_in_threadpool(search_local_catalog, query)
+    if local and (not fill or len(local) >= catalog_search.SEARCH_LIMIT):
+        return schemas.fast_response(local)
+    seen = {p["id"] for p in local}
+    remote = [p for p in await trefle_service.search_plants_async(query) if p.get("id") not in seen]
+    return schemas.fast_response((local + remote)[:catalog_search.SEARCH_LIMIT])
+
+@app.post("/locations/", response_model=schemas.LocationOut)
 def create_location(payload: LocationCreate,user_id: int = Depends(require_login),db: Session = Depends(get_db)):
     """Erstellt einen Standort mit detaillierten Umweltbedingungen (pro User)"""
 
@@ -154,15 +206,20 @@ def create_location(payload: LocationCreate,user_id: int = Depends(require_login
         has_pets_or_children=payload.has_pets_or_children
         )
     db.add(db_loc)
+    compatibility.refresh_location(db, db_loc)
     db.commit()
     db.refresh(db_loc)
     return db_loc
 
-@app.get("/locations/")
-def get_locations(user_id: int = Depends(require_login),db: Session = Depends(get_db)):
-    return db.query(models.Location).filter(models.Location.user_id == user_id).all()
+@app.get("/locations/", response_model=List[schemas.LocationOut])
+def get_locations(request: Request, response: Response, user_id: int = Depends(require_login),db: Session = Depends(get_db)):
+    not_modified = data_version.conditional(request, response, data_version.etag(db, user_id, "locations"))
+    if not_modified:
+        return not_modified
+    rows = db.query(*models.Location.__table__.columns).filter(models.Location.user_id == user_id).all()
+    return schemas.fast_response([dict(row._mapping) for row in rows], response)
 
-@app.post("/my-plants/")
+@app.post("/my-plants/", response_model=schemas.MyPlantCreatedOut)
 def create_my_plant(payload: MyPlantCreate, user_id: int = Depends(require_login), db: Session = Depends(get_db)):
     # 0) Safety: Gehört der gewählte Standort wirklich dem aktuellen User?
     location = db.query(models.Location).filter(
@@ -196,6 +253,7 @@ def create_my_plant(payload: MyPlantCreate, user_id: int = Depends(require_login
         last_propagated=date.today(),
         date_acquired=date.today()
     )
+    care_schedule.recompute(new_plant, wish_item.plant_info)
 
     db.add(new_plant)
     db.commit()
@@ -204,136 +262,177 @@ def create_my_plant(payload: MyPlantCreate, user_id: int = Depends(require_login
     # 3) Optional: Den Eintrag aus der Wunschliste löschen, da die Pflanze nun "eingezogen" ist
     db.delete(wish_item)
     db.commit()
+    push_tasks(db, user_id, [new_plant.id], event="plant_updated")
 
     return {"status": "created", "plant": new_plant.nickname, "id": new_plant.id}
 
 
-@app.post("/wishlist/")
-def add_to_wishlist(
+@app.post("/wishlist/", response_model=schemas.WishlistAddedOut, response_model_exclude_none=True)
+async def add_to_wishlist(
     payload: WishlistCreate,
+    background: bool = None,
     user_id: int = Depends(require_login),
     db: Session = Depends(get_db)
 ):
+    """
+    Fügt eine Pflanze zur Wunschliste hinzu.
+    Im Hintergrund-Modus (?background=true oder WISHLIST_BACKGROUND_ENRICHMENT=1) wird sofort
+    ein Platzhalter angelegt und die Trefle-Details von der Enrichment-Queue nachgeladen.
+    """
+    if background is None:
+        background = BACKGROUND_ENRICHMENT
+
+    # Trefle-Details asynchron holen (kein Thread wartet auf das Netzwerk), DB-Arbeit im Threadpool
+    details = None
+    if not background and await run_in_threadpool(wishlist_needs_details, db, user_id, payload.trefle_id):
+        details = await trefle_service.get_plant_details_async(payload.trefle_id)
+        if not details:
+            raise HTTPException(status_code=404, detail="Pflanze nicht gefunden")
+    return await run_in_threadpool(add_wishlist_item, db, user_id, payload.trefle_id, background, details)
+
+def _existing_wish(db: Session, user_id: int, trefle_id: int):
+    return db.query(models.Wishlist).filter(
+        models.Wishlist.user_id == user_id,
+        models.Wishlist.trefle_id == trefle_id
+    ).first()
+
+def _catalog_info(db: Session, trefle_id: int):
+    return db.query(models.PlantInfo).filter(
+        models.PlantInfo.trefle_id == trefle_id,
+        models.PlantInfo.owner_user_id.is_(None)
+    ).first()
+
+def wishlist_needs_details(db: Session, user_id: int, trefle_id: int):
+    """Neuer Eintrag für eine Pflanze, die es lokal noch nicht gibt?"""
+    return _existing_wish(db, user_id, trefle_id) is None and _catalog_info(db, trefle_id) is None
+
+def add_wishlist_item(db: Session, user_id: int, trefle_id: int, background: bool, details: dict = None):
     # 1) schon vorhanden?
-    exists = (
-        db.query(models.Wishlist)
-        .filter(
-            models.Wishlist.user_id == user_id,
-            models.Wishlist.trefle_id == payload.trefle_id
-        )
-        .first()
-    )
+    exists = _existing_wish(db, user_id, trefle_id)
     if exists:
         return {"status": "exists", "id": exists.id}
 
     # 2) plant_info holen/erstellen
-    db_info = (
-        db.query(models.PlantInfo)
-        .filter(
-            models.PlantInfo.trefle_id == payload.trefle_id,
-            models.PlantInfo.owner_user_id.is_(None)
-        )
-        .first()
-    )
+    db_info = _catalog_info(db, trefle_id)
 
-    if not db_info:
-        details = trefle_service.get_plant_details(payload.trefle_id)
+    queued = False
+    if not db_info and background:
+        # Platzhalter mit Default-Werten, Details kommen später
+        db_info = models.PlantInfo(trefle_id=trefle_id)
+        db.add(db_info)
+        db.flush()
+        enrichment.enqueue(db, db_info)
+        queued = True
+    elif not db_info:
+        # Normalfall: Details hat der Endpoint schon geholt (nur nicht, wenn die PlantInfo inzwischen weg ist)
+        details = details or trefle_service.get_plant_details(trefle_id)
         if not details:
             raise HTTPException(status_code=404, detail="Pflanze nicht gefunden")
-        db_info = models.PlantInfo(
-            trefle_id=payload.trefle_id,
-            scientific_name=details["scientific_name"],
-            common_name=details["common_name"],
-            image_url=details["image_url"],
-            water_frequency_days=details["water_frequency_days"],
-            fertilize_frequency_days=details["fertilize_frequency_days"],
-            repot_frequency_days=details["repot_frequency_days"],
-            prune_frequency_days=details["prune_frequency_days"],
-            sunlight_requirement=details["sunlight_requirement"],
-            humidity_requirement=details["humidity_requirement"],
-            temperature_min=details["temperature_min"],
-            temperature_max=details["temperature_max"],
-            max_height_cm=details["max_height_cm"],
-            soil_type=details["soil_type"],
-            is_toxic=details["is_toxic"],
-        )
+        db_info = models.PlantInfo(trefle_id=trefle_id)
+        enrichment.apply_details(db_info, details)
         db.add(db_info)
-        db.commit()
-        db.refresh(db_info)
+        db.flush()  # db_info.id ohne extra commit
+    elif db_info.enrichment_status == "failed":
+        # Früher gescheitert -> neuer Versuch
+        enrichment.enqueue(db, db_info)
+        queued = True
 
-    # 3) wishlist item anlegen
+    # 3) wishlist item anlegen (gleiche Transaktion wie die PlantInfo)
     item = models.Wishlist(
         user_id=user_id,
-        trefle_id=payload.trefle_id,
+        trefle_id=trefle_id,
         plant_info_id=db_info.id,
         added_date=date.today()
     )
     db.add(item)
+    compatibility.refresh_plant_for_user(db, db_info, user_id)
     db.commit()
     db.refresh(item)
 
-    return {"status": "added", "id": item.id}
+    if queued:
+        enrichment.worker_pool.notify()
+
+    return {"status": "added", "id": item.id, "enrichment_status": db_info.enrichment_status or "ready"}
 
-@app.get("/wishlist/")
-def get_wishlist(user_id: int = Depends(require_login),db: Session = Depends(get_db)):
+@app.get("/wishlist/{wishlist_id}/enrichment", response_model=schemas.EnrichmentStatusOut)
+def get_wishlist_enrichment_status(
+    wishlist_id: int,
+    user_id: int = Depends(require_login),
+    db: Session = Depends(get_db)
+):
+    """Status der Hintergrund-Anreicherung eines Wunschlisten-Eintrags (zum Pollen)"""
+    item = db.query(models.Wishlist).filter(
+        models.Wishlist.id == wishlist_id,
+        models.Wishlist.user_id == user_id
+    ).first()
+    if not item:
+        raise HTTPException(status_code=404, detail="Not found")
+
+    job = (
+        db.query(models.EnrichmentJob)
+        .filter(models.EnrichmentJob.plant_info_id == item.plant_info_id)
+        .order_by(models.EnrichmentJob.id.desc())
+        .first()
+    )
+    return {
+        "wishlist_id": item.id,
+        "plant_info_id": item.plant_info_id,
+        "enrichment_status": item.plant_info.enrichment_status or "ready",
+        "attempts": job.attempts if job else 0,
+        "last_error": job.last_error if job else None
+    }
+
+@app.get("/wishlist/", response_model=List[schemas.WishlistItemOut])
+def get_wishlist(request: Request, response: Response, user_id: int = Depends(require_login),db: Session = Depends(get_db)):
     """Gibt die Wunschliste mit ERWEITERTER Standort-Kompatibilität zurück"""
-    wishlist = db.query(models.Wishlist).filter(models.Wishlist.user_id == user_id).all()
-    locations = db.query(models.Location).filter(models.Location.user_id == user_id).all()
-    
+    not_modified = data_version.conditional(request, response, data_version.etag(db, user_id, "wishlist"))
+    if not_modified:
+        return not_modified
+    wishlist = (
+        db.query(
+            models.Wishlist.id, models.Wishlist.trefle_id,
+            models.PlantInfo.id.label("plant_info_id"), models.PlantInfo.scientific_name,
+            models.PlantInfo.common_name, models.PlantInfo.image_url,
+            models.PlantInfo.water_frequency_days, models.PlantInfo.sunlight_requirement,
+            models.PlantInfo.humidity_requirement, models.PlantInfo.temperature_min,
+            models.PlantInfo.temperature_max, models.PlantInfo.max_height_cm,
+            models.PlantInfo.soil_type, models.PlantInfo.is_toxic, models.PlantInfo.enrichment_status
+        )
+        .join(models.PlantInfo, models.Wishlist.plant_info_id == models.PlantInfo.id)
+        .filter(models.Wishlist.user_id == user_id)
+        .order_by(models.Wishlist.id)
+        .all()
+    )
+
+    # Kompatible Standorte aus der materialisierten Tabelle (ein Join statt Neuberechnung)
+    suitable_by_plant = {}
+    for plant_info_id, name in compatibility.suitable_location_names(db, user_id):
+        suitable_by_plant.setdefault(plant_info_id, []).append(name)
+
     result = []
-    for item in wishlist:
-        plant = item.plant_info
-        if not plant:
-            continue
-        
-        # Kompatible Standorte finden (erweiterte Prüfung)
-        suitable = []
-        for loc in locations:
-            is_suitable = True
-            
-            # Licht-Check (Toleranz ±2)
-            if abs(plant.sunlight_requirement - loc.light_level) > 2:
-                is_suitable = False
-            
-            # Luftfeuchtigkeit-Check
-            if abs(plant.humidity_requirement - loc.humidity_level) > 2:
-                is_suitable = False
-            
-            # Temperatur-Check
-            if loc.temperature_avg < plant.temperature_min or loc.temperature_avg > plant.temperature_max:
-                is_suitable = False
-            
-            # Platz-Check
-            if plant.max_height_cm > loc.available_space_cm:
-                is_suitable = False
-            
-            # Giftigkeit-Check
-            if plant.is_toxic and loc.has_pets_or_children:
-                is_suitable = False
-            
-            if is_suitable:
-                suitable.append(loc.name)
-        
+    for row in wishlist:
         result.append({
-            "id": item.id,
-            "trefle_id": item.trefle_id,
-            "scientific_name": plant.scientific_name,
-            "common_name": plant.common_name,
-            "image_url": plant.image_url,
-            "water_frequency_days": plant.water_frequency_days,
-            "sunlight_requirement": plant.sunlight_requirement,
-            "humidity_requirement": plant.humidity_requirement,
-            "temperature_min": plant.temperature_min,
-            "temperature_max": plant.temperature_max,
-            "max_height_cm": plant.max_height_cm,
-            "soil_type": plant.soil_type,
-            "is_toxic": plant.is_toxic,
-            "suitable_locations": suitable
+            "id": row.id,
+            "trefle_id": row.trefle_id,
+            "scientific_name": row.scientific_name,
+            "common_name": row.common_name,
+            "image_url": row.image_url,
+            "thumbnail": image_service.thumbnail_url(row.plant_info_id, row.image_url),
+            "water_frequency_days": row.water_frequency_days,
+            "sunlight_requirement": row.sunlight_requirement,
+            "humidity_requirement": row.humidity_requirement,
+            "temperature_min": row.temperature_min,
+            "temperature_max": row.temperature_max,
+            "max_height_cm": row.max_height_cm,
+            "soil_type": row.soil_type,
+            "is_toxic": row.is_toxic,
+            "enrichment_status": row.enrichment_status or "ready",
+            "suitable_locations": suitable_by_plant.get(row.plant_info_id, [])
         })
     
-    return result
+    return schemas.fast_response(result, response)
 
-@app.delete("/wishlist/{wishlist_id}")
+@app.delete("/wishlist/{wishlist_id}", response_model=schemas.OkOut)
 def delete_wishlist_item(
     wishlist_id: int,
     user_id: int = Depends(require_login),
@@ -351,7 +450,7 @@ def delete_wishlist_item(
     return {"ok": True}
 
 
-@app.put("/wishlist/{item_id}/plant-info")
+@app.put("/wishlist/{item_id}/plant-info", response_model=schemas.PlantInfoUpdatedOut)
 def update_plant_info(item_id: int,updates: PlantInfoUpdate,user_id: int = Depends(require_login),db: Session = Depends(get_db)):
     """Eigenschaften einer Pflanze in der Wunschliste manuell bearbeiten (pro User)"""
 
@@ -393,10 +492,12 @@ def update_plant_info(item_id: int,updates: PlantInfoUpdate,user_id: int = Depen
     if updates.is_toxic is not None:
         plant_info.is_toxic = updates.is_toxic
 
+    compatibility.refresh_plant_infos(db, [plant_info])
+    care_schedule.recompute_for_plant_info(db, plant_info)
     db.commit()
     return {"status": "updated", "plant": plant_info.common_name}
 
-@app.put("/my-plants/{plant_id}/plant-info")
+@app.put("/my-plants/{plant_id}/plant-info", response_model=schemas.PlantInfoUpdatedOut)
 def update_my_plant_info(plant_id: int, updates: PlantInfoUpdate, user_id: int = Depends(require_login), db: Session = Depends(get_db)):
     """Eigenschaften einer bereits besessenen Pflanze im Dashboard bearbeiten"""
     
@@ -440,10 +541,94 @@ def update_my_plant_info(plant_id: int, updates: PlantInfoUpdate, user_id: int =
     if updates.is_toxic is not None:
         plant_info.is_toxic = updates.is_toxic
 
+    compatibility.refresh_plant_infos(db, [plant_info])
+    care_schedule.recompute_for_plant_info(db, plant_info)
     db.commit()
     return {"status": "updated", "plant": plant_info.common_name}
 
-@app.get("/locations/{location_id}/details")
+LOCATION_FIELDS = [
+    models.Location.id, models.Location.name, models.Location.light_level, models.Location.humidity_level,
+    models.Location.temperature_avg, models.Location.available_space_cm, models.Location.has_pets_or_children
+]
+
+
+def location_dict(location):
+    return {
+        "id": location.id,
+        "name": location.name,
+        "light_level": location.light_level,
+        "humidity_level": location.humidity_level,
+        "temperature_avg": location.temperature_avg,
+        "available_space_cm": location.available_space_cm,
+        "has_pets_or_children": location.has_pets_or_children
+    }
+
+
+def actual_plants_query(db: Session, user_id: int):
+    """Pflanzen des Users als Spalten-Tupel für actual_plant_dict (ohne PlantInfo fallen sie heraus)"""
+    return (
+        db.query(
+            models.MyPlant.id, models.MyPlant.nickname, models.MyPlant.location_id,
+            models.PlantInfo.id.label("plant_info_id"), models.PlantInfo.common_name,
+            models.PlantInfo.scientific_name, models.PlantInfo.image_url
+        )
+        .join(models.PlantInfo, models.MyPlant.plant_info_id == models.PlantInfo.id)
+        .filter(models.MyPlant.user_id == user_id)
+    )
+
+
+def actual_plant_dict(row):
+    return {
+        "id": row.id,
+        "nickname": row.nickname,
+        "species": row.common_name or row.scientific_name,
+        "image": row.image_url,
+        "thumbnail": image_service.thumbnail_url(row.plant_info_id, row.image_url)
+    }
+
+
+def compatible_wishlist_dicts(rows):
+    return [
+        {
+            "wishlist_id": wishlist_id,
+            "common_name": common_name,
+            "scientific_name": scientific_name,
+            "image": image_url,
+            "thumbnail": image_service.thumbnail_url(plant_info_id, image_url)
+        }
+        for wishlist_id, common_name, scientific_name, image_url, plant_info_id in rows
+    ]
+
+
+@app.get("/locations/overview", response_model=List[schemas.LocationDetailsOut])
+def get_locations_overview(request: Request, response: Response, user_id: int = Depends(require_login), db: Session = Depends(get_db)):
+    """
+    Alle Standorte mit ihren Pflanzen und passenden Wunschlisten-Pflanzen in einem Aufruf
+    (gleicher Aufbau wie /locations/{id}/details, als Liste). Drei Abfragen, egal wie viele Standorte.
+    """
+    not_modified = data_version.conditional(request, response, data_version.etag(db, user_id, "overview"))
+    if not_modified:
+        return not_modified
+
+    locations = db.query(*LOCATION_FIELDS).filter(models.Location.user_id == user_id).order_by(models.Location.id).all()
+
+    plants_by_location = {}
+    for row in actual_plants_query(db, user_id).order_by(models.MyPlant.id):
+        plants_by_location.setdefault(row.location_id, []).append(actual_plant_dict(row))
+
+    compatible = compatibility.compatible_wishlist_by_location(db, user_id)
+
+    return schemas.fast_response([
+        {
+            "location": location_dict(location),
+            "actual_plants": plants_by_location.get(location.id, []),
+            "compatible_wishlist_plants": compatible_wishlist_dicts(compatible.get(location.id, []))
+        }
+        for location in locations
+    ], response)
+
+
+@app.get("/locations/{location_id}/details", response_model=schemas.LocationDetailsOut)
 def get_location_details(
     location_id: int,
     user_id: int = Depends(require_login),
@@ -452,7 +637,7 @@ def get_location_details(
     """Zeigt alle Pflanzen an einem Standort + passende Wunschlistenpflanzen (pro User)"""
 
     # Standort nur laden, wenn er dem User gehört
-    location = db.query(models.Location).filter(
+    location = db.query(*LOCATION_FIELDS).filter(
         models.Location.id == location_id,
         models.Location.user_id == user_id
     ).first()
@@ -461,152 +646,128 @@ def get_location_details(
         raise HTTPException(status_code=404, detail="Standort nicht gefunden")
 
     # Tatsächliche Pflanzen am Standort (nur dieses Users, extra-safe)
-    actual_plants = []
-    for plant in location.my_plants:
-        if getattr(plant, "user_id", user_id) != user_id:
-            continue
-        if not plant.plant_info:
-            continue
-
-        actual_plants.append({
-            "id": plant.id,
-            "nickname": plant.nickname,
-            "species": plant.plant_info.common_name or plant.plant_info.scientific_name,
-            "image": plant.plant_info.image_url
-        })
+    location_plants = actual_plants_query(db, user_id).filter(models.MyPlant.location_id == location.id).all()
+    actual_plants = [actual_plant_dict(row) for row in location_plants]
 
-    # Wunschlisten-Pflanzen nur vom User
-    wishlist = db.query(models.Wishlist).filter(models.Wishlist.user_id == user_id).all()
-    compatible_wishlist = []
+    # Passende Wunschlisten-Pflanzen: ein Join über die materialisierte Kompatibilität
+    compatible_wishlist = compatible_wishlist_dicts(
+        compatibility.compatible_wishlist_rows(db, user_id, location.id)
+    )
 
-    for item in wishlist:
-        plant = item.plant_info
-        if not plant:
-            continue
-        is_compatible = True
+    return schemas.fast_response({
+        "location": location_dict(location),
+        "actual_plants": actual_plants,
+        "compatible_wishlist_plants": compatible_wishlist
+    })
 
-        # Licht-Check
-        if abs(plant.sunlight_requirement - location.light_level) > 2:
-            is_compatible = False
+@app.get("/dashboard/tasks", response_model=List[schemas.TaskOut])
+def dashboard_tasks(request: Request, response: Response, days: int = None, user_id: int = Depends(require_login),db: Session = Depends(get_db)):
+    """
+    Pflegeaufgaben aller Pflanzen, sortiert nach der nächsten Fälligkeit.
+    Mit ?days=N nur Pflanzen, bei denen in den nächsten N Tagen etwas fällig ist (Range-Scan auf next_any_due).
+    """
+    today = date.today()
+    # "in X Tagen" ändert sich mit dem Datum -> Tag gehört in den ETag
+    tag = data_version.etag(db, user_id, "tasks", today.isoformat(), f"d{days}" if days is not None else None)
+    not_modified = data_version.conditional(request, response, tag)
+    if not_modified:
+        return not_modified
+    query = care_schedule.task_query(db, user_id)
+    if days is not None:
+        query = query.filter(models.MyPlant.next_any_due <= today + timedelta(days=days))
+    rows = query.order_by(models.MyPlant.next_any_due, models.MyPlant.id).all()
+
+    return schemas.fast_response([care_schedule.build_task(row, today) for row in rows], response)
+
+
+# Ab so vielen Pflanzen pro Änderung bekommen Live-Clients "resync" statt der einzelnen Einträge
+PUSH_TASKS_LIMIT = int(os.getenv("LIVE_UPDATES_MAX_TASKS", "200"))
+
+
+def push_tasks(db: Session, user_id: int, plant_ids, event: str = "task_updated"):
+    """Schickt die aktuellen Dashboard-Einträge der Pflanzen an offene Live-Verbindungen des Users"""
+    if not plant_ids or not live_updates.broker.has_subscribers(user_id):
+        return
+    if len(plant_ids) > PUSH_TASKS_LIMIT:
+        # Große Sammelaktionen nicht als Riesen-Event schicken -> Client lädt neu
+        live_updates.broker.publish(user_id, "resync", {})
+        return
+    rows = care_schedule.task_query(db, user_id).filter(models.MyPlant.id.in_(list(plant_ids))).all()
+    today = date.today()
+    tasks = [care_schedule.build_task(row, today) for row in rows]
+    if tasks:
+        live_updates.broker.publish(user_id, event, {"tasks": tasks})
+
+
+@app.get("/events", response_class=StreamingResponse)
+async def live_events(user_id: int = Depends(require_login)):
+    """
+    Server-Sent Events mit Änderungen am Dashboard des Users:
+    task_updated / plant_updated ({"tasks": [...]}, Einträge wie /dashboard/tasks),
+    plant_removed ({"id": ...}) und resync (alles neu laden).
+    """
+    return StreamingResponse(
+        live_updates.stream(user_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
-        # Luftfeuchtigkeit-Check
-        if abs(plant.humidity_requirement - location.humidity_level) > 2:
-            is_compatible = False
+class BulkCareRequest(BaseModel):
+    plant_ids: List[int]
 
-        # Temperatur-Check
-        if location.temperature_avg < plant.temperature_min or location.temperature_avg > plant.temperature_max:
-            is_compatible = False
 
-        # Platz-Check
-        if plant.max_height_cm > location.available_space_cm:
-            is_compatible = False
+def bulk_care(db: Session, user_id: int, action: str, plant_ids=None, location_id: int = None):
+    """Pflege-Aktion für viele Pflanzen in einer Transaktion, Ergebnis pro Pflanze"""
+    if action not in care_schedule.BULK_ACTIONS:
+        raise HTTPException(status_code=404, detail="Unbekannte Pflege-Aktion")
 
-        # Giftigkeit-Check
-        if plant.is_toxic and location.has_pets_or_children:
-            is_compatible = False
+    today = date.today()
+    updated = care_schedule.apply_bulk(db, user_id, action, today, plant_ids=plant_ids, location_id=location_id)
+    if updated:
+        # Massen-UPDATE läuft am Flush vorbei -> Version selbst hochzählen
+        data_version.bump(db, user_id)
+    db.commit()
+    care_events.buffer.record_many(list(updated), user_id, action)
+    push_tasks(db, user_id, list(updated))
+
+    field = care_schedule.BULK_ACTIONS[action]
+    ids = list(dict.fromkeys(plant_ids)) if plant_ids is not None else list(updated)
+    results = [
+        {"id": pid, "status": "success", "plant": updated[pid], field: str(today)}
+        if pid in updated else {"id": pid, "status": "not_found"}
+        for pid in ids
+    ]
+    return {"status": "success", "action": action, "updated": len(updated), "results": results}
+
+
+# Muss vor /my-plants/{plant_id}/... stehen, sonst wird "bulk" als plant_id gelesen
+@app.post("/my-plants/bulk/{action}", response_model=schemas.BulkCareOut)
+def bulk_care_plants(
+    action: str,
+    payload: BulkCareRequest,
+    user_id: int = Depends(require_login),
+    db: Session = Depends(get_db)
+):
+    """Gießt/düngt/topft um/schneidet mehrere Pflanzen auf einmal"""
+    return bulk_care(db, user_id, action, plant_ids=payload.plant_ids)
 
-        if is_compatible:
-            compatible_wishlist.append({
-                "wishlist_id": item.id,
-                "common_name": plant.common_name,
-                "scientific_name": plant.scientific_name,
-                "image": plant.image_url
-            })
 
-    return {
-        "location": {
-            "id": location.id,
-            "name": location.name,
-            "light_level": location.light_level,
-            "humidity_level": location.humidity_level,
-            "temperature_avg": location.temperature_avg,
-            "available_space_cm": location.available_space_cm,
-            "has_pets_or_children": location.has_pets_or_children
-        },
-        "actual_plants": actual_plants,
-        "compatible_wishlist_plants": compatible_wishlist
-    }
+@app.post("/locations/{location_id}/{action}-all", response_model=schemas.BulkCareOut)
+def bulk_care_location(
+    location_id: int,
+    action: str,
+    user_id: int = Depends(require_login),
+    db: Session = Depends(get_db)
+):
+    """Pflege-Aktion für alle Pflanzen eines Standorts, z.B. POST /locations/3/water-all"""
+    location = db.query(models.Location.id).filter(
+        models.Location.id == location_id,
+        models.Location.user_id == user_id
+    ).first()
+    if not location:
+        raise HTTPException(status_code=404, detail="Standort nicht gefunden")
+    return bulk_care(db, user_id, action, location_id=location_id)
 
-@app.get("/dashboard/tasks")
-def dashboard_tasks(user_id: int = Depends(require_login),db: Session = Depends(get_db)):
-    tasks = []
-    my_plants = db.query(models.MyPlant).filter(models.MyPlant.user_id == user_id).all()
-    
-    for plant in my_plants:
-        # Gießen
-        water_interval = plant.plant_info.water_frequency_days
-        next_water = plant.last_watered + timedelta(days=water_interval)
-        water_days_until = (next_water - date.today()).days
-        
-        # Düngen
-        fertilize_interval = plant.plant_info.fertilize_frequency_days
-        last_fert = plant.last_fertilized or plant.date_acquired
-        next_fertilize = last_fert + timedelta(days=fertilize_interval)
-        fert_days_until = (next_fertilize - date.today()).days
-        
-        # Umtopfen
-        repot_interval = plant.plant_info.repot_frequency_days
-        last_rep = plant.last_repotted or plant.date_acquired
-        next_repot = last_rep + timedelta(days=repot_interval)
-        repot_days_until = (next_repot - date.today()).days
-        
-        # Schneiden
-        prune_interval = plant.plant_info.prune_frequency_days
-        last_pru = plant.last_pruned or plant.date_acquired
-        next_prune = last_pru + timedelta(days=prune_interval)
-        prune_days_until = (next_prune - date.today()).days
-        
-        # Vermehren
-        propagate_interval = plant.plant_info.propagate_frequency_days
-        last_prop = plant.last_propagated or plant.date_acquired
-        next_propagate = last_prop + timedelta(days=propagate_interval)
-        prop_days_until = (next_propagate - date.today()).days
-
-        
-        # Nächste fällige Aufgabe bestimmen
-        all_tasks = [
-         ("water", water_days_until),
-        ("fertilize", fert_days_until),
-        ("repot", repot_days_until),
-        ("prune", prune_days_until),
-        ("propagate", prop_days_until)
-        ]
-
-        all_tasks.sort(key=lambda x: x[1])
-        next_task = all_tasks[0]
-        
-        status = "OK"
-        if next_task[1] < 0: status = "ÜBERFÄLLIG"
-        elif next_task[1] == 0: status = "HEUTE"
-        
-        tasks.append({
-            "id": plant.id,
-            "plant": plant.nickname,
-            "species": plant.plant_info.common_name or plant.plant_info.scientific_name,
-            "location": plant.location.name,
-            "image": plant.plant_info.image_url,
-            "days_until_watering": water_days_until,
-            "days_until_fertilizing": fert_days_until,
-            "days_until_repotting": repot_days_until,
-            "days_until_pruning": prune_days_until,
-            "days_until_propagating": prop_days_until,
-            "next_task": next_task[0],
-            "next_task_days": next_task[1],
-            "status": status,
-            "plant_info_full": {
-                "water_frequency_days": plant.plant_info.water_frequency_days,
-                "fertilize_frequency_days": plant.plant_info.fertilize_frequency_days,
-                "sunlight_requirement": plant.plant_info.sunlight_requirement,
-                "humidity_requirement": plant.plant_info.humidity_requirement,
-                "temperature_min": plant.plant_info.temperature_min,
-                "temperature_max": plant.plant_info.temperature_max,
-                "max_height_cm": plant.plant_info.max_height_cm,
-                "soil_type": plant.plant_info.soil_type,
-                "is_toxic": plant.plant_info.is_toxic
-            }
-        })
-    
-    return sorted(tasks, key=lambda x: x["next_task_days"])
 
 #Helper
 def get_user_plant(db: Session, plant_id: int, user_id: int):
@@ -618,7 +779,7 @@ def get_user_plant(db: Session, plant_id: int, user_id: int):
         raise HTTPException(status_code=404, detail="Pflanze nicht gefunden")
     return plant
 
-@app.post("/my-plants/{plant_id}/water")
+@app.post("/my-plants/{plant_id}/water", response_model=schemas.WateredOut)
 def water_plant(
     plant_id: int,
     user_id: int = Depends(require_login),
@@ -627,11 +788,14 @@ def water_plant(
     """Markiert eine Pflanze als gegossen (pro User)"""
     plant = get_user_plant(db, plant_id, user_id)
     plant.last_watered = date.today()
+    care_schedule.recompute(plant)
     db.commit()
+    care_events.buffer.record(plant.id, user_id, "water")
+    push_tasks(db, user_id, [plant.id])
     return {"status": "success", "plant": plant.nickname, "watered_on": str(date.today())}
 
 
-@app.post("/my-plants/{plant_id}/fertilize")
+@app.post("/my-plants/{plant_id}/fertilize", response_model=schemas.FertilizedOut)
 def fertilize_plant(
     plant_id: int,
     user_id: int = Depends(require_login),
@@ -640,11 +804,14 @@ def fertilize_plant(
     """Markiert eine Pflanze als gedüngt (pro User)"""
     plant = get_user_plant(db, plant_id, user_id)
     plant.last_fertilized = date.today()
+    care_schedule.recompute(plant)
     db.commit()
+    care_events.buffer.record(plant.id, user_id, "fertilize")
+    push_tasks(db, user_id, [plant.id])
     return {"status": "success", "plant": plant.nickname, "fertilized_on": str(date.today())}
 
 
-@app.post("/my-plants/{plant_id}/repot")
+@app.post("/my-plants/{plant_id}/repot", response_model=schemas.RepottedOut)
 def repot_plant(
     plant_id: int,
     user_id: int = Depends(require_login),
@@ -653,11 +820,14 @@ def repot_plant(
     """Markiert eine Pflanze als umgetopft (pro User)"""
     plant = get_user_plant(db, plant_id, user_id)
     plant.last_repotted = date.today()
+    care_schedule.recompute(plant)
     db.commit()
+    care_events.buffer.record(plant.id, user_id, "repot")
+    push_tasks(db, user_id, [plant.id])
     return {"status": "success", "plant": plant.nickname, "repotted_on": str(date.today())}
 
 
-@app.post("/my-plants/{plant_id}/prune")
+@app.post("/my-plants/{plant_id}/prune", response_model=schemas.PrunedOut)
 def prune_plant(
     plant_id: int,
     user_id: int = Depends(require_login),
@@ -666,13 +836,16 @@ def prune_plant(
     """Markiert eine Pflanze als geschnitten (pro User)"""
     plant = get_user_plant(db, plant_id, user_id)
     plant.last_pruned = date.today()
+    care_schedule.recompute(plant)
     db.commit()
+    care_events.buffer.record(plant.id, user_id, "prune")
+    push_tasks(db, user_id, [plant.id])
     return {"status": "success", "plant": plant.nickname, "pruned_on": str(date.today())}
 
 
 from datetime import timedelta
 
-@app.post("/admin/my-plants/{plant_id}/simulate/{days}")
+@app.post("/admin/my-plants/{plant_id}/simulate/{days}", response_model=schemas.SimulatedOut, dependencies=[Depends(require_admin)])
 def simulate_single_plant(plant_id: int, days: int, db: Session = Depends(get_db)):
     """
     Demo-Helfer: setzt die Pflege-Daten EINER Pflanze um X Tage zurück
@@ -691,6 +864,7 @@ def simulate_single_plant(plant_id: int, days: int, db: Session = Depends(get_db
         plant.last_pruned -= timedelta(days=days)
     if hasattr(plant, "last_propagated") and plant.last_propagated:
         plant.last_propagated -= timedelta(days=days)
+    care_schedule.recompute(plant)
 
     db.commit()
 
@@ -700,8 +874,178 @@ def simulate_single_plant(plant_id: int, days: int, db: Session = Depends(get_db
         "nickname": plant.nickname,
         "days_shifted": days
     }
-    
-@app.delete("/my-plants/{plant_id}")
+
+@app.get("/images/{plant_info_id}", response_class=FileResponse)
+def plant_image(
+    plant_info_id: int,
+    request: Request,
+    w: int = 320,
+    v: str = None,
+    user_id: int = Depends(require_login),
+    db: Session = Depends(get_db)
+):
+    """
+    Verkleinertes Pflanzenbild über den lokalen Cache statt des Originals vom fremden Server.
+    Mit passendem ?v= (aus den Listen-Endpoints) ist die URL unveränderlich -> immutable.
+    Nur für angemeldete User und nur geteilte oder eigene PlantInfos (löst sonst beliebige Downloads aus).
+    """
+    image_url = (
+        db.query(models.PlantInfo.image_url)
+        .filter(
+            models.PlantInfo.id == plant_info_id,
+            or_(models.PlantInfo.owner_user_id.is_(None), models.PlantInfo.owner_user_id == user_id)
+        )
+        .scalar()
+    )
+    if not image_url:
+        raise HTTPException(status_code=404, detail="Kein Bild vorhanden")
+    db.close()  # Download kann dauern -> Verbindung nicht festhalten
+
+    try:
+        path, content_type, etag = image_service.get_thumbnail(image_url, w)
+    except image_service.ImageURLRejected:
+        raise HTTPException(status_code=404, detail="Kein Bild vorhanden")
+    except image_service.ImageFetchError as e:
+        raise HTTPException(status_code=502, detail=f"Bild konnte nicht geladen werden: {e}")
+
+    versioned = v is not None and v == image_service.url_hash(image_url)[:8]
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "private, max-age=31536000, immutable" if versioned else "private, max-age=86400",
+    }
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return FileResponse(path, media_type=content_type, headers=headers)
+
+@app.get("/admin/image-cache", response_model=Dict[str, Any], dependencies=[Depends(require_admin)])
+def image_cache_stats():
+    """Größe und Trefferquote des Thumbnail-Caches"""
+    return image_service.cache.stats()
+
+@app.delete("/admin/image-cache", response_model=schemas.InvalidatedOut, dependencies=[Depends(require_admin)])
+def image_cache_clear():
+    """Löscht alle gecachten Thumbnails"""
+    return {"status": "ok", "invalidated": image_service.cache.invalidate()}
+
+@app.get("/admin/trefle-cache", response_model=Dict[str, Any], dependencies=[Depends(require_admin)])
+def trefle_cache_stats():
+    """Hit/Miss-Zähler und Größe des Trefle-Detail-Caches"""
+    return trefle_service.detail_cache.stats()
+
+@app.delete("/admin/trefle-cache", response_model=schemas.InvalidatedOut, dependencies=[Depends(require_admin)])
+def trefle_cache_clear():
+    """Leert den kompletten Trefle-Detail-Cache"""
+    return {"status": "ok", "invalidated": trefle_service.detail_cache.invalidate()}
+
+@app.delete("/admin/trefle-cache/{trefle_id}", response_model=schemas.InvalidatedOut, dependencies=[Depends(require_admin)])
+def trefle_cache_invalidate(trefle_id: int):
+    """Verwirft die gecachten Details einer einzelnen Pflanze"""
+    return {"status": "ok", "invalidated": trefle_service.detail_cache.invalidate(trefle_id)}
+
+@app.get("/admin/sql-budget", response_model=schemas.SqlBudgetOut, dependencies=[Depends(require_admin)])
+def sql_budget_violations():
+    """Die letzten Requests, die das SQL-Statement-Budget überschritten haben"""
+    return {"default_budget": query_budget.DEFAULT_BUDGET, "violations": list(query_budget.violations)}
+
+@app.get("/admin/search-cache", response_model=Dict[str, Any], dependencies=[Depends(require_admin)])
+def search_cache_stats():
+    """Trefferquote, zusammengelegte Requests und Speicherverbrauch des Such-Caches"""
+    return trefle_service.search_cache.stats()
+
+@app.delete("/admin/search-cache", response_model=schemas.InvalidatedOut, dependencies=[Depends(require_admin)])
+def search_cache_clear():
+    """Leert den Such-Cache"""
+    return {"status": "ok", "invalidated": trefle_service.search_cache.invalidate()}
+
+@app.get("/admin/care-events", response_model=Dict[str, Any], dependencies=[Depends(require_admin)])
+def care_events_stats():
+    """Füllstand und Schreib-Statistik des Pflege-Journal-Puffers"""
+    return care_events.buffer.stats()
+
+@app.get("/admin/live-updates", response_model=Dict[str, Any], dependencies=[Depends(require_admin)])
+def live_updates_stats():
+    """Offene Live-Verbindungen und verschickte Events"""
+    return live_updates.broker.stats()
+
+@app.get("/admin/session-cache", response_model=Dict[str, Any], dependencies=[Depends(require_admin)])
+def session_cache_stats():
+    """Größe und Trefferquote des Principal-Caches (Session-Tokens)"""
+    return sessions.principal_cache.stats()
+
+@app.get("/my-plants/{plant_id}/history", response_model=schemas.CareHistoryOut)
+def plant_history(
+    plant_id: int,
+    since: datetime = None,
+    until: datetime = None,
+    limit: int = 50,
+    before_id: int = None,
+    user_id: int = Depends(require_login),
+    db: Session = Depends(get_db)
+):
+    """Pflege-Historie einer Pflanze (neueste zuerst), gefiltert nach Zeitraum, seitenweise"""
+    # Gepufferte Events zuerst schreiben, damit gerade erledigte Aktionen sichtbar sind
+    try:
+        care_events.buffer.flush()
+    except Exception as e:
+        # Events bleiben im Puffer; ausgeliefert wird, was schon geschrieben ist
+        print(f"Care-Events Flush Fehler: {e}")
+    return schemas.fast_response(care_events.history(db, user_id, plant_id, since=since, until=until,
+                                                     limit=max(1, min(limit, 500)), before_id=before_id))
+
+@app.get("/export", response_class=StreamingResponse)
+def export_data(
+    format: str = "jsonl",
+    type: List[str] = Query(None),
+    user_id: int = Depends(require_login)
+):
+    """
+    Alle Daten des Users als Download, zeilenweise gestreamt: JSONL (ein Objekt pro Zeile, Feld "type")
+    oder CSV (Spalte "type"). Mit ?type=plant&type=location nur diese Satzarten.
+    """
+    if format not in export.MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="format muss jsonl oder csv sein")
+    unknown = [k for k in type or [] if k not in export.TABLES]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unbekannte Satzart: {', '.join(unknown)}")
+    # Immer in Abhängigkeitsreihenfolge, damit der Export wieder importierbar ist
+    kinds = [k for k in export.TABLES if not type or k in type]
+
+    filename = f"care-for-plants-{date.today().isoformat()}.{format}"
+    return StreamingResponse(
+        export.stream(user_id, format, kinds),
+        media_type=export.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"', "Cache-Control": "no-store"},
+    )
+
+# Statements wachsen mit der Dateigröße (pro Batch ein paar) -> kein festes Budget
+query_budget.budgets["/import"] = 0
+
+@app.post("/import", response_class=StreamingResponse)
+def import_data(
+    file: UploadFile = File(...),
+    format: str = None,
+    type: str = None,
+    user_id: int = Depends(require_login)
+):
+    """
+    Sammel-Import von Standorten, eigenen PlantInfos, Wunschliste und Pflanzen aus CSV/JSONL (Aufbau siehe bulk_import).
+    Antwort ist ein NDJSON-Stream: "error"-Events pro fehlerhafter Zeile, "progress" nach jedem Batch, am Ende "done".
+    Ohne Spalte "type" gilt ?type= für alle Zeilen.
+    """
+    fmt = format or Path(file.filename or "").suffix.lstrip(".").lower().replace("ndjson", "jsonl")
+    if fmt not in bulk_import.FORMATS:
+        raise HTTPException(status_code=400, detail="format muss csv oder jsonl sein")
+    if type is not None and type not in bulk_import.ROW_MODELS:
+        raise HTTPException(status_code=400, detail=f"Unbekannte Satzart: {type}")
+
+    def events():
+        yield from bulk_import.stream(file.file, fmt, user_id, default_type=type)
+        # Dashboard offener Live-Verbindungen komplett neu laden lassen
+        live_updates.broker.publish(user_id, "resync", {})
+
+    return StreamingResponse(events(), media_type="application/x-ndjson", headers={"Cache-Control": "no-store"})
+
+@app.delete("/my-plants/{plant_id}", response_model=schemas.DeletedOut)
 def delete_my_plant(plant_id: int,user_id: int = Depends(require_login),db: Session = Depends(get_db)):
     plant = db.query(models.MyPlant).filter(
         models.MyPlant.id == plant_id,
@@ -713,13 +1057,14 @@ def delete_my_plant(plant_id: int,user_id: int = Depends(require_login),db: Sess
 
     db.delete(plant)
     db.commit()
+    live_updates.broker.publish(user_id, "plant_removed", {"id": plant_id})
     return {"status": "ok", "deleted_id": plant_id}
 
 
 class MovePlantRequest(BaseModel):
     location_id: int
 
-@app.put("/my-plants/{plant_id}/move")
+@app.put("/my-plants/{plant_id}/move", response_model=schemas.MovedOut)
 def move_my_plant(plant_id: int, body: MovePlantRequest, user_id: int = Depends(require_login), db: Session = Depends(get_db)):
     # Pflanze muss dem User gehören
     plant = db.query(models.MyPlant).filter(models.MyPlant.id == plant_id, models.MyPlant.user_id == user_id).first()
@@ -733,9 +1078,10 @@ def move_my_plant(plant_id: int, body: MovePlantRequest, user_id: int = Depends(
 
     plant.location_id = body.location_id
     db.commit()
+    push_tasks(db, user_id, [plant_id], event="plant_updated")
     return {"status": "ok", "plant_id": plant_id, "new_location_id": body.location_id}
 
-@app.get("/my-plants/{plant_id}/recommended-locations")
+@app.get("/my-plants/{plant_id}/recommended-locations", response_model=List[schemas.RecommendedLocationOut])
 def get_recommended_locations_for_myplant(
     plant_id: int, 
     user_id: int = Depends(require_login), # 1. User ID per Dependency holen
@@ -755,42 +1101,9 @@ def get_recommended_locations_for_myplant(
     # 3. NUR die Standorte des aktuellen Users abfragen!
     locations = db.query(models.Location).filter(models.Location.user_id == user_id).all()
 
-    result = []
-    for loc in locations:
-        reasons = []
-        ok = True
-
-        if abs(pi.sunlight_requirement - loc.light_level) > 2:
-            ok = False
-            reasons.append("Licht passt nicht")
-        
-        if abs(pi.humidity_requirement - loc.humidity_level) > 2:
-            ok = False
-            reasons.append("Feuchtigkeit passt nicht")
-
-        if loc.temperature_avg < pi.temperature_min or loc.temperature_avg > pi.temperature_max:
-            ok = False
-            reasons.append("Temperatur passt nicht")
-
-        if pi.max_height_cm > loc.available_space_cm:
-            ok = False
-            reasons.append("Zu wenig Platz")
-
-        if pi.is_toxic and loc.has_pets_or_children:
-            ok = False
-            reasons.append("Giftig bei Haustieren/Kinder")
-
-        result.append({
-            "id": loc.id,
-            "name": loc.name,
-            "recommended": ok,
-            "reasons": reasons
-        })
-
-    result.sort(key=lambda x: (not x["recommended"], x["name"].lower()))
-    return result
+    return schemas.fast_response(compatibility.recommendations(pi, locations))
 
-@app.get("/wishlist/{wishlist_id}/recommended-locations")
+@app.get("/wishlist/{wishlist_id}/recommended-locations", response_model=List[schemas.RecommendedLocationOut])
 def get_recommended_locations_for_wishlist(
     wishlist_id: int,
     user_id: int = Depends(require_login),
@@ -809,42 +1122,27 @@ def get_recommended_locations_for_wishlist(
     # NUR Standorte des aktuellen Users
     locations = db.query(models.Location).filter(models.Location.user_id == user_id).all()
 
-    result = []
-    for loc in locations:
-        reasons = []
-        ok = True
-
-        if abs(pi.sunlight_requirement - loc.light_level) > 2:
-            ok = False; reasons.append("Licht passt nicht")
-        if abs(pi.humidity_requirement - loc.humidity_level) > 2:
-            ok = False; reasons.append("Feuchtigkeit passt nicht")
-        if loc.temperature_avg < pi.temperature_min or loc.temperature_avg > pi.temperature_max:
-            ok = False; reasons.append("Temperatur passt nicht")
-        if pi.max_height_cm > loc.available_space_cm:
-            ok = False; reasons.append("Zu wenig Platz")
-        if pi.is_toxic and loc.has_pets_or_children:
-            ok = False; reasons.append("Giftig bei Haustieren/Kinder")
-
-        result.append({
-            "id": loc.id,
-            "name": loc.name,
-            "recommended": ok,
-            "reasons": reasons
-        })
-
-    result.sort(key=lambda x: (not x["recommended"], x["name"].lower()))
-    return result
+    return schemas.fast_response(compatibility.recommendations(pi, locations))
 
 
-from fastapi.responses import FileResponse
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parent.parent  # Projekt-Root
 FRONTEND_DIR = ROOT / "frontend"
 
-@app.get("/")
-def serve_frontend():
-    return FileResponse(FRONTEND_DIR / "index.html")
+# Frontend: vorkomprimiert, Assets mit Inhalts-Hash in der URL (langes Caching)
+assets = static_assets.StaticAssets(FRONTEND_DIR)
+
+@app.get("/", include_in_schema=False)
+def serve_frontend(request: Request):
+    return assets.page_response("index.html", request)
+
+@app.get(static_assets.PREFIX + "/{path:path}", include_in_schema=False)
+def serve_asset(path: str, request: Request):
+    response = assets.asset_response(path, request)
+    if response is None:
+        raise HTTPException(status_code=404, detail="Datei nicht gefunden")
+    return response
 
 from fastapi.staticfiles import StaticFiles
 
@@ -856,20 +1154,24 @@ app.mount(
 
 
 
-@app.post("/my-plants/{plant_id}/propagate")
+@app.post("/my-plants/{plant_id}/propagate", response_model=schemas.PropagatedOut)
 def propagate_plant(
     plant_id: int,
     count: int = 1,
+    location_id: List[int] = Query(None),
     user_id: int = Depends(require_login),
     db: Session = Depends(get_db)
 ):
-    """Erstellt X Ableger einer Pflanze am selben Standort + aktualisiert last_propagated"""
+    """
+    Erstellt X Ableger einer Pflanze + aktualisiert last_propagated.
+    Standardmäßig am Standort der Mutter; mit ?location_id=3&location_id=5 reihum auf diese Standorte verteilt.
+    """
 
     # Guardrails
     if count < 1:
         raise HTTPException(status_code=400, detail="count muss >= 1 sein")
-    if count > 10:
-        raise HTTPException(status_code=400, detail="count zu groß (max 10)")
+    if count > propagation.MAX_CUTTINGS:
+        raise HTTPException(status_code=400, detail=f"count zu groß (max {propagation.MAX_CUTTINGS})")
 
     # 1) Mutterpflanze finden
     mother = db.query(models.MyPlant).filter(
@@ -879,31 +1181,30 @@ def propagate_plant(
     if not mother:
         raise HTTPException(status_code=404, detail="Mutterpflanze nicht gefunden")
 
+    # Zielstandorte müssen dem User gehören
+    target_ids = list(dict.fromkeys(location_id or []))
+    if target_ids:
+        owned = {lid for (lid,) in db.query(models.Location.id).filter(
+            models.Location.id.in_(target_ids),
+            models.Location.user_id == user_id
+        )}
+        if len(owned) != len(target_ids):
+            raise HTTPException(status_code=404, detail="Standort nicht gefunden")
+
     # 2) Mutterpflanze als vermehrt markieren (Pflege-Logik)
-    mother.last_propagated = date.today()
-
-    # 3) Ableger anlegen
-    created_ids = []
-    for i in range(count):
-        baby = models.MyPlant(
-            user_id=user_id,
-            nickname=f"Ableger von {mother.nickname} #{i+1}",
-            plant_info_id=mother.plant_info_id,
-            location_id=mother.location_id,
-            date_acquired=date.today(),
-
-            # Startwerte für Pflege: heute “eingezogen”, also frisch
-            last_watered=date.today(),
-            last_fertilized=date.today(),
-            last_repotted=mother.last_repotted,   # optional: übernehmen oder None
-            last_pruned=mother.last_pruned,       # optional
-            last_propagated=None                  # optional: Ableger selbst noch nicht “vermehrt”
-        )
-        db.add(baby)
-        db.flush()               # damit baby.id sofort da ist
-        created_ids.append(baby.id)
+    today = date.today()
+    mother.last_propagated = today
+    care_schedule.recompute(mother)
+
+    # 3) Ableger mit mehrzeiligen INSERTs anlegen (gleiche Transaktion)
+    rows = propagation.cutting_rows(mother, mother.plant_info, count, target_ids, today)
+    created_ids = propagation.insert_cuttings(db, rows)
+    # Core-INSERT läuft am Flush vorbei -> Version selbst hochzählen
+    data_version.bump(db, user_id)
 
     db.commit()
+    care_events.buffer.record(mother.id, user_id, "propagate")
+    push_tasks(db, user_id, [mother.id] + created_ids)
 
     return {
         "status": "success",
@@ -0,0 +1,41 @@
+# backend/migrations/0001_add_missing_columns.py
+from sqlalchemy import Column, Date, Integer, String
+
+DESCRIPTION = "Spalten ergänzen, die create_all bei bestehenden Tabellen nicht nachträgt"
+
+# Stand der Models beim Anlegen dieser Migration, bewusst eingefroren: spätere Spalten
+# bekommen eine eigene Migration (sonst hinge das Ergebnis von 0001 von der Code-Version ab)
+COLUMNS = {
+    # Mehrbenutzer, Katalog (family/genus), Hintergrund-Anreicherung
+    "plant_infos": [
+        Column("owner_user_id", Integer),
+        Column("family", String),
+        Column("genus", String),
+        Column("enrichment_status", String),
+    ],
+    "locations": [
+        Column("user_id", Integer),
+    ],
+    # Mehrbenutzer, gespeicherte Fälligkeiten
+    "my_plants": [
+        Column("user_id", Integer),
+        Column("next_water_due", Date),
+        Column("next_fertilize_due", Date),
+        Column("next_repot_due", Date),
+        Column("next_prune_due", Date),
+        Column("next_propagate_due", Date),
+        Column("next_any_due", Date),
+    ],
+    "wishlist": [
+        Column("user_id", Integer),
+    ],
+}
+
+
+def upgrade(ctx):
+    for table, columns in COLUMNS.items():
+        if not ctx.has_table(table):
+            continue
+        added = [c.name for c in columns if ctx.add_column(table, c)]
+        if added:
+            print(f"  {table}: {', '.join(added)}")
@@ -0,0 +1,23 @@
+# backend/migrations/0002_performance_indexes.py
+DESCRIPTION = "Indizes für die häufigsten Filter (user_id, trefle_id/owner, Fälligkeiten)"
+
+INDEXES = [
+    ("ix_my_plants_user_id", "my_plants", ["user_id"]),
+    ("ix_my_plants_plant_info_id", "my_plants", ["plant_info_id"]),
+    ("ix_my_plants_location_id", "my_plants", ["location_id"]),
+    ("ix_my_plants_user_next_any_due", "my_plants", ["user_id", "next_any_due"]),
+    ("ix_my_plants_next_water_due", "my_plants", ["next_water_due"]),
+    ("ix_my_plants_next_fertilize_due", "my_plants", ["next_fertilize_due"]),
+    ("ix_my_plants_next_repot_due", "my_plants", ["next_repot_due"]),
+    ("ix_my_plants_next_prune_due", "my_plants", ["next_prune_due"]),
+    ("ix_my_plants_next_propagate_due", "my_plants", ["next_propagate_due"]),
+    ("ix_wishlist_user_trefle", "wishlist", ["user_id", "trefle_id"]),
+    ("ix_wishlist_plant_info_id", "wishlist", ["plant_info_id"]),
+    ("ix_plant_infos_trefle_owner", "plant_infos", ["trefle_id", "owner_user_id"]),
+    ("ix_locations_user_id", "locations", ["user_id"]),
+]
+
+
+def upgrade(ctx):
+    for name, table, columns in INDEXES:
+        ctx.create_index(name, table, columns)
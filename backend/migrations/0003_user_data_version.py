@@ -0,0 +1,9 @@
+# backend/migrations/0003_user_data_version.py
+import models
+
+DESCRIPTION = "users.data_version für ETags der Listen-Endpoints"
+
+
+def upgrade(ctx):
+    # Alte Zeilen bleiben NULL -> wird beim Lesen/Hochzählen als 0 behandelt
+    ctx.add_column(models.User.__tablename__, models.User.__table__.c.data_version)
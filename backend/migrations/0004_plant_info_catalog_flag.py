@@ -0,0 +1,9 @@
+# backend/migrations/0004_plant_info_catalog_flag.py
+import models
+
+DESCRIPTION = "plant_infos.catalog_imported: Katalog-Einträge von Wunschlisten-Einträgen unterscheiden"
+
+
+def upgrade(ctx):
+    # Alte Zeilen bleiben NULL -> gelten nicht als Katalog, bis der nächste Import sie aktualisiert
+    ctx.add_column(models.PlantInfo.__tablename__, models.PlantInfo.__table__.c.catalog_imported)
@@ -0,0 +1,9 @@
+# backend/migrations/0005_user_session_version.py
+import models
+
+DESCRIPTION = "users.session_version für den Widerruf von Session-Tokens"
+
+
+def upgrade(ctx):
+    # Alte Zeilen bleiben NULL -> wird als Version 0 behandelt (wie Tokens ohne "ver")
+    ctx.add_column(models.User.__tablename__, models.User.__table__.c.session_version)
@@ -0,0 +1,132 @@
+# backend/migrations/__init__.py
+"""
+Versionierte Schema-Migrationen für plants.db (SQLite) und Postgres.
+
+Jede Migration ist ein Modul NNNN_beschreibung.py in diesem Ordner mit
+    DESCRIPTION = "..."
+    def upgrade(ctx): ...
+Angewendete Versionen stehen in der Tabelle schema_migrations.
+
+Ablauf von upgrade():
+1. Base.metadata.create_all legt NEUE Tabellen an (bestehende bleiben unangetastet)
+2. alle noch nicht angewendeten Migrationen laufen in Versions-Reihenfolge
+
+Aufruf per CLI (aus backend/): python -m migrations [upgrade|status]
+"""
+import importlib
+import pkgutil
+import re
+from datetime import datetime, timezone
+
+from sqlalchemy import inspect, text
+
+import models
+
+_MODULE_PATTERN = re.compile(r"^(\d{4})_\w+$")
+
+
+class MigrationContext:
+    """Hilfsfunktionen für Migrationen - idempotent und ohne Datenverlust"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.dialect = engine.dialect.name
+
+    def columns(self, table: str):
+        return {c["name"] for c in inspect(self.engine).get_columns(table)}
+
+    def has_table(self, table: str):
+        return inspect(self.engine).has_table(table)
+
+    def add_column(self, table: str, column):
+        """Fügt eine Spalte hinzu, falls sie fehlt (immer nullable, ohne FK)"""
+        if column.name in self.columns(table):
+            return False
+        ddl_type = column.type.compile(dialect=self.engine.dialect)
+        with self.engine.begin() as conn:
+            conn.execute(text(f'ALTER TABLE {table} ADD COLUMN {column.name} {ddl_type}'))
+        return True
+
+    def create_index(self, name: str, table: str, columns, unique: bool = False):
+        """
+        Legt einen Index an, falls er fehlt.
+        Postgres: CREATE INDEX CONCURRENTLY (online, blockiert keine Schreibzugriffe).
+        """
+        cols = ", ".join(columns)
+        unique_sql = "UNIQUE " if unique else ""
+
+        if self.dialect == "postgresql":
+            with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                # Ein abgebrochener CONCURRENTLY-Build hinterlässt einen ungültigen Index -> neu bauen
+                invalid = conn.execute(text(
+                    "SELECT 1 FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid "
+                    "WHERE c.relname = :name AND NOT i.indisvalid"
+                ), {"name": name}).first()
+                if invalid:
+                    conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+                conn.execute(text(
+                    f"CREATE {unique_sql}INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({cols})"
+                ))
+            return
+
+        with self.engine.begin() as conn:
+            conn.execute(text(f"CREATE {unique_sql}INDEX IF NOT EXISTS {name} ON {table} ({cols})"))
+
+    def execute(self, sql: str, params: dict = None):
+        with self.engine.begin() as conn:
+            return conn.execute(text(sql), params or {})
+
+
+def discover():
+    """Alle Migrationsmodule als Liste (version, modul), sortiert"""
+    found = []
+    for info in pkgutil.iter_modules(__path__):
+        match = _MODULE_PATTERN.match(info.name)
+        if match:
+            found.append((match.group(1), importlib.import_module(f"{__name__}.{info.name}")))
+    return sorted(found, key=lambda x: x[0])
+
+
+def _ensure_version_table(engine):
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            " version VARCHAR(16) PRIMARY KEY,"
+            " description TEXT,"
+            " applied_at TIMESTAMP)"
+        ))
+
+
+def applied_versions(engine):
+    _ensure_version_table(engine)
+    with engine.connect() as conn:
+        return {row[0] for row in conn.execute(text("SELECT version FROM schema_migrations"))}
+
+
+def status(engine):
+    applied = applied_versions(engine)
+    return [
+        {"version": version, "description": getattr(module, "DESCRIPTION", ""), "applied": version in applied}
+        for version, module in discover()
+    ]
+
+
+def upgrade(engine):
+    """Bringt die Datenbank auf den neuesten Stand. Gibt die neu angewendeten Versionen zurück."""
+    models.Base.metadata.create_all(bind=engine)
+
+    applied = applied_versions(engine)
+    ctx = MigrationContext(engine)
+    done = []
+    for version, module in discover():
+        if version in applied:
+            continue
+        print(f"Migration {version}: {getattr(module, 'DESCRIPTION', '')}")
+        module.upgrade(ctx)
+        with engine.begin() as conn:
+            conn.execute(
+                text("INSERT INTO schema_migrations (version, description, applied_at) VALUES (:v, :d, :t)"),
+                {"v": version, "d": getattr(module, "DESCRIPTION", ""), "t": datetime.now(timezone.utc).replace(tzinfo=None)}
+            )
+        done.append(version)
+    return done
@@ -0,0 +1,17 @@
+# backend/migrations/__main__.py
+import sys
+
+import database
+import migrations
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "upgrade"
+    if command == "upgrade":
+        applied = migrations.upgrade(database.engine)
+        print(f"{len(applied)} Migration(en) angewendet: {', '.join(applied) or '-'}")
+    elif command == "status":
+        for m in migrations.status(database.engine):
+            print(f"{m['version']}  {'x' if m['applied'] else ' '}  {m['description']}")
+    else:
+        print("Verwendung: python -m migrations [upgrade|status]")
+        sys.exit(1)
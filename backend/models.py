@@ -1,5 +1,5 @@
 # backend/models.py
-from sqlalchemy import Column, Integer, String, Boolean, Date, Text, DateTime, ForeignKey, func
+from sqlalchemy import Column, Integer, String, Boolean, Date, Text, DateTime, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 from database import Base
 from sqlalchemy import ForeignKey
@@ -13,6 +13,8 @@ class PlantInfo(Base):
     owner_user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     scientific_name = Column(String)
     common_name = Column(String)
+    family = Column(String, nullable=True)
+    genus = Column(String, nullable=True)
     image_url = Column(String)
     
     # Pflegeanforderungen
@@ -31,15 +33,25 @@ class PlantInfo(Base):
     max_height_cm = Column(Integer, default=100)       # Maximale Höhe
     soil_type = Column(String, default="universal")    # z.B. "universal", "sandig", "lehmig"
     is_toxic = Column(Boolean, default=False)          # Giftig für Haustiere/Kinder?
+
+    # Hintergrund-Anreicherung: "ready" | "pending" (Platzhalter) | "failed"
+    enrichment_status = Column(String, default="ready")
+
+    # Aus dem Katalog-Import (catalog_import.py); nur diese Einträge liefert die lokale Suche
+    catalog_imported = Column(Boolean, default=False)
     
     my_plants = relationship("MyPlant", back_populates="plant_info")
 
+    __table_args__ = (
+        Index("ix_plant_infos_trefle_owner", "trefle_id", "owner_user_id"),
+    )
+
 # 2. Standort: Wo stehen die Pflanzen? - ERWEITERT!
 class Location(Base):
     __tablename__ = "locations"
     
     id = Column(Integer, primary_key=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     name = Column(String)
     
     # Standorteigenschaften
@@ -56,7 +68,7 @@ class MyPlant(Base):
     __tablename__ = "my_plants"
     
     id = Column(Integer, primary_key=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     nickname = Column(String)
     date_acquired = Column(Date)
     
@@ -67,13 +79,25 @@ class MyPlant(Base):
     last_pruned = Column(Date, nullable=True)
     last_propagated = Column(Date, nullable=True)
 
+    # Gespeicherte Fälligkeiten (care_schedule.recompute), damit das Dashboard per Index filtern kann
+    next_water_due = Column(Date, nullable=True, index=True)
+    next_fertilize_due = Column(Date, nullable=True, index=True)
+    next_repot_due = Column(Date, nullable=True, index=True)
+    next_prune_due = Column(Date, nullable=True, index=True)
+    next_propagate_due = Column(Date, nullable=True, index=True)
+    next_any_due = Column(Date, nullable=True)
+
     
-    plant_info_id = Column(Integer, ForeignKey("plant_infos.id"))
-    location_id = Column(Integer, ForeignKey("locations.id"))
+    plant_info_id = Column(Integer, ForeignKey("plant_infos.id"), index=True)
+    location_id = Column(Integer, ForeignKey("locations.id"), index=True)
     
     plant_info = relationship("PlantInfo", back_populates="my_plants")
     location = relationship("Location", back_populates="my_plants")
 
+    __table_args__ = (
+        Index("ix_my_plants_user_next_any_due", "user_id", "next_any_due"),
+    )
+
 # 4. Wunschliste: Pflanzen die der User haben möchte
 class Wishlist(Base):
     __tablename__ = "wishlist"
@@ -81,10 +105,14 @@ class Wishlist(Base):
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     trefle_id = Column(Integer)
-    plant_info_id = Column(Integer, ForeignKey("plant_infos.id"))
+    plant_info_id = Column(Integer, ForeignKey("plant_infos.id"), index=True)
     added_date = Column(Date)
     
     plant_info = relationship("PlantInfo")
+
+    __table_args__ = (
+        Index("ix_wishlist_user_trefle", "user_id", "trefle_id"),
+    )
     
 # 5. Erweiterung
 class User(Base):
@@ -94,4 +122,46 @@ class User(Base):
     username = Column(Text, unique=True, nullable=False)
     password_hash = Column(Text, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Zähler für ETags: steigt bei jeder Änderung an Pflanzen, Wunschliste oder Standorten des Users
+    data_version = Column(Integer, default=0)
+    # Session-Tokens tragen diese Version; Logout zählt hoch -> alle Tokens des Users ungültig
+    session_version = Column(Integer, default=0)
+
+
+# 6. Job-Queue für die Hintergrund-Anreicherung (Trefle-Details nachladen)
+class EnrichmentJob(Base):
+    __tablename__ = "enrichment_jobs"
+
+    id = Column(Integer, primary_key=True)
+    plant_info_id = Column(Integer, ForeignKey("plant_infos.id"), nullable=False, index=True)
+    trefle_id = Column(Integer, nullable=False)
+    status = Column(String, default="queued", index=True)  # queued | running | done | failed
+    attempts = Column(Integer, default=0)
+    max_attempts = Column(Integer, default=5)
+    last_error = Column(Text, nullable=True)
+    next_attempt_at = Column(DateTime, server_default=func.now())
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+# 7. Materialisierte Kompatibilität Pflanze <-> Standort (wird bei Änderungen inkrementell gepflegt)
+class PlantLocationCompatibility(Base):
+    __tablename__ = "plant_location_compatibility"
+
+    plant_info_id = Column(Integer, ForeignKey("plant_infos.id"), primary_key=True)
+    location_id = Column(Integer, ForeignKey("locations.id"), primary_key=True, index=True)
+    ok = Column(Boolean, nullable=False)
+    reasons = Column(Integer, nullable=False, default=0)  # Bitmaske aus compatibility.py
+
+# 8. Pflege-Journal (nur anhängen). Ohne FK auf my_plants: die Historie bleibt nach dem Löschen erhalten.
+class CareEvent(Base):
+    __tablename__ = "care_events"
+
+    id = Column(Integer, primary_key=True)
+    plant_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, nullable=False, index=True)
+    action = Column(String, nullable=False)  # water | fertilize | repot | prune | propagate
+    occurred_at = Column(DateTime, nullable=False)
 
+    __table_args__ = (
+        Index("ix_care_events_plant_occurred", "plant_id", "occurred_at"),
+    )
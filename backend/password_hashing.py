@@ -0,0 +1,75 @@
+# backend/password_hashing.py
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException
+from passlib.context import CryptContext
+
+# bcrypt-Kostenfaktor. Wird er geändert, werden alte Hashes beim nächsten Login neu erzeugt
+# (min = max = default -> alles andere gilt als "needs update").
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# Eigener, kleiner Pool für bcrypt - blockiert nicht den Request-Threadpool
+HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+# Wie viele Aufträge zusätzlich warten dürfen, bevor mit 503 abgelehnt wird
+HASH_QUEUE_SIZE = int(os.getenv("PASSWORD_HASH_QUEUE", "16"))
+
+pwd_ctx = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS,
+)
+
+
+class HashingBusy(Exception):
+    """Pool und Warteschlange sind voll"""
+
+
+class PasswordHasher:
+    """bcrypt auf einem begrenzten Thread-Pool (bcrypt gibt die GIL frei) mit begrenzter Queue"""
+
+    def __init__(self, workers: int = HASH_WORKERS, queue_size: int = HASH_QUEUE_SIZE):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pwd-hash")
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self.rejected = 0
+
+    def _submit(self, fn, *args, wait: bool = False):
+        if not self._slots.acquire(blocking=wait):
+            self.rejected += 1
+            raise HashingBusy()
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    async def verify_and_update(self, password: str, password_hash: str):
+        """(ok, new_hash) - new_hash ist gesetzt, wenn der Hash mit neuem Kostenfaktor ersetzt werden soll"""
+        return await asyncio.wrap_future(self._submit(pwd_ctx.verify_and_update, password, password_hash))
+
+    async def hash(self, password: str):
+        return await asyncio.wrap_future(self._submit(pwd_ctx.hash, password))
+
+    def hash_many(self, passwords):
+        """Synchron, aber parallel auf dem Pool (z.B. beim Seeden)"""
+        futures = [self._submit(pwd_ctx.hash, pw, wait=True) for pw in passwords]
+        return [f.result() for f in futures]
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+hasher = PasswordHasher()
+
+
+def busy_response():
+    return HTTPException(
+        status_code=503,
+        detail="Zu viele Anmeldungen gleichzeitig, bitte gleich nochmal versuchen",
+        headers={"Retry-After": "1"},
+    )
@@ -0,0 +1,57 @@
+# backend/propagation.py
+import os
+
+from sqlalchemy import insert
+
+import models
+import care_schedule
+
+# Obergrenze pro Aufruf (Vermehrungsstation: hunderte Ableger auf einmal)
+MAX_CUTTINGS = int(os.getenv("PROPAGATE_MAX_COUNT", "5000"))
+
+
+def cutting_rows(mother, info, count: int, location_ids, today):
+    """
+    Zeilen für count Ableger der Mutterpflanze inkl. gespeicherter Fälligkeiten.
+    Mit mehreren location_ids werden die Ableger reihum auf die Standorte verteilt.
+    """
+    location_ids = list(location_ids) or [mother.location_id]
+    rows = []
+    for i in range(count):
+        values = {
+            "user_id": mother.user_id,
+            "nickname": f"Ableger von {mother.nickname} #{i+1}",
+            "plant_info_id": mother.plant_info_id,
+            "location_id": location_ids[i % len(location_ids)],
+            "date_acquired": today,
+
+            # Startwerte für Pflege: heute "eingezogen", also frisch
+            "last_watered": today,
+            "last_fertilized": today,
+            "last_repotted": mother.last_repotted,
+            "last_pruned": mother.last_pruned,
+            "last_propagated": None,  # Ableger selbst noch nicht "vermehrt"
+        }
+        if info is not None:
+            values.update(care_schedule.due_dates(values, today, info))
+        rows.append(values)
+    return rows
+
+
+def insert_cuttings(db, rows):
+    """
+    Legt die Ableger an und gibt ihre ids in der Reihenfolge von rows zurück. Commit macht der Aufrufer.
+    - mit RETURNING (Postgres, SQLite >= 3.35): SQLAlchemy bündelt die Zeilen zu mehrzeiligen
+      INSERT ... VALUES (...), (...) RETURNING id (insertmanyvalues)
+    - sonst (ältere SQLite): ein INSERT pro Zeile, id über lastrowid
+    """
+    if not rows:
+        return []
+
+    if db.get_bind().dialect.insert_returning:
+        # Ohne sort_by_parameter_order: das würde SQLite auf ein INSERT pro Zeile zurückstufen.
+        # Neue ids (Sequenz bzw. rowid) steigen in Einfügereihenfolge -> sortieren genügt.
+        stmt = insert(models.MyPlant).returning(models.MyPlant.id)
+        return sorted(db.execute(stmt, rows).scalars())
+
+    return [db.execute(insert(models.MyPlant).values(values)).inserted_primary_key[0] for values in rows]
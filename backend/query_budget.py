@@ -0,0 +1,131 @@
+# backend/query_budget.py
+import contextvars
+import json
+import logging
+import os
+from collections import deque
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+logger = logging.getLogger("care_for_plants.sql")
+
+# Maximale SQL-Statements pro Request, bevor geloggt wird (0 = aus)
+DEFAULT_BUDGET = int(os.getenv("SQL_QUERY_BUDGET", "20"))
+# Strikt: Überschreitungen als 500 beantworten (für Tests/CI)
+STRICT = os.getenv("SQL_QUERY_BUDGET_STRICT", "0") == "1"
+
+# Abweichende Budgets pro Route, z.B. {"/dashboard/tasks": 5}
+budgets = {}
+
+# Die letzten Überschreitungen (für /admin und Tests)
+violations = deque(maxlen=200)
+
+_current = contextvars.ContextVar("sql_query_counter", default=None)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+        self.statements = []
+
+    def record(self, statement):
+        self.count += 1
+        if len(self.statements) < 100:
+            self.statements.append(statement)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    counter = _current.get()
+    if counter is not None:
+        counter.record(statement)
+
+
+def install(engine):
+    """Zählt ab jetzt alle Statements dieser Engine für den aktuellen Request/Kontext"""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+
+
+@contextmanager
+def count_queries():
+    """Zählt die SQL-Statements im with-Block: `with count_queries() as q: ...; q.count`"""
+    counter = QueryCounter()
+    token = _current.set(counter)
+    try:
+        yield counter
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def assert_max_queries(limit: int):
+    """Für Tests: schlägt fehl, wenn der with-Block mehr als limit Statements absetzt"""
+    with count_queries() as counter:
+        yield counter
+    if counter.count > limit:
+        raise QueryBudgetExceeded(
+            f"{counter.count} SQL-Statements (Budget {limit}):\n" + "\n".join(counter.statements)
+        )
+
+
+class QueryBudgetMiddleware:
+    """
+    ASGI-Middleware: zählt SQL-Statements pro Request, setzt X-SQL-Queries und loggt Überschreitungen.
+    Geprüft wird beim Start der Antwort (der Endpoint ist dann fertig); im strikten Modus wird
+    statt der eigentlichen Antwort ein 500 geschickt. Statements, die erst beim Streamen des
+    Bodys laufen, werden danach nur noch geloggt.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        counter = QueryCounter()
+        token = _current.set(counter)
+        state = {"reported": False, "replaced": False}
+
+        def check():
+            # Route ist erst nach dem Routing im Scope -> erst beim Antworten auswerten
+            route = scope.get("route")
+            path = getattr(route, "path", None) or scope.get("path", "")
+            budget = budgets.get(path, DEFAULT_BUDGET)
+            if not budget or counter.count <= budget or state["reported"]:
+                return False
+            state["reported"] = True
+            violations.append({"method": scope.get("method"), "path": path, "queries": counter.count, "budget": budget})
+            logger.warning("SQL-Budget überschritten: %s %s -> %d Statements (Budget %d)",
+                           scope.get("method"), path, counter.count, budget)
+            return True
+
+        async def send_with_count(message):
+            if message["type"] == "http.response.start":
+                count_header = (b"x-sql-queries", str(counter.count).encode())
+                if check() and STRICT:
+                    state["replaced"] = True
+                    body = json.dumps({"detail": f"SQL-Budget überschritten: {counter.count} Statements"}).encode()
+                    await send({"type": "http.response.start", "status": 500, "headers": [
+                        (b"content-type", b"application/json"),
+                        (b"content-length", str(len(body)).encode()),
+                        count_header,
+                    ]})
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                message = dict(message, headers=list(message.get("headers", [])) + [count_header])
+            elif state["replaced"]:
+                return  # ursprünglicher Body wird verworfen
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_count)
+        finally:
+            _current.reset(token)
+        check()
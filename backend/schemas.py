@@ -0,0 +1,252 @@
+# backend/schemas.py
+"""
+Antwort-Schemas der API (für OpenAPI und als Vertrag fürs Frontend) und die schnelle JSON-Antwort.
+
+Die heißen Listen-Endpoints (Dashboard, Wunschliste, Standorte, Suche ...) bauen ihre Dicts direkt
+aus Spalten-Tupeln und geben sie über fast_response() zurück: orjson serialisiert sie in einem Schritt,
+ohne dass FastAPI jedes Objekt erst durch das Schema und jsonable_encoder schickt.
+Das Schema beschreibt trotzdem genau, was dabei herauskommt; tests/test_schemas.py prüft jede
+dieser Antworten gegen ihr response_model (keine fehlenden oder zusätzlichen Felder).
+"""
+from typing import Any, Dict, List, Optional
+
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+
+def fast_response(content, response: Response = None):
+    """
+    content (dicts/lists/date/None ...) direkt als ORJSONResponse.
+    Header, die der Endpoint auf dem injizierten response gesetzt hat (ETag usw.), werden übernommen.
+    """
+    result = ORJSONResponse(content)
+    if response is not None:
+        result.raw_headers.extend(
+            (key, value) for key, value in response.raw_headers
+            if key not in (b"content-length", b"content-type")
+        )
+    return result
+
+
+class StatusOut(BaseModel):
+    status: str
+
+
+class InvalidatedOut(StatusOut):
+    invalidated: int
+
+
+class OkOut(BaseModel):
+    ok: bool
+
+
+# --- Auth ---
+
+class MeOut(BaseModel):
+    id: int
+    username: Optional[str]
+
+
+# --- Suche ---
+
+class PlantSearchResult(BaseModel):
+    id: int
+    scientific_name: Optional[str]
+    common_name: Optional[str]
+    image_url: Optional[str]
+    family: Optional[str]
+    genus: Optional[str]
+
+    class Config:
+        # Trefle-Treffer enthalten noch weitere Felder, die unverändert durchgereicht werden
+        extra = "allow"
+
+
+# --- Standorte ---
+
+class LocationFields(BaseModel):
+    id: int
+    name: str
+    light_level: Optional[int]
+    humidity_level: Optional[int]
+    temperature_avg: Optional[int]
+    available_space_cm: Optional[int]
+    has_pets_or_children: Optional[bool]
+
+
+class LocationOut(LocationFields):
+    user_id: int
+
+    class Config:
+        orm_mode = True
+
+
+class ActualPlantOut(BaseModel):
+    id: int
+    nickname: Optional[str]
+    species: Optional[str]
+    image: Optional[str]
+    thumbnail: Optional[str]
+
+
+class CompatibleWishlistPlantOut(BaseModel):
+    wishlist_id: int
+    common_name: Optional[str]
+    scientific_name: Optional[str]
+    image: Optional[str]
+    thumbnail: Optional[str]
+
+
+class LocationDetailsOut(BaseModel):
+    location: LocationFields
+    actual_plants: List[ActualPlantOut]
+    compatible_wishlist_plants: List[CompatibleWishlistPlantOut]
+
+
+class RecommendedLocationOut(BaseModel):
+    id: int
+    name: str
+    recommended: bool
+    reasons: List[str]
+
+
+# --- Wunschliste ---
+
+class WishlistAddedOut(StatusOut):
+    id: int
+    enrichment_status: Optional[str]
+
+
+class EnrichmentStatusOut(BaseModel):
+    wishlist_id: int
+    plant_info_id: int
+    enrichment_status: str
+    attempts: int
+    last_error: Optional[str]
+
+
+class WishlistItemOut(BaseModel):
+    id: int
+    trefle_id: Optional[int]
+    scientific_name: Optional[str]
+    common_name: Optional[str]
+    image_url: Optional[str]
+    thumbnail: Optional[str]
+    water_frequency_days: Optional[int]
+    sunlight_requirement: Optional[int]
+    humidity_requirement: Optional[int]
+    temperature_min: Optional[int]
+    temperature_max: Optional[int]
+    max_height_cm: Optional[int]
+    soil_type: Optional[str]
+    is_toxic: Optional[bool]
+    enrichment_status: str
+    suitable_locations: List[str]
+
+
+class PlantInfoUpdatedOut(StatusOut):
+    plant: Optional[str]
+
+
+# --- Meine Pflanzen / Dashboard ---
+
+class MyPlantCreatedOut(StatusOut):
+    plant: str
+    id: int
+
+
+class PlantInfoFullOut(BaseModel):
+    water_frequency_days: Optional[int]
+    fertilize_frequency_days: Optional[int]
+    sunlight_requirement: Optional[int]
+    humidity_requirement: Optional[int]
+    temperature_min: Optional[int]
+    temperature_max: Optional[int]
+    max_height_cm: Optional[int]
+    soil_type: Optional[str]
+    is_toxic: Optional[bool]
+
+
+class TaskOut(BaseModel):
+    id: int
+    plant: Optional[str]
+    species: Optional[str]
+    location: Optional[str]
+    image: Optional[str]
+    thumbnail: Optional[str]
+    days_until_watering: Optional[int]
+    days_until_fertilizing: Optional[int]
+    days_until_repotting: Optional[int]
+    days_until_pruning: Optional[int]
+    days_until_propagating: Optional[int]
+    next_task: Optional[str]
+    next_task_days: Optional[int]
+    status: str
+    plant_info_full: PlantInfoFullOut
+
+
+class WateredOut(StatusOut):
+    plant: Optional[str]
+    watered_on: str
+
+
+class FertilizedOut(StatusOut):
+    plant: Optional[str]
+    fertilized_on: str
+
+
+class RepottedOut(StatusOut):
+    plant: Optional[str]
+    repotted_on: str
+
+
+class PrunedOut(StatusOut):
+    plant: Optional[str]
+    pruned_on: str
+
+
+class BulkCareOut(StatusOut):
+    action: str
+    updated: int
+    # {"id", "status", "plant", "<aktion>_on"} bzw. {"id", "status": "not_found"}
+    results: List[Dict[str, Any]]
+
+
+class SimulatedOut(StatusOut):
+    plant_id: int
+    nickname: Optional[str]
+    days_shifted: int
+
+
+class CareEventOut(BaseModel):
+    id: int
+    action: str
+    occurred_at: str
+
+
+class CareHistoryOut(BaseModel):
+    events: List[CareEventOut]
+    next_before_id: Optional[int]
+
+
+class DeletedOut(StatusOut):
+    deleted_id: int
+
+
+class MovedOut(StatusOut):
+    plant_id: int
+    new_location_id: int
+
+
+class PropagatedOut(StatusOut):
+    message: str
+    created: int
+    ids: List[int]
+
+
+# --- Admin ---
+
+class SqlBudgetOut(BaseModel):
+    default_budget: int
+    violations: List[Dict[str, Any]]
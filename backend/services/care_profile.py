@@ -0,0 +1,298 @@
+# backend/services/care_profile.py
+"""
+Pflegeprofil aus einem Trefle-Datensatz ableiten: reine Funktionen, kein Netzwerk, keine DB.
+
+- Trefle-Werte (Bodenfeuchte, Wachstum, Licht, Höhe, Temperatur, Boden, Giftigkeit) -> Pflegewerte
+- Heuristik-Layer: Pflanzentyp aus dem Namen (Kaktus, Farn, Kräuter ...), wenn Trefle wenig liefert
+
+Die Schlüsselwörter aller Pflanzentypen stecken in einem vorkompilierten Regex,
+ein Durchlauf über den Namen liefert alle Typen auf einmal.
+"""
+import re
+
+# Pflanzentyp -> Schlüsselwörter (Teilstring-Treffer im kleingeschriebenen Namen)
+PLANT_TYPE_KEYWORDS = {
+    "cactus": ["cactus", "kaktus", "cactaceae", "opuntia", "echinopsis", "mammillaria"],
+    "succulent": ["succulent", "sukkulent", "crassula", "echeveria", "sedum", "haworthia", "aloe"],
+    "herb": ["basil", "basilikum", "mint", "minze", "thyme", "thymian", "rosemary", "rosmarin", "parsley", "petersilie", "oregano"],
+    "orchid": ["orchid", "orchidee", "orchidaceae", "phalaenopsis"],
+    "tropical": ["monstera", "philodendron", "calathea", "maranta", "anthurium", "alocasia", "pothos", "epipremnum", "dieffenbachia", "ficus"],
+    "fern": ["fern", "farn", "nephrolepis", "asplenium", "pteris"],
+    "palm": ["palm", "palme", "areca", "dypsis", "chamaedorea", "kentia", "howea"],
+    "citrus": ["citrus", "lemon", "zitrone", "orange", "mandarine", "kumquat"],
+}
+
+
+def _build_matcher(keywords_by_type):
+    """
+    Ein Regex für alle Schlüsselwörter. Das Lookahead prüft jede Position, dadurch werden auch
+    überlappende Treffer gefunden (wie "w in text" je Wort). An einer Position gewinnt das längste Wort;
+    es bringt die Typen aller kürzeren Wörter mit, die Präfix von ihm sind.
+    """
+    words = {w for ws in keywords_by_type.values() for w in ws}
+    types_for = {
+        word: frozenset(t for t, ws in keywords_by_type.items() if any(word.startswith(w) for w in ws))
+        for word in words
+    }
+    alternatives = "|".join(re.escape(w) for w in sorted(words, key=len, reverse=True))
+    return re.compile(f"(?=({alternatives}))"), types_for
+
+
+_MATCHER, _TYPES_FOR = _build_matcher(PLANT_TYPE_KEYWORDS)
+
+
+def classify(name_blob: str):
+    """Alle Pflanzentypen, deren Schlüsselwörter im (kleingeschriebenen) Text vorkommen"""
+    types = set()
+    for match in _MATCHER.finditer(name_blob):
+        types |= _TYPES_FOR[match.group(1)]
+    return types
+
+
+# --- Trefle-Werte ---------------------------------------------------------------
+
+def _water_and_humidity(soil_humidity):
+    """(Gießintervall in Tagen, Luftfeuchte-Bedarf 1-10) aus Trefles soil_humidity"""
+    if not soil_humidity:
+        return 7, 5
+    soil_val = int(soil_humidity)
+    if soil_val >= 9:  # Sumpf/Wasser
+        return 2, 9
+    if soil_val >= 7:  # Feucht
+        return 3, 7
+    if soil_val >= 5:  # Mittel
+        return 7, 5
+    if soil_val >= 3:  # Trocken
+        return 14, 3
+    return 21, 2       # Sehr trocken (Kakteen, Sukkulenten)
+
+
+def _fertilize_and_repot(growth_rate):
+    """(Düngeintervall, Umtopfintervall) aus der Wachstumsrate"""
+    fertilize_days = {"fast": 14, "moderate": 30, "slow": 60}.get(growth_rate, 30) if growth_rate else 30
+    repot_days = 365 if growth_rate == "fast" else 730  # Standard 2 Jahre
+    return fertilize_days, repot_days
+
+
+def _light(light):
+    if not light:
+        return 5
+    try:
+        return int(light)
+    except (TypeError, ValueError):
+        # Fallback auf Textbeschreibung
+        text = str(light).lower()
+        if "full sun" in text: return 10
+        if "part shade" in text: return 6
+        if "shade" in text: return 3
+        return 5
+
+
+def _max_height(main_species, growth, specifications):
+    # Prüfe verschiedene Quellen für Höhe
+    for height_data in (
+        specifications.get("maximum_height", {}),
+        main_species.get("maximum_height", {}),
+        growth.get("maximum_height", {}),
+    ):
+        if height_data and isinstance(height_data, dict):
+            if height_data.get("cm"):
+                max_height_cm = int(height_data["cm"])
+                break
+            if height_data.get("m"):
+                max_height_cm = int(float(height_data["m"]) * 100)
+                break
+    else:
+        max_height_cm = 100  # Default
+
+    # Fallback auf average_height
+    if max_height_cm == 100:
+        avg_height = specifications.get("average_height", {})
+        if avg_height and avg_height.get("cm"):
+            max_height_cm = int(float(avg_height["cm"]) * 1.2)  # 20% Puffer
+    return max_height_cm
+
+
+def _temperature(growth):
+    temp_min, temp_max = 15, 25
+
+    max_temp_data = growth.get("maximum_temperature", {})
+    if max_temp_data and max_temp_data.get("deg_c") is not None:
+        temp_max = int(max_temp_data["deg_c"])
+
+    min_temp_data = growth.get("minimum_temperature", {})
+    if min_temp_data and min_temp_data.get("deg_c"):
+        temp_min = int(min_temp_data["deg_c"])
+
+    # Tropische Pflanzen (hohe Luftfeuchte) = höhere Mindesttemperatur
+    atmospheric_humidity = growth.get("atmospheric_humidity")
+    if atmospheric_humidity and int(atmospheric_humidity) >= 8:
+        temp_min, temp_max = 18, 28
+    return temp_min, temp_max
+
+
+def _soil_type(soil_texture):
+    if soil_texture is None:
+        return "universal"
+    v = int(soil_texture)  # 0..10
+    if v <= 2:
+        return "lehmig"
+    if v <= 6:
+        return "universal"
+    return "sandig"
+
+
+def _is_toxic(toxicity):
+    return bool(toxicity) and str(toxicity).lower() not in ("none", "null", "low", "0")
+
+
+# --- Heuristik-Layer ------------------------------------------------------------
+
+def _light_band(light_req):
+    # light_req ist 1-10 (10 = volle Sonne)
+    if light_req >= 8: return "high"
+    if light_req <= 4: return "low"
+    return "mid"
+
+
+def _is_defaultish(p):
+    """Werte "unsicher" (Default bzw. aus fehlenden Feldern entstanden)?"""
+    return (
+        p["humidity_requirement"] == 5 and
+        p["temperature_min"] == 15 and p["temperature_max"] == 25 and
+        p["soil_type"] == "universal" and
+        p["max_height_cm"] == 100
+    )
+
+
+def _apply_heuristics(p, types, lb):
+    """Überschreibt unsichere Werte in p nach Lichtband lb und Pflanzentyp (Reihenfolge zählt)"""
+    # Baseline nach Licht:
+    # viel Licht -> öfter prüfen, wenig Licht -> seltener gießen
+    if lb == "high":
+        p["water_frequency_days"] = min(p["water_frequency_days"], 7)
+        p["humidity_requirement"] = max(p["humidity_requirement"], 4)
+        p["soil_type"] = "universal"
+    elif lb == "low":
+        p["water_frequency_days"] = max(p["water_frequency_days"], 10)
+        p["humidity_requirement"] = max(p["humidity_requirement"], 5)
+    else:
+        p["water_frequency_days"] = max(min(p["water_frequency_days"], 9), 7)
+
+    # Typ-spezifische Overrides
+    if "cactus" in types or "succulent" in types:
+        p["water_frequency_days"] = 21 if lb != "low" else 28
+        p["humidity_requirement"] = 2
+        p["soil_type"] = "sandig"
+        p["temperature_min"], p["temperature_max"] = 12, 30
+        p["sunlight_requirement"] = max(p["sunlight_requirement"], 8)
+        p["max_height_cm"] = min(p["max_height_cm"], 80)
+
+    if "fern" in types:
+        p["water_frequency_days"] = 3 if lb != "high" else 2
+        p["humidity_requirement"] = 8
+        p["soil_type"] = "humusreich"
+        p["temperature_min"], p["temperature_max"] = 16, 28
+        p["sunlight_requirement"] = min(p["sunlight_requirement"], 4)
+        p["max_height_cm"] = min(p["max_height_cm"], 120)
+
+    if "orchid" in types:
+        p["water_frequency_days"] = 7 if lb == "mid" else 10
+        p["humidity_requirement"] = 7
+        p["soil_type"] = "humusreich"
+        p["temperature_min"], p["temperature_max"] = 18, 28
+        p["max_height_cm"] = 70
+
+    if "tropical" in types:
+        p["water_frequency_days"] = 7 if lb != "high" else 5
+        p["humidity_requirement"] = 6
+        p["soil_type"] = "humusreich"
+        p["temperature_min"], p["temperature_max"] = 18, 28
+
+    if "palm" in types:
+        p["water_frequency_days"] = 7 if lb != "low" else 10
+        p["humidity_requirement"] = 6
+        p["soil_type"] = "humusreich"
+        p["temperature_min"], p["temperature_max"] = 16, 28
+
+    if "herb" in types:
+        p["water_frequency_days"] = 3 if lb == "high" else 5
+        p["humidity_requirement"] = 5
+        p["soil_type"] = "universal"
+        p["temperature_min"], p["temperature_max"] = 12, 28
+        p["max_height_cm"] = 60
+
+    if "citrus" in types:
+        p["water_frequency_days"] = 5 if lb == "high" else 7
+        p["humidity_requirement"] = 5
+        p["soil_type"] = "universal"
+        p["temperature_min"], p["temperature_max"] = 10, 30
+
+
+def _taxon_name(value):
+    """Trefle liefert Familie/Gattung mal als String, mal als Objekt mit "name"."""
+    if isinstance(value, dict):
+        return value.get("name")
+    return value
+
+
+def derive_care_profile(data: dict):
+    """
+    Leitet aus einem Trefle-Datensatz das Pflegeprofil ab
+    (Trefle-Werte + Heuristik-Layer für fehlende Angaben).
+    """
+    main_species = data.get("main_species", {})
+    growth = main_species.get("growth", {})
+    specifications = main_species.get("specifications", {})
+
+    water_days, humidity_req = _water_and_humidity(growth.get("soil_humidity"))
+    fertilize_days, repot_days = _fertilize_and_repot(specifications.get("growth_rate"))
+    temp_min, temp_max = _temperature(growth)
+    light_req = _light(growth.get("light"))
+
+    profile = {
+        "scientific_name": data.get("scientific_name"),
+        "common_name": data.get("common_name"),
+        "image_url": data.get("image_url"),
+        "family": _taxon_name(main_species.get("family") or data.get("family")),
+        "genus": _taxon_name(main_species.get("genus") or data.get("genus")),
+        "water_frequency_days": water_days,
+        "fertilize_frequency_days": fertilize_days,
+        "repot_frequency_days": repot_days,
+        "prune_frequency_days": 90,
+        "sunlight_requirement": light_req,
+        "humidity_requirement": humidity_req,
+        "temperature_min": temp_min,
+        "temperature_max": temp_max,
+        "max_height_cm": _max_height(main_species, growth, specifications),
+        "soil_type": _soil_type(growth.get("soil_texture")),
+        "is_toxic": _is_toxic(specifications.get("toxicity")),
+    }
+
+    # Heuristik nur, wenn Trefle wenig geliefert hat
+    if _is_defaultish(profile):
+        name_blob = " ".join([
+            str(data.get("scientific_name") or ""),
+            str(data.get("common_name") or ""),
+            str(main_species.get("family") or ""),
+            str(main_species.get("genus") or "")
+        ]).lower()
+        _apply_heuristics(profile, classify(name_blob), _light_band(light_req))
+
+    return profile
+
+
+def derive_care_profiles(records, errors: list = None):
+    """
+    Batch-Variante für Katalog-Importe: Profile in der Reihenfolge der Datensätze.
+    Unbrauchbare Datensätze ergeben None; mit errors=[] landen dort (Index, Exception).
+    """
+    profiles = []
+    for index, record in enumerate(records):
+        try:
+            profiles.append(derive_care_profile(record))
+        except Exception as e:
+            profiles.append(None)
+            if errors is not None:
+                errors.append((index, e))
+    return profiles
@@ -0,0 +1,126 @@
+# backend/services/detail_cache.py
+import json
+import sqlite3
+import threading
+import time
+
+
+class DetailCache:
+    """
+    Persistenter Cache für Trefle-Pflanzendetails (trefle_id -> fertiges Detail-Dict).
+    Liegt in einer eigenen SQLite-Datei, damit er DB-Resets und Neustarts überlebt.
+    - TTL: Einträge älter als ttl_seconds gelten als Miss
+    - LRU: über max_entries wird nach letztem Zugriff verdrängt
+      (last_access wird höchstens alle touch_interval_seconds geschrieben -> Treffer lesen nur)
+    """
+
+    def __init__(self, path: str, ttl_seconds: int = 7 * 24 * 3600, max_entries: int = 5000,
+                 touch_interval_seconds: int = 300):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.touch_interval_seconds = touch_interval_seconds
+
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS plant_details (
+                trefle_id INTEGER PRIMARY KEY,
+                payload TEXT NOT NULL,
+                stored_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_plant_details_last_access ON plant_details (last_access)"
+        )
+
+    def get(self, trefle_id: int):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, stored_at, last_access FROM plant_details WHERE trefle_id = ?",
+                (trefle_id,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            payload, stored_at, last_access = row
+            if now - stored_at > self.ttl_seconds:
+                # Abgelaufen -> wegwerfen, Aufrufer holt neu
+                self._conn.execute("DELETE FROM plant_details WHERE trefle_id = ?", (trefle_id,))
+                self.expired += 1
+                self.misses += 1
+                return None
+
+            # Zugriffszeit nur grob nachführen: für die LRU-Reihenfolge reicht das,
+            # und nicht jeder Treffer wird zum Schreibzugriff auf die SQLite-Datei
+            if now - last_access >= self.touch_interval_seconds:
+                self._conn.execute(
+                    "UPDATE plant_details SET last_access = ? WHERE trefle_id = ?",
+                    (now, trefle_id)
+                )
+            self.hits += 1
+        return json.loads(payload)
+
+    def put(self, trefle_id: int, details: dict):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO plant_details (trefle_id, payload, stored_at, last_access) VALUES (?, ?, ?, ?)",
+                (trefle_id, json.dumps(details), now, now)
+            )
+            self._evict_locked()
+
+    def invalidate(self, trefle_id: int = None):
+        """Einen Eintrag (oder ohne trefle_id den ganzen Cache) verwerfen. Gibt Anzahl gelöschter Einträge zurück."""
+        with self._lock:
+            if trefle_id is None:
+                cur = self._conn.execute("DELETE FROM plant_details")
+            else:
+                cur = self._conn.execute("DELETE FROM plant_details WHERE trefle_id = ?", (trefle_id,))
+            return cur.rowcount
+
+    def stats(self):
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM plant_details").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "entries": size,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "touch_interval_seconds": self.touch_interval_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def _evict_locked(self):
+        size = self._conn.execute("SELECT COUNT(*) FROM plant_details").fetchone()[0]
+        overflow = size - self.max_entries
+        if overflow <= 0:
+            return
+        self._conn.execute(
+            """
+            DELETE FROM plant_details WHERE trefle_id IN (
+                SELECT trefle_id FROM plant_details ORDER BY last_access ASC LIMIT ?
+            )
+            """,
+            (overflow,)
+        )
+        self.evictions += overflow
@@ -0,0 +1,68 @@
+# backend/services/http_client.py
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx  # optional: nur für die async-Variante nötig
+except ImportError:
+    httpx = None
+
+
+class TrefleClient:
+    """
+    Gemeinsamer HTTP-Client für die Service-Schicht.
+    Eine Session mit Connection-Pool: Keep-Alive statt DNS/TCP/TLS-Aufbau pro Request.
+    """
+
+    def __init__(self, base_url: str, token: str = "", pool_size: int = 10,
+                 connect_timeout: float = 3.05, read_timeout: float = 10.0):
+        self.base_url = base_url.rstrip("/")
+        self.token = token
+        self.timeout = (connect_timeout, read_timeout)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Connection": "keep-alive"})
+
+    def get(self, path: str, params: dict = None, with_token: bool = True, stream: bool = False,
+            allow_redirects: bool = True):
+        """GET auf einen Pfad relativ zur base_url (oder eine absolute URL). stream=True: Body erst beim Lesen laden."""
+        url = path if path.startswith(("http://", "https://")) else f"{self.base_url}{path}"
+        params = dict(params or {})
+        if with_token and self.token:
+            params["token"] = self.token
+        return self.session.get(url, params=params, timeout=self.timeout, stream=stream,
+                                allow_redirects=allow_redirects)
+
+    def close(self):
+        self.session.close()
+
+
+class AsyncTrefleClient:
+    """
+    Async-Variante (httpx), damit Endpoints Trefle awaiten können,
+    statt einen Threadpool-Worker für den ganzen Roundtrip zu blockieren.
+    """
+
+    def __init__(self, base_url: str, token: str = "", pool_size: int = 10,
+                 connect_timeout: float = 3.05, read_timeout: float = 10.0):
+        if httpx is None:
+            raise RuntimeError("httpx ist nicht installiert - async Client nicht verfügbar")
+        self.base_url = base_url.rstrip("/")
+        self.token = token
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+        )
+
+    async def get(self, path: str, params: dict = None, with_token: bool = True):
+        url = path if path.startswith(("http://", "https://")) else f"{self.base_url}{path}"
+        params = dict(params or {})
+        if with_token and self.token:
+            params["token"] = self.token
+        return await self.client.get(url, params=params)
+
+    async def aclose(self):
+        await self.client.aclose()
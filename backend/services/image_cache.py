@@ -0,0 +1,128 @@
+# backend/services/image_cache.py
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+
+class ImageCache:
+    """
+    Thumbnails als Dateien auf der Platte, Index (Größe, ETag, letzter Zugriff) in SQLite.
+    - Größenbegrenzt: über max_bytes werden die am längsten nicht genutzten Dateien gelöscht (LRU)
+    - Dateien werden atomar geschrieben (tmp + rename), Leser sehen nie halbe Bilder
+    - last_access wird höchstens alle touch_interval_seconds geschrieben -> Treffer lesen nur
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 200 * 1024 * 1024, touch_interval_seconds: int = 300):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.touch_interval_seconds = touch_interval_seconds
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(directory, "index.db"), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS thumbnails (
+                key TEXT PRIMARY KEY,
+                filename TEXT NOT NULL,
+                content_type TEXT NOT NULL,
+                etag TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_thumbnails_last_access ON thumbnails (last_access)")
+
+    def get(self, key: str):
+        """(Pfad, content_type, etag) oder None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT filename, content_type, etag, last_access FROM thumbnails WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            path = os.path.join(self.directory, row[0])
+            if not os.path.exists(path):
+                # Datei von außen gelöscht -> Eintrag ist wertlos
+                self._conn.execute("DELETE FROM thumbnails WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            # Wie im DetailCache: für die LRU-Reihenfolge reicht eine grobe Zugriffszeit
+            now = time.time()
+            if now - row[3] >= self.touch_interval_seconds:
+                self._conn.execute("UPDATE thumbnails SET last_access = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return path, row[1], row[2]
+
+    def put(self, key: str, body: bytes, content_type: str, etag: str):
+        extension = content_type.split("/")[-1].split(";")[0] or "bin"
+        filename = f"{key}.{extension}"
+        path = os.path.join(self.directory, filename)
+        tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(body)
+        os.replace(tmp, path)
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO thumbnails (key, filename, content_type, etag, size, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, filename, content_type, etag, len(body), time.time())
+            )
+            self._evict_locked()
+        return path, content_type, etag
+
+    def invalidate(self):
+        """Leert den Cache komplett. Gibt die Anzahl gelöschter Dateien zurück."""
+        with self._lock:
+            rows = self._conn.execute("SELECT filename FROM thumbnails").fetchall()
+            self._conn.execute("DELETE FROM thumbnails")
+        for (filename,) in rows:
+            self._remove(filename)
+        return len(rows)
+
+    def stats(self):
+        with self._lock:
+            count, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM thumbnails").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "directory": self.directory,
+            "entries": count,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "touch_interval_seconds": self.touch_interval_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def _remove(self, filename: str):
+        try:
+            os.remove(os.path.join(self.directory, filename))
+        except FileNotFoundError:
+            pass
+
+    def _evict_locked(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM thumbnails").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, filename, size in self._conn.execute(
+            "SELECT key, filename, size FROM thumbnails ORDER BY last_access ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM thumbnails WHERE key = ?", (key,))
+            self._remove(filename)
+            total -= size
+            self.evictions += 1
@@ -0,0 +1,211 @@
+# backend/services/image_service.py
+import hashlib
+import ipaddress
+import os
+import socket
+import threading
+from io import BytesIO
+from pathlib import Path
+from urllib.parse import urljoin, urlparse
+
+import requests
+
+from .http_client import TrefleClient
+from .image_cache import ImageCache
+
+try:
+    from PIL import Image
+except ImportError:  # optional: ohne Pillow wird das Original ausgeliefert
+    Image = None
+
+# Erlaubte Breiten; angefragte Breiten werden auf die nächstgrößere gerundet
+WIDTHS = sorted(int(w) for w in os.getenv("IMAGE_WIDTHS", "160,320,640").split(","))
+# Originale größer als das werden nicht verarbeitet
+MAX_SOURCE_BYTES = int(os.getenv("IMAGE_MAX_SOURCE_BYTES", str(10 * 1024 * 1024)))
+CHUNK_SIZE = 64 * 1024
+# Lokaler Ersatz für die Bild-Server (Tests/Benchmarks): Bilder kommen aus diesem Ordner,
+# Dateiname = letzter Pfadteil der image_url
+ORIGIN_DIR = os.getenv("IMAGE_ORIGIN_DIR", "").strip() or None
+# Bild-URLs kommen auch von Usern (Import) -> nur öffentliche Adressen abrufen.
+# Ausnahmen (z.B. ein Bild-Server im eigenen Netz) als Hostnamen, kommagetrennt
+ALLOWED_PRIVATE_HOSTS = {h.strip().lower() for h in os.getenv("IMAGE_ALLOWED_PRIVATE_HOSTS", "").split(",") if h.strip()}
+MAX_REDIRECTS = 3
+
+
+class ImageFetchError(Exception):
+    pass
+
+
+class ImageURLRejected(ImageFetchError):
+    """URL zeigt nicht auf einen öffentlichen http(s)-Server (Schutz vor SSRF)"""
+
+
+# Eigener gepoolter Client für beliebige Bild-URLs (ohne Trefle-Token)
+client = TrefleClient(
+    base_url="",
+    pool_size=int(os.getenv("IMAGE_POOL_SIZE", "10")),
+    connect_timeout=float(os.getenv("IMAGE_CONNECT_TIMEOUT", "3.05")),
+    read_timeout=float(os.getenv("IMAGE_READ_TIMEOUT", "10")),
+)
+
+cache = ImageCache(
+    directory=os.getenv("IMAGE_CACHE_DIR", "./image_cache"),
+    max_bytes=int(os.getenv("IMAGE_CACHE_MAX_BYTES", str(200 * 1024 * 1024))),
+    touch_interval_seconds=int(os.getenv("IMAGE_CACHE_TOUCH_INTERVAL", "300")),
+)
+
+# Pro Bild nur ein gleichzeitiger Download
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+def url_hash(image_url: str):
+    return hashlib.sha256(image_url.encode()).hexdigest()[:16]
+
+
+def thumbnail_url(plant_info_id: int, image_url: str):
+    """URL des Thumbnail-Proxys; v ändert sich mit der image_url -> darf lange gecacht werden"""
+    if not image_url:
+        return None
+    return f"/images/{plant_info_id}?v={url_hash(image_url)[:8]}"
+
+
+def snap_width(width: int):
+    for w in WIDTHS:
+        if width <= w:
+            return w
+    return WIDTHS[-1]
+
+
+def check_url(image_url: str):
+    """
+    Nur http(s) auf Hosts, deren Adressen alle öffentlich sind (keine Loopback-, privaten,
+    Link-Local- oder Metadaten-Adressen). Wirft ImageURLRejected.
+    """
+    parsed = urlparse(image_url)
+    if parsed.scheme not in ("http", "https") or not parsed.hostname:
+        raise ImageURLRejected("nur http(s)-URLs erlaubt")
+    host = parsed.hostname.lower()
+    if host in ALLOWED_PRIVATE_HOSTS:
+        return
+    try:
+        port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        infos = socket.getaddrinfo(host, port, proto=socket.IPPROTO_TCP)
+    except (OSError, ValueError) as e:
+        raise ImageURLRejected(f"Host nicht auflösbar: {e}")
+    for info in infos:
+        address = ipaddress.ip_address(info[4][0].split("%", 1)[0])
+        if not address.is_global or address.is_multicast:
+            raise ImageURLRejected(f"Adresse {address} nicht erlaubt")
+
+
+def _open(image_url: str):
+    """Response (gestreamt) nach höchstens MAX_REDIRECTS Weiterleitungen, jedes Ziel geprüft"""
+    url = image_url
+    for _ in range(MAX_REDIRECTS + 1):
+        check_url(url)
+        try:
+            response = client.get(url, with_token=False, stream=True, allow_redirects=False)
+        except Exception as e:
+            raise ImageFetchError(str(e))
+        if not response.is_redirect:
+            return response
+        location = response.headers.get("Location", "")
+        response.close()
+        url = urljoin(url, location)
+    raise ImageFetchError("Zu viele Weiterleitungen")
+
+
+def _fetch_original(image_url: str):
+    if ORIGIN_DIR:
+        path = Path(ORIGIN_DIR) / Path(urlparse(image_url).path).name
+        if not path.is_file():
+            raise ImageFetchError(f"{path} nicht gefunden")
+        return path.read_bytes()
+
+    response = _open(image_url)
+    # Gestreamt lesen und beim Überschreiten der Grenze abbrechen -> nie mehr als MAX_SOURCE_BYTES im Speicher
+    with response:
+        if response.status_code != 200:
+            raise ImageFetchError(f"Status {response.status_code}")
+        length = response.headers.get("Content-Length", "")
+        if length.isdigit() and int(length) > MAX_SOURCE_BYTES:
+            raise ImageFetchError("Bild zu groß")
+        body = bytearray()
+        try:
+            for chunk in response.iter_content(CHUNK_SIZE):
+                body += chunk
+                if len(body) > MAX_SOURCE_BYTES:
+                    raise ImageFetchError("Bild zu groß")
+        except requests.RequestException as e:
+            raise ImageFetchError(str(e))
+    return bytes(body)
+
+
+def _resize(original: bytes, width: int):
+    try:
+        return _encode_thumbnail(original, width)
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        # Kein (lesbares) Bild vom Origin -> wie ein Ladefehler behandeln (UnidentifiedImageError ist ein OSError)
+        raise ImageFetchError(f"Kein gültiges Bild: {e}")
+
+
+def _encode_thumbnail(original: bytes, width: int):
+    with Image.open(BytesIO(original)) as img:
+        img.load()
+        if img.width > width:
+            img.thumbnail((width, width * 10), Image.LANCZOS)
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA")
+        out = BytesIO()
+        img.save(out, "WEBP", quality=80, method=4)
+        return out.getvalue()
+
+
+def _store_all(key_base: str, original: bytes):
+    """Original einmal holen, alle Breiten auf einmal erzeugen"""
+    if Image is None:
+        etag = f'"{hashlib.sha256(original).hexdigest()[:16]}"'
+        return {0: cache.put(f"{key_base}-orig", original, _sniff_type(original), etag)}
+    stored = {}
+    for w in WIDTHS:
+        body = _resize(original, w)
+        etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+        stored[w] = cache.put(f"{key_base}-{w}", body, "image/webp", etag)
+    return stored
+
+
+def _sniff_type(body: bytes):
+    if body.startswith(b"\x89PNG"):
+        return "image/png"
+    if body.startswith(b"\xff\xd8"):
+        return "image/jpeg"
+    if body[:4] == b"RIFF" and body[8:12] == b"WEBP":
+        return "image/webp"
+    if body[:6] in (b"GIF87a", b"GIF89a"):
+        return "image/gif"
+    return "application/octet-stream"
+
+
+def get_thumbnail(image_url: str, width: int):
+    """(Pfad, content_type, etag) des Thumbnails; lädt das Original nur beim ersten Mal"""
+    key_base = url_hash(image_url)
+    width = snap_width(width)
+    key = f"{key_base}-{width}" if Image is not None else f"{key_base}-orig"
+
+    entry = cache.get(key)
+    if entry is not None:
+        return entry
+
+    with _locks_guard:
+        lock = _locks.setdefault(key_base, threading.Lock())
+    with lock:
+        # Wer auf das Lock gewartet hat, findet das Bild jetzt meist schon vor
+        entry = cache.get(key)
+        if entry is None:
+            stored = _store_all(key_base, _fetch_original(image_url))
+            entry = stored.get(width) or stored[0]
+    with _locks_guard:
+        if not lock.locked():
+            _locks.pop(key_base, None)
+    return entry
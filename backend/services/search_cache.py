@@ -0,0 +1,180 @@
+# backend/services/search_cache.py
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+class _Flight:
+    """Ein laufender Upstream-Request, auf den weitere identische Anfragen warten."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SearchCache:
+    """
+    In-Process-Cache für Suchergebnisse mit Single-Flight:
+    - Keys werden normalisiert ("  Rose " == "rose")
+    - TTL pro Eintrag, LRU-Verdrängung über max_entries / max_bytes
+    - gleichzeitige identische Anfragen teilen sich EINEN Upstream-Request
+    """
+
+    def __init__(self, ttl_seconds: int = 300, max_entries: int = 1000, max_bytes: int = 8 * 1024 * 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (stored_at, size, result)
+        self._bytes = 0
+        self._inflight = {}
+        self._inflight_async = {}  # nur im Event-Loop benutzt
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        return " ".join((query or "").lower().split())
+
+    def get_or_fetch(self, query: str, fetch):
+        """
+        Liefert das gecachte Ergebnis oder ruft fetch(normalized_query) auf.
+        fetch darf None zurückgeben (Fehler) -> wird nicht gecacht.
+        """
+        key = self.normalize(query)
+
+        with self._lock:
+            cached = self._lookup_locked(key)
+            if cached is not None:
+                return cached
+
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._inflight[key] = flight
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fetch(key)
+            if flight.result is not None:
+                self.put(key, flight.result)
+            return flight.result
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+
+    async def get_or_fetch_async(self, query: str, fetch):
+        """Wie get_or_fetch, aber mit einer Coroutine-Funktion als fetch (Coalescing im Event-Loop)."""
+        key = self.normalize(query)
+
+        with self._lock:
+            cached = self._lookup_locked(key)
+            if cached is not None:
+                return cached
+
+        pending = self._inflight_async.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        pending = asyncio.get_running_loop().create_future()
+        self._inflight_async[key] = pending
+        try:
+            result = await fetch(key)
+            if result is not None:
+                self.put(key, result)
+            pending.set_result(result)
+            return result
+        except Exception as e:
+            pending.set_exception(e)
+            pending.exception()  # als abgeholt markieren, falls niemand wartet
+            raise
+        finally:
+            self._inflight_async.pop(key, None)
+            if not pending.done():
+                # Leader wurde abgebrochen (z.B. Client weg) -> Wartende nicht hängen lassen
+                pending.cancel()
+
+    def put(self, query: str, result):
+        key = self.normalize(query)
+        size = len(json.dumps(result))
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (time.monotonic(), size, result)
+            self._bytes += size
+            self._evict_locked()
+
+    def invalidate(self, query: str = None):
+        with self._lock:
+            if query is None:
+                count = len(self._entries)
+                self._entries.clear()
+                self._bytes = 0
+                return count
+            old = self._entries.pop(self.normalize(query), None)
+            if old is None:
+                return 0
+            self._bytes -= old[1]
+            return 1
+
+    def stats(self):
+        with self._lock:
+            entries = len(self._entries)
+            size = self._bytes
+            inflight = len(self._inflight) + len(self._inflight_async)
+        requests_total = self.hits + self.misses + self.coalesced
+        return {
+            "entries": entries,
+            "bytes": size,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "inflight": inflight,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / requests_total, 4) if requests_total else 0.0,
+        }
+
+    def _lookup_locked(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, size, result = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            self._bytes -= size
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def _evict_locked(self):
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, (_, size, _) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
@@ -1,303 +1,142 @@
-import requests
+import asyncio
 import os
 from dotenv import load_dotenv
 
+from .care_profile import derive_care_profile
+from .detail_cache import DetailCache
+from .http_client import TrefleClient, AsyncTrefleClient, httpx
+from .search_cache import SearchCache
+
 load_dotenv()
 # Wir holen das Token, entfernen aber sicherheitshalber Leerzeichen
 TREFLE_TOKEN = os.getenv("TREFLE_API_TOKEN", "").strip()
+TREFLE_BASE_URL = "https://trefle.io/api/v1"
+
+# Gemeinsamer, gepoolter HTTP-Client (Keep-Alive + Timeouts)
+_client_config = dict(
+    base_url=TREFLE_BASE_URL,
+    token=TREFLE_TOKEN,
+    pool_size=int(os.getenv("TREFLE_POOL_SIZE", "10")),
+    connect_timeout=float(os.getenv("TREFLE_CONNECT_TIMEOUT", "3.05")),
+    read_timeout=float(os.getenv("TREFLE_READ_TIMEOUT", "10")),
+)
+client = TrefleClient(**_client_config)
+
+# Async-Variante nur, wenn httpx installiert ist (sonst Fallback auf Thread)
+async_client = AsyncTrefleClient(**_client_config) if httpx is not None else None
+
+# Detail-Cache (Datei-basiert, überlebt Neustarts und Katalog-Resets)
+detail_cache = DetailCache(
+    path=os.getenv("TREFLE_DETAIL_CACHE_PATH", "./trefle_detail_cache.db"),
+    ttl_seconds=int(os.getenv("TREFLE_DETAIL_CACHE_TTL", str(7 * 24 * 3600))),
+    max_entries=int(os.getenv("TREFLE_DETAIL_CACHE_MAX_ENTRIES", "5000")),
+    touch_interval_seconds=int(os.getenv("TREFLE_DETAIL_CACHE_TOUCH_INTERVAL", "300")),
+)
+
+# Such-Cache (im Prozess, mit Request-Coalescing)
+search_cache = SearchCache(
+    ttl_seconds=int(os.getenv("TREFLE_SEARCH_CACHE_TTL", "300")),
+    max_entries=int(os.getenv("TREFLE_SEARCH_CACHE_MAX_ENTRIES", "1000")),
+    max_bytes=int(os.getenv("TREFLE_SEARCH_CACHE_MAX_BYTES", str(8 * 1024 * 1024))),
+)
 
 def search_plants(query: str):
     """
-    Sucht nach Pflanzen. 
+    Sucht nach Pflanzen (gecacht).
+    Gleichzeitige identische Suchen teilen sich einen Upstream-Request.
+    """
+    return search_cache.get_or_fetch(query, _fetch_search) or []
+
+def _fetch_search(query: str):
+    """
+    Sucht nach Pflanzen direkt bei Trefle. Gibt bei Fehlern None zurück (wird nicht gecacht).
     Entspricht: https://trefle.io/api/v1/plants/search?token=...&q=...
     """
-    url = "https://trefle.io/api/v1/plants/search"
-    
-    params = {
-        "token": TREFLE_TOKEN,
-        "q": query
-    }
-    
-    print(f"DEBUG: Rufe URL auf: {url} mit Query: {query}") # Damit wir sehen was passiert
-    
     try:
-        response = requests.get(url, params=params)
-        
-        # Zeigt uns den exakten Statuscode (200 ist gut, 401 verboten, 404 nicht gefunden)
-        print(f"DEBUG: Status Code: {response.status_code}")
-        
+        response = client.get("/plants/search", params={"q": query})
+
         if response.status_code == 200:
             return response.json().get("data", [])
         else:
             print(f"API Fehler: {response.text}")
-            return []
+            return None
             
     except Exception as e:
         print(f"Python Request Fehler: {e}")
-        return []
+        return None
 
 def get_plant_details(trefle_id: int):
     """
     Holt Details einer Pflanze per ID.
+    Cache-Treffer kommen direkt aus dem Detail-Cache, ohne Netzwerk.
+    """
+    cached = detail_cache.get(trefle_id)
+    if cached is not None:
+        return cached
+
+    details = _fetch_plant_details(trefle_id)
+    if details:
+        detail_cache.put(trefle_id, details)
+    return details
+
+def _fetch_plant_details(trefle_id: int):
+    """
+    Holt Details einer Pflanze per ID direkt von Trefle.
     Nutzt ALLE verfügbaren Trefle-Daten für bessere Schätzungen.
     """
-    url = f"https://trefle.io/api/v1/plants/{trefle_id}"
-    params = {"token": TREFLE_TOKEN}
-    
     try:
-        response = requests.get(url, params=params)
+        response = client.get(f"/plants/{trefle_id}")
         if response.status_code == 200:
-            data = response.json().get("data", {})
-            
-            main_species = data.get("main_species", {})
-            growth = main_species.get("growth", {})
-            specifications = main_species.get("specifications", {})
-            
-            # === WASSER & LUFTFEUCHTIGKEIT ===
-            soil_humidity = growth.get("soil_humidity")
-            water_days = 7
-            humidity_req = 5
-            
-            if soil_humidity:
-                soil_val = int(soil_humidity)
-                if soil_val >= 9:  # Sumpf/Wasser
-                    water_days = 2
-                    humidity_req = 9
-                elif soil_val >= 7:  # Feucht
-                    water_days = 3
-                    humidity_req = 7
-                elif soil_val >= 5:  # Mittel
-                    water_days = 7
-                    humidity_req = 5
-                elif soil_val >= 3:  # Trocken
-                    water_days = 14
-                    humidity_req = 3
-                else:  # Sehr trocken (Kakteen, Sukkulenten)
-                    water_days = 21
-                    humidity_req = 2
-            
-            # === DÜNGEN basierend auf Wachstumsrate ===
-            growth_rate = specifications.get("growth_rate")
-            fertilize_days = 30
-            if growth_rate:
-                if growth_rate == "fast": fertilize_days = 14
-                elif growth_rate == "moderate": fertilize_days = 30
-                elif growth_rate == "slow": fertilize_days = 60
-            
-            # === UMTOPFEN ===
-            repot_days = 730  # Standard 2 Jahre
-            if growth_rate == "fast": repot_days = 365
-            
-            # === LICHT ===
-            light = growth.get("light")
-            light_req = 5
-            if light:
-                try:
-                    light_req = int(light)
-                except:
-                    # Fallback auf Textbeschreibung
-                    if "full sun" in str(light).lower(): light_req = 10
-                    elif "part shade" in str(light).lower(): light_req = 6
-                    elif "shade" in str(light).lower(): light_req = 3
-            
-            # === HÖHE ===
-            max_height_cm = 100  # Default
-            
-            # Prüfe verschiedene Quellen für Höhe
-            height_sources = [
-                specifications.get("maximum_height", {}),
-                main_species.get("maximum_height", {}),
-                growth.get("maximum_height", {})
-            ]
-            
-            for height_data in height_sources:
-                if height_data and isinstance(height_data, dict):
-                    if height_data.get("cm"):
-                        max_height_cm = int(height_data["cm"])
-                        break
-                    elif height_data.get("m"):
-                        max_height_cm = int(float(height_data["m"]) * 100)
-                        break
-            
-            # Fallback auf average_height
-            if max_height_cm == 100:
-                avg_height = specifications.get("average_height", {})
-                if avg_height and avg_height.get("cm"):
-                    max_height_cm = int(float(avg_height["cm"]) * 1.2)  # 20% Puffer
-            
-            # === TEMPERATUR ===
-            temp_min = 15
-            temp_max = 25
-            
-            # Maximum Temperatur
-            max_temp_data = growth.get("maximum_temperature", {})
-            if max_temp_data and max_temp_data.get("deg_c") is not None:
-                temp_max = int(max_temp_data["deg_c"])
-            
-            # Minimum Temperatur
-            min_temp_data = growth.get("minimum_temperature", {})
-            if min_temp_data and min_temp_data.get("deg_c"):
-                temp_min = int(min_temp_data["deg_c"])
-            
-            # Wenn keine min_temp, schätzen wir basierend auf anderen Faktoren
-            atmospheric_humidity = growth.get("atmospheric_humidity")
-            if atmospheric_humidity:
-                # Tropische Pflanzen = höhere Mindesttemperatur
-                if int(atmospheric_humidity) >= 8:
-                    temp_min = 18
-                    temp_max = 28
-            
-            # === BODENART ===
-            soil_type = "universal"
-            soil_texture = growth.get("soil_texture")
-            if soil_texture is not None:
-                v = int(soil_texture)  # 0..10
-                if v <= 2:
-                    soil_type = "lehmig"
-                elif v <= 6:
-                    soil_type = "universal"
-                else:
-                    soil_type = "sandig"
-            
-            # === TOXIZITÄT ===
-            toxicity = specifications.get("toxicity")
-            is_toxic = False
-            if toxicity and str(toxicity).lower() not in ["none", "null", "low", "0"]:
-                is_toxic = True
-            
-            # Auch Edible-Status checken
-            edible = main_species.get("edible")
-            if edible is False:  # Explizit nicht essbar könnte giftig sein
-                # Vorsichtshalber als potentiell giftig markieren
-                pass
-            
-            # --- HEURISTIK-LAYER (nur wenn Trefle wenig liefert) -----------------
-
-            name_blob = " ".join([
-                str(data.get("scientific_name") or ""),
-                str(data.get("common_name") or ""),
-                str(main_species.get("family") or ""),
-                str(main_species.get("genus") or "")
-            ]).lower()
-
-            def has_any(words):
-                return any(w in name_blob for w in words)
-
-            # 1) Keywords -> Plantentyp ableiten
-            is_cactus = has_any(["cactus", "kaktus", "cactaceae", "opuntia", "echinopsis", "mammillaria"])
-            is_succulent = has_any(["succulent", "sukkulent", "crassula", "echeveria", "sedum", "haworthia", "aloe"])
-            is_herb = has_any(["basil", "basilikum", "mint", "minze", "thyme", "thymian", "rosemary", "rosmarin", "parsley", "petersilie", "oregano"])
-            is_orchid = has_any(["orchid", "orchidee", "orchidaceae", "phalaenopsis"])
-            is_tropical = has_any(["monstera", "philodendron", "calathea", "maranta", "anthurium", "alocasia", "pothos", "epipremnum", "dieffenbachia", "ficus"])
-            is_fern = has_any(["fern", "farn", "nephrolepis", "asplenium", "pteris"])
-            is_palm = has_any(["palm", "palme", "areca", "dypsis", "chamaedorea", "kentia", "howea"])
-            is_citrus = has_any(["citrus", "lemon", "zitrone", "orange", "mandarine", "kumquat"])
-
-            # 2) Licht -> grobe Umwelt ableiten (wenn Trefle light vorhanden)
-            # light_req ist 1-10 (10 = volle Sonne)
-            # Faustregel:
-            # - viel Licht -> tendenziell mehr Wasserbedarf oder zumindest öfter prüfen
-            # - wenig Licht -> weniger Wasser
-            # - sehr hohe Luftfeuchte-Anforderungen eher bei Schattenpflanzen
-            def light_band(l):
-                if l >= 8: return "high"
-                if l <= 4: return "low"
-                return "mid"
-
-            lb = light_band(light_req)
-
-            # 3) Nur überschreiben, wenn Werte "unsicher" sind (Default oder aus fehlenden Feldern entstanden)
-            # Defaults erkennen: humidity_req==5, temp 15-25, soil_type=="universal", max_height_cm==100
-            is_defaultish = (
-                humidity_req == 5 and
-                temp_min == 15 and temp_max == 25 and
-                soil_type == "universal" and
-                max_height_cm == 100
-            )
-
-            # 4) Heuristik anwenden
-            if is_defaultish:
-                # Baseline nach Licht
-                if lb == "high":
-                    water_days = min(water_days, 7)      # eher häufiger checken
-                    humidity_req = max(humidity_req, 4)
-                    soil_type = "universal"
-                elif lb == "low":
-                    water_days = max(water_days, 10)     # seltener gießen
-                    humidity_req = max(humidity_req, 5)
-                else:
-                    # mid
-                    water_days = max(min(water_days, 9), 7)
-
-                # Typ-spezifische Overrides
-                if is_cactus or is_succulent:
-                    water_days = 21 if lb != "low" else 28
-                    humidity_req = 2
-                    soil_type = "sandig"
-                    temp_min, temp_max = 12, 30
-                    light_req = max(light_req, 8)
-                    max_height_cm = min(max_height_cm, 80)
-
-                if is_fern:
-                    water_days = 3 if lb != "high" else 2
-                    humidity_req = 8
-                    soil_type = "humusreich"
-                    temp_min, temp_max = 16, 28
-                    light_req = min(light_req, 4)
-                    max_height_cm = min(max_height_cm, 120)
-
-                if is_orchid:
-                    water_days = 7 if lb == "mid" else 10
-                    humidity_req = 7
-                    soil_type = "humusreich"
-                    temp_min, temp_max = 18, 28
-                    max_height_cm = 70
-
-                if is_tropical:
-                    water_days = 7 if lb != "high" else 5
-                    humidity_req = 6
-                    soil_type = "humusreich"
-                    temp_min, temp_max = 18, 28
+            return derive_care_profile(response.json().get("data", {}))
+        return None
+    except Exception as e:
+        print(f"Fehler bei Details: {e}")
+        return None
 
-                if is_palm:
-                    water_days = 7 if lb != "low" else 10
-                    humidity_req = 6
-                    soil_type = "humusreich"
-                    temp_min, temp_max = 16, 28
+async def search_plants_async(query: str):
+    """Async-Variante von search_plants (gleicher Cache, gleiches Coalescing)."""
+    return await search_cache.get_or_fetch_async(query, _fetch_search_async) or []
 
-                if is_herb:
-                    water_days = 3 if lb == "high" else 5
-                    humidity_req = 5
-                    soil_type = "universal"
-                    temp_min, temp_max = 12, 28
-                    max_height_cm = 60
-                    if light_band == "high":water_days = 3
+async def _fetch_search_async(query: str):
+    if async_client is None:
+        return await asyncio.to_thread(_fetch_search, query)
+    try:
+        response = await async_client.get("/plants/search", params={"q": query})
+        if response.status_code == 200:
+            return response.json().get("data", [])
+        print(f"API Fehler: {response.text}")
+        return None
+    except Exception as e:
+        print(f"Python Request Fehler: {e}")
+        return None
 
-                if is_citrus:
-                    water_days = 5 if lb == "high" else 7
-                    humidity_req = 5
-                    soil_type = "universal"
-                    temp_min, temp_max = 10, 30
+async def get_plant_details_async(trefle_id: int):
+    """Async-Variante von get_plant_details (gleicher Detail-Cache)."""
+    cached = detail_cache.get(trefle_id)
+    if cached is not None:
+        return cached
 
-                
-            return {
-                "scientific_name": data.get("scientific_name"),
-                "common_name": data.get("common_name"),
-                "image_url": data.get("image_url"),
-                "water_frequency_days": water_days,
-                "fertilize_frequency_days": fertilize_days,
-                "repot_frequency_days": repot_days,
-                "prune_frequency_days": 90,
-                "sunlight_requirement": light_req,
-                "humidity_requirement": humidity_req,
-                "temperature_min": temp_min,
-                "temperature_max": temp_max,
-                "max_height_cm": max_height_cm,
-                "soil_type": soil_type,
-                "is_toxic": is_toxic
-            }
-        return None
+    if async_client is None:
+        return await asyncio.to_thread(get_plant_details, trefle_id)
+    try:
+        response = await async_client.get(f"/plants/{trefle_id}")
+        if response.status_code != 200:
+            return None
+        details = derive_care_profile(response.json().get("data", {}))
     except Exception as e:
         print(f"Fehler bei Details: {e}")
         return None
-    
\ No newline at end of file
+    detail_cache.put(trefle_id, details)
+    return details
+
+def close_clients():
+    """Schließt die gepoolten Verbindungen (beim Shutdown der App)."""
+    client.close()
+
+async def close_clients_async():
+    close_clients()
+    global async_client
+    if async_client is not None:
+        await async_client.aclose()
+        # Ein geschlossener httpx-Client ist nicht wiederverwendbar -> für den nächsten Start neu anlegen
+        async_client = AsyncTrefleClient(**_client_config)
@@ -0,0 +1,209 @@
+# backend/sessions.py
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from sqlalchemy import func
+
+from database import SessionLocal
+from models import User
+
+# Signierte Session-Tokens: v1.<key_id>.<payload>.<signatur>
+# - payload: {"uid", "usr", "iat", "exp", "ver"} (base64url-JSON)
+# - signatur: HMAC-SHA256 mit einem Schlüssel, der pro Periode aus dem Master-Secret abgeleitet wird
+#   -> der Signierschlüssel rotiert automatisch, alte Tokens bleiben bis exp gültig
+# - mehrere Master-Secrets (kommagetrennt) erlauben das Austauschen des Secrets selbst:
+#   das erste signiert, alle werden beim Prüfen akzeptiert
+# - Widerruf: "ver" muss zu users.session_version passen; Logout zählt die Version hoch
+#   -> alle Tokens des Users ungültig (in anderen Prozessen spätestens nach SESSION_CACHE_TTL)
+
+SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", str(7 * 24 * 3600)))
+KEY_ROTATION_SECONDS = int(os.getenv("SESSION_KEY_ROTATION_SECONDS", str(24 * 3600)))
+PRINCIPAL_CACHE_SIZE = int(os.getenv("SESSION_CACHE_SIZE", "10000"))
+PRINCIPAL_CACHE_TTL = int(os.getenv("SESSION_CACHE_TTL", "300"))
+
+# Ohne SESSION_SECRET_KEYS: Secret aus dieser Datei (wird beim ersten Start erzeugt),
+# damit Sessions Neustarts überleben und alle Worker auf dem Host dasselbe Secret nutzen
+SECRET_FILE = os.getenv("SESSION_SECRET_FILE", "./session_secret")
+
+
+def _read_or_create_secret(path: str) -> str:
+    try:
+        with open(path) as f:
+            secret = f.read().strip()
+        if secret:
+            return secret
+    except FileNotFoundError:
+        pass
+
+    # Erst in eine Temp-Datei schreiben, dann per link() atomar anlegen:
+    # starten mehrere Worker gleichzeitig, gewinnt einer und alle lesen dasselbe Secret
+    tmp_path = f"{path}.{os.getpid()}.{secrets.token_hex(4)}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as f:
+        f.write(secrets.token_hex(32))
+    try:
+        os.link(tmp_path, path)
+        print(f"SESSION_SECRET_KEYS nicht gesetzt - neues Secret in {path} angelegt")
+    except FileExistsError:
+        pass
+    finally:
+        os.unlink(tmp_path)
+    with open(path) as f:
+        return f.read().strip()
+
+
+_secrets_env = [s.strip() for s in os.getenv("SESSION_SECRET_KEYS", "").split(",") if s.strip()]
+if not _secrets_env:
+    _secrets_env = [_read_or_create_secret(SECRET_FILE)]
+MASTER_SECRETS = [s.encode() for s in _secrets_env]
+
+Principal = namedtuple("Principal", ["user_id", "username", "expires_at", "version"])
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _period(now: float) -> int:
+    return int(now // KEY_ROTATION_SECONDS)
+
+
+def _derive_key(master: bytes, period: int) -> bytes:
+    return hmac.new(master, f"session-key:{period}".encode(), hashlib.sha256).digest()
+
+
+def _sign(key: bytes, message: str) -> str:
+    return _b64encode(hmac.new(key, message.encode(), hashlib.sha256).digest())
+
+
+def issue(user_id: int, username: str, version: int = 0, now: float = None) -> str:
+    """Erzeugt ein signiertes Token für den User (version = aktuelle users.session_version)"""
+    now = time.time() if now is None else now
+    period = _period(now)
+    payload = _b64encode(json.dumps(
+        {"uid": user_id, "usr": username, "iat": int(now), "exp": int(now + SESSION_TTL_SECONDS), "ver": version},
+        separators=(",", ":")
+    ).encode())
+    message = f"v1.{period}.{payload}"
+    return f"{message}.{_sign(_derive_key(MASTER_SECRETS[0], period), message)}"
+
+
+def verify(token: str, now: float = None):
+    """Prüft Signatur und Ablauf komplett im Prozess. Gibt Principal oder None zurück."""
+    now = time.time() if now is None else now
+    try:
+        version, period_str, payload, signature = token.split(".")
+        period = int(period_str)
+    except (AttributeError, ValueError):
+        return None
+    if version != "v1":
+        return None
+
+    # Schlüssel aus der Zukunft oder älter als die Token-Laufzeit gibt es nicht
+    oldest = _period(now - SESSION_TTL_SECONDS) - 1
+    if period > _period(now) or period < oldest:
+        return None
+
+    message = f"{version}.{period_str}.{payload}"
+    if not any(hmac.compare_digest(_sign(_derive_key(m, period), message), signature) for m in MASTER_SECRETS):
+        return None
+
+    try:
+        data = json.loads(_b64decode(payload))
+        principal = Principal(int(data["uid"]), data.get("usr"), float(data["exp"]), int(data.get("ver", 0)))
+    except (ValueError, KeyError, TypeError):
+        return None
+    if principal.expires_at <= now:
+        return None
+    return principal
+
+
+def current_version(user_id: int):
+    """users.session_version (None, wenn es den User nicht mehr gibt)"""
+    db = SessionLocal()
+    try:
+        row = db.query(User.session_version).filter(User.id == user_id).first()
+        return None if row is None else (row.session_version or 0)
+    finally:
+        db.close()
+
+
+def revoke(user_id: int):
+    """Alle Sessions des Users ungültig machen (Logout)"""
+    db = SessionLocal()
+    try:
+        db.query(User).filter(User.id == user_id).update(
+            {User.session_version: func.coalesce(User.session_version, 0) + 1}, synchronize_session=False
+        )
+        db.commit()
+    finally:
+        db.close()
+    principal_cache.discard_user(user_id)
+
+
+class PrincipalCache:
+    """
+    Kleiner TTL/LRU-Cache: Token -> Principal, spart HMAC + JSON-Parsing auf dem Hot Path.
+    Die Session-Version wird nur bei einem Miss gegen die DB geprüft (höchstens einmal pro ttl_seconds und Token).
+    """
+
+    def __init__(self, max_size: int = PRINCIPAL_CACHE_SIZE, ttl_seconds: int = PRINCIPAL_CACHE_TTL,
+                 version_lookup=current_version):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # token -> (valid_until, principal)
+        self.version_lookup = version_lookup
+
+    def get(self, token: str):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(token)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[token]
+
+        self.misses += 1
+        principal = verify(token, now)
+        if principal is None or self.version_lookup(principal.user_id) != principal.version:
+            return None
+
+        valid_until = min(principal.expires_at, now + self.ttl_seconds)
+        with self._lock:
+            self._entries[token] = (valid_until, principal)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return principal
+
+    def discard(self, token: str):
+        with self._lock:
+            self._entries.pop(token, None)
+
+    def discard_user(self, user_id: int):
+        with self._lock:
+            for token in [t for t, (_, p) in self._entries.items() if p.user_id == user_id]:
+                del self._entries[token]
+
+    def stats(self):
+        with self._lock:
+            size = len(self._entries)
+        return {"entries": size, "max_size": self.max_size, "hits": self.hits, "misses": self.misses}
+
+
+principal_cache = PrincipalCache()
@@ -0,0 +1,178 @@
+# backend/static_assets.py
+"""
+Statische Dateien des Frontends, einmal beim Start aufbereitet und aus dem Speicher ausgeliefert:
+
+- jede Datei unter frontend/ (außer den Seiten) bekommt eine URL mit Inhalts-Hash,
+  z.B. /assets/img/icons/water.3f2a1b9c0d.png -> Cache-Control: immutable
+- Icons werden (mit Pillow) auf ICON_SIZE verkleinert und zusätzlich als WebP abgelegt
+- Textdateien liegen vorkomprimiert als gzip (und brotli, falls installiert) vor
+- index.html verweist auf die gehashten URLs; sie selbst wird mit ETag revalidiert (304)
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import threading
+from io import BytesIO
+from pathlib import Path, PurePosixPath
+
+from fastapi import Response
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+try:
+    from PIL import Image
+except ImportError:  # optional
+    Image = None
+
+PREFIX = "/assets"
+# Icons werden mit max. 20px angezeigt -> 2x für hochauflösende Displays
+ICON_SIZE = int(os.getenv("STATIC_ICON_SIZE", "48"))
+# Kleinere Dateien lohnen das Komprimieren nicht
+MIN_COMPRESS_BYTES = 512
+
+PAGES = ("index.html",)
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+IMMUTABLE = "public, max-age=31536000, immutable"
+# Nur Attributwerte werden umgeschrieben, Text und Skripte bleiben unverändert
+_URL_ATTRIBUTE = re.compile(r'(?<=\s)(src|href)(\s*=\s*)(["\'])([^"\']*)\3', re.IGNORECASE)
+
+
+class Asset:
+    """Eine ausgelieferte Datei mit ihren vorkomprimierten Varianten"""
+
+    def __init__(self, body: bytes, content_type: str):
+        self.content_type = content_type
+        self.etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+        self.variants = {"identity": body}
+        if len(body) >= MIN_COMPRESS_BYTES and content_type.startswith(COMPRESSIBLE_TYPES):
+            self.variants["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+            if brotli is not None:
+                self.variants["br"] = brotli.compress(body, quality=11)
+
+    def pick(self, accept_encoding: str):
+        accepted = {part.split(";")[0].strip() for part in (accept_encoding or "").split(",")}
+        for encoding in ("br", "gzip"):
+            if encoding in self.variants and encoding in accepted:
+                return encoding, self.variants[encoding]
+        return "identity", self.variants["identity"]
+
+
+def _content_hash(body: bytes):
+    return hashlib.sha256(body).hexdigest()[:10]
+
+
+def _hashed_name(rel: PurePosixPath, body: bytes, suffix: str = None):
+    suffix = suffix or rel.suffix
+    return str(rel.with_name(f"{rel.stem}.{_content_hash(body)}{suffix}"))
+
+
+def _downscale(body: bytes, fmt: str):
+    """Verkleinert ein Bild auf ICON_SIZE (nur verkleinern) und speichert es im Zielformat"""
+    with Image.open(BytesIO(body)) as img:
+        img.load()
+        if max(img.size) > ICON_SIZE:
+            img.thumbnail((ICON_SIZE, ICON_SIZE), Image.LANCZOS)
+        out = BytesIO()
+        if fmt == "WEBP":
+            if img.mode not in ("RGB", "RGBA"):
+                img = img.convert("RGBA")
+            img.save(out, "WEBP", quality=85, method=6)
+        else:
+            img.save(out, fmt, optimize=True)
+        return out.getvalue()
+
+
+class StaticAssets:
+    def __init__(self, root: Path, prefix: str = PREFIX):
+        self.root = Path(root)
+        self.prefix = prefix
+        self.assets = {}    # URL-Pfad unter prefix -> Asset
+        self.manifest = {}  # "img/icons/water.png" -> {"original": URL, "webp": URL}
+        self.pages = {}     # (Seite, webp?) -> Asset
+        self._lock = threading.Lock()
+        self._built = False
+
+    def build(self):
+        """Liest frontend/ einmal ein; danach wird nur noch aus dem Speicher ausgeliefert"""
+        with self._lock:
+            if self._built:
+                return
+            for path in sorted(self.root.rglob("*")):
+                rel = PurePosixPath(path.relative_to(self.root).as_posix())
+                if path.is_file() and str(rel) not in PAGES:
+                    self._add_file(rel, path.read_bytes())
+            self._build_pages()
+            self._built = True
+            print(f"Statische Dateien: {len(self.assets)} Assets, brotli={'ja' if brotli else 'nein'}, "
+                  f"Pillow={'ja' if Image else 'nein'}")
+
+    def _add_file(self, rel: PurePosixPath, body: bytes):
+        content_type = mimetypes.guess_type(str(rel))[0] or "application/octet-stream"
+        urls = {}
+
+        if Image is not None and rel.suffix.lower() in (".png", ".jpg", ".jpeg"):
+            try:
+                fmt = "PNG" if rel.suffix.lower() == ".png" else "JPEG"
+                body = _downscale(body, fmt)
+                webp = _downscale(body, "WEBP")
+                webp_name = _hashed_name(rel, webp, ".webp")
+                self.assets[webp_name] = Asset(webp, "image/webp")
+                urls["webp"] = f"{self.prefix}/{webp_name}"
+            except Exception as e:
+                print(f"Bild {rel} nicht konvertiert: {e}")
+
+        name = _hashed_name(rel, body)
+        self.assets[name] = Asset(body, content_type)
+        urls["original"] = f"{self.prefix}/{name}"
+        self.manifest[str(rel)] = urls
+
+    def _build_pages(self):
+        for page in PAGES:
+            source = (self.root / page).read_text(encoding="utf-8")
+            for webp in (False, True):
+                html = _URL_ATTRIBUTE.sub(lambda m: self._rewrite(m, webp), source)
+                self.pages[(page, webp)] = Asset(html.encode("utf-8"), "text/html; charset=utf-8")
+
+    def _rewrite(self, match, webp: bool):
+        """src="img/x.png" -> gehashte URL; nur bei exakt passendem Pfad, alles andere bleibt stehen"""
+        name, equals, quote, value = match.groups()
+        urls = self.manifest.get(value)
+        if urls is None:
+            return match.group(0)
+        url = urls["webp"] if webp and "webp" in urls else urls["original"]
+        return f"{name}{equals}{quote}{url}{quote}"
+
+    def url_for(self, rel: str):
+        """Gehashte URL einer Datei (rel relativ zu frontend/), z.B. für Templates/Tests"""
+        self.build()
+        return self.manifest[rel]["original"]
+
+    def _respond(self, asset, request, cache_control: str, vary: str):
+        encoding, body = asset.pick(request.headers.get("accept-encoding"))
+        # Starker ETag gilt pro Repräsentation -> Kodierung gehört dazu
+        etag = asset.etag if encoding == "identity" else f'{asset.etag[:-1]}-{encoding}"'
+        headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": vary}
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type=asset.content_type, headers=headers)
+
+    def asset_response(self, path: str, request):
+        self.build()
+        asset = self.assets.get(path)
+        if asset is None:
+            return None
+        return self._respond(asset, request, IMMUTABLE, "Accept-Encoding")
+
+    def page_response(self, page: str, request):
+        self.build()
+        webp = "image/webp" in request.headers.get("accept", "")
+        asset = self.pages.get((page, webp))
+        # Seite selbst nicht immutable: immer revalidieren, bei gleichem Inhalt 304
+        return self._respond(asset, request, "no-cache", "Accept, Accept-Encoding")
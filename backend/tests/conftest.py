@@ -0,0 +1,162 @@
+# backend/tests/conftest.py
+"""
+Gemeinsame Fixtures: eigene SQLite-Datenbank und Caches in einem Temp-Verzeichnis,
+Trefle durch eine lokale Attrappe ersetzt (kein Netzwerk), pro Test ein frischer User.
+
+Die Umgebung muss vor dem ersten Import aus backend/ stehen (DB-URL, Cache-Pfade werden beim Import gelesen).
+"""
+import atexit
+import itertools
+import os
+import shutil
+import tempfile
+
+_WORKDIR = tempfile.mkdtemp(prefix="cfp-tests-")
+atexit.register(shutil.rmtree, _WORKDIR, ignore_errors=True)
+
+os.environ["DATABASE_URL"] = f"sqlite:///{_WORKDIR}/test.db"
+os.environ["TREFLE_DETAIL_CACHE_PATH"] = f"{_WORKDIR}/trefle_detail_cache.db"
+os.environ["IMAGE_CACHE_DIR"] = f"{_WORKDIR}/image_cache"
+os.environ["TREFLE_API_TOKEN"] = ""
+os.environ["SESSION_SECRET_KEYS"] = "test-secret"
+os.environ["ADMIN_USERS"] = "admin"
+
+import pytest
+from fastapi.testclient import TestClient
+
+import auth, database, main, models, sessions
+from services import trefle_service
+
+WORKDIR = _WORKDIR
+
+
+def trefle_record(trefle_id: int):
+    """Trefle-Datensatz wie von /plants/{id}; ungerade ids ohne Wachstumsdaten (-> Heuristik)"""
+    growth = {} if trefle_id % 2 else {"light": 7, "soil_humidity": 6, "soil_texture": 4}
+    return {
+        "id": trefle_id,
+        "scientific_name": f"Monstera testii {trefle_id}",
+        "common_name": f"Monstera {trefle_id}",
+        "image_url": f"http://images.invalid/{trefle_id}.jpg",
+        "family": "Araceae",
+        "genus": "Monstera",
+        "main_species": {"family": "Araceae", "genus": "Monstera", "growth": growth, "specifications": {}},
+    }
+
+
+class StubResponse:
+    def __init__(self, status_code: int, payload):
+        self.status_code = status_code
+        self._payload = payload
+        self.text = str(payload)
+
+    def json(self):
+        return self._payload
+
+
+class StubTrefleClient:
+    """Ersetzt trefle_service.client und zählt die Upstream-Aufrufe"""
+
+    def __init__(self):
+        self.calls = []
+
+    def get(self, path: str, params: dict = None, with_token: bool = True):
+        self.calls.append((path, (params or {}).get("q")))
+        if path == "/plants/search":
+            return StubResponse(200, {"data": [trefle_record(9000 + i) for i in range(3)]})
+        if path.startswith("/plants/"):
+            return StubResponse(200, {"data": trefle_record(int(path.rsplit("/", 1)[1]))})
+        return StubResponse(404, {"error": "not found"})
+
+    def close(self):
+        pass
+
+
+@pytest.fixture(scope="session")
+def app():
+    """App einmal pro Testlauf hochfahren (Migrationen, Index, Test-User)"""
+    trefle_service.client = StubTrefleClient()
+    trefle_service.async_client = None
+    with TestClient(main.app):
+        yield main.app
+
+
+@pytest.fixture
+def trefle(app):
+    stub = StubTrefleClient()
+    trefle_service.client = stub
+    trefle_service.detail_cache.invalidate()
+    trefle_service.search_cache.invalidate()
+    return stub
+
+
+_usernames = (f"user{n}" for n in itertools.count(1))
+
+
+def create_user(username: str = None):
+    db = database.SessionLocal()
+    try:
+        user = models.User(username=username or next(_usernames), password_hash="-")
+        db.add(user)
+        db.commit()
+        return user.id, user.username
+    finally:
+        db.close()
+
+
+def login(client: TestClient, user_id: int, username: str):
+    client.cookies.set(auth.SESSION_COOKIE, sessions.issue(user_id, username))
+    return client
+
+
+@pytest.fixture
+def user(app):
+    return create_user()
+
+
+@pytest.fixture
+def client(app, user, trefle):
+    """TestClient, angemeldet als frischer User (eigene Daten pro Test)"""
+    return login(TestClient(app), *user)
+
+
+@pytest.fixture(scope="session")
+def admin_client(app):
+    """Angemeldet als "admin" (steht in ADMIN_USERS)"""
+    return login(TestClient(app), *create_user("admin"))
+
+
+@pytest.fixture
+def anonymous(app):
+    return TestClient(app)
+
+
+def add_location(client: TestClient, name: str = "Fensterbank", **values):
+    response = client.post("/locations/", json={"name": name, **values})
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def add_wish(client: TestClient, trefle_id: int):
+    response = client.post("/wishlist/", json={"trefle_id": trefle_id})
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def add_plant(client: TestClient, trefle_id: int, location_id: int, nickname: str = None):
+    """Pflanze über den normalen Weg anlegen: Wunschliste -> eigene Pflanze"""
+    wishlist_id = add_wish(client, trefle_id)
+    response = client.post("/my-plants/", json={
+        "nickname": nickname or f"Pflanze {trefle_id}", "location_id": location_id, "wishlist_id": wishlist_id,
+    })
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+@pytest.fixture
+def db(app):
+    session = database.SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
@@ -0,0 +1,49 @@
+# backend/tests/test_admin.py
+import pytest
+
+from conftest import add_location, add_plant
+
+ADMIN_ENDPOINTS = [
+    ("get", "/admin/image-cache"),
+    ("delete", "/admin/image-cache"),
+    ("get", "/admin/trefle-cache"),
+    ("delete", "/admin/trefle-cache"),
+    ("delete", "/admin/trefle-cache/1"),
+    ("get", "/admin/sql-budget"),
+    ("get", "/admin/search-cache"),
+    ("delete", "/admin/search-cache"),
+    ("get", "/admin/care-events"),
+    ("get", "/admin/live-updates"),
+    ("get", "/admin/session-cache"),
+]
+
+
+# Schreibende Admin-Helfer: 401/403 wie oben, Erfolg eigener Test (braucht vorhandene Daten)
+ADMIN_WRITE_ENDPOINTS = [
+    ("post", "/admin/my-plants/1/simulate/3"),
+]
+
+
+@pytest.mark.parametrize("method,path", ADMIN_ENDPOINTS + ADMIN_WRITE_ENDPOINTS)
+def test_admin_endpoints_require_login(anonymous, method, path):
+    assert getattr(anonymous, method)(path).status_code == 401
+
+
+@pytest.mark.parametrize("method,path", ADMIN_ENDPOINTS + ADMIN_WRITE_ENDPOINTS)
+def test_admin_endpoints_reject_normal_users(client, method, path):
+    assert getattr(client, method)(path).status_code == 403
+
+
+@pytest.mark.parametrize("method,path", ADMIN_ENDPOINTS)
+def test_admin_endpoints_allow_admins(admin_client, method, path):
+    assert getattr(admin_client, method)(path).status_code == 200
+
+
+def test_simulate_is_admin_only(client, admin_client):
+    plant_id = add_plant(client, 9700, add_location(client))
+
+    assert client.post(f"/admin/my-plants/{plant_id}/simulate/3").status_code == 403
+    response = admin_client.post(f"/admin/my-plants/{plant_id}/simulate/3")
+
+    assert response.status_code == 200
+    assert client.get("/dashboard/tasks").json()[0]["days_until_watering"] == 4
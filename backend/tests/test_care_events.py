@@ -0,0 +1,106 @@
+# backend/tests/test_care_events.py
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+import care_events
+import models
+from conftest import add_location, add_plant, create_user, login
+
+
+class BrokenSession:
+    """Session, deren Schreibzugriff scheitert (DB gesperrt/weg)"""
+
+    def execute(self, *args, **kwargs):
+        raise RuntimeError("database is locked")
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def events_of(db, plant_id):
+    db.expire_all()
+    return [e.action for e in db.query(models.CareEvent).filter(models.CareEvent.plant_id == plant_id)
+            .order_by(models.CareEvent.id)]
+
+
+def test_flush_writes_the_batch_in_recording_order(client, user, db):
+    plant_id = add_plant(client, 9900, add_location(client))
+    buffer = care_events.CareEventBuffer(batch_size=100)
+    buffer.record(plant_id, user[0], "water")
+    buffer.record_many([plant_id, plant_id], user[0], "fertilize")
+
+    assert buffer.flush() == 3
+    assert buffer.flush() == 0
+
+    assert events_of(db, plant_id) == ["water", "fertilize", "fertilize"]
+    assert {k: buffer.stats()[k] for k in ("pending", "written", "flushes")} == {"pending": 0, "written": 3, "flushes": 1}
+
+
+def test_failed_flush_requeues_in_front_and_caps_the_buffer(client, user, db, monkeypatch, capsys):
+    plant_id = add_plant(client, 9902, add_location(client))
+    buffer = care_events.CareEventBuffer(max_pending=3)
+    buffer.record_many([plant_id] * 2, user[0], "water")
+
+    monkeypatch.setattr(care_events, "SessionLocal", BrokenSession)
+    with pytest.raises(RuntimeError):
+        buffer.flush()
+    assert (buffer.stats()["pending"], buffer.dropped) == (2, 0)
+
+    buffer.record_many([plant_id] * 2, user[0], "prune")
+    with pytest.raises(RuntimeError):
+        buffer.flush()
+    # Älteste Events fallen weg, die neuesten bleiben in Reihenfolge erhalten
+    assert (buffer.stats()["pending"], buffer.dropped) == (3, 1)
+    assert "1 älteste Events verworfen" in capsys.readouterr().out
+
+    monkeypatch.undo()
+    assert buffer.flush() == 3
+    assert events_of(db, plant_id) == ["water", "prune", "prune"]
+
+
+def test_history_serves_persisted_events_when_flush_fails(client, db, monkeypatch):
+    plant_id = add_plant(client, 9904, add_location(client))
+    client.post(f"/my-plants/{plant_id}/water")
+    assert [e["action"] for e in client.get(f"/my-plants/{plant_id}/history").json()["events"]] == ["water"]
+
+    monkeypatch.setattr(care_events, "SessionLocal", BrokenSession)
+    client.post(f"/my-plants/{plant_id}/fertilize")
+    response = client.get(f"/my-plants/{plant_id}/history")
+
+    assert response.status_code == 200, response.text
+    assert [e["action"] for e in response.json()["events"]] == ["water"]
+
+    monkeypatch.undo()
+    assert [e["action"] for e in client.get(f"/my-plants/{plant_id}/history").json()["events"]] == ["fertilize", "water"]
+
+
+def test_history_keyset_pagination_and_time_filter(app, client, user):
+    plant_id = add_plant(client, 9906, add_location(client))
+    start = datetime(2024, 5, 1, 8, 0)
+    for day, action in enumerate(["water", "fertilize", "water", "prune", "repot"]):
+        care_events.buffer.record(plant_id, user[0], action, occurred_at=start + timedelta(days=day))
+
+    pages, before_id = [], None
+    while True:
+        params = {"limit": 2, **({"before_id": before_id} if before_id else {})}
+        body = client.get(f"/my-plants/{plant_id}/history", params=params).json()
+        pages.append([e["action"] for e in body["events"]])
+        before_id = body["next_before_id"]
+        if before_id is None:
+            break
+        assert before_id == body["events"][-1]["id"]
+
+    assert pages == [["repot", "prune"], ["water", "fertilize"], ["water"]]
+
+    window = client.get(f"/my-plants/{plant_id}/history",
+                        params={"since": "2024-05-02T00:00:00", "until": "2024-05-04T00:00:00"}).json()
+    assert [e["action"] for e in window["events"]] == ["water", "fertilize"]
+    assert window["next_before_id"] is None
+
+    stranger = login(TestClient(app), *create_user())
+    assert stranger.get(f"/my-plants/{plant_id}/history").json()["events"] == []
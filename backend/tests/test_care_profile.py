@@ -0,0 +1,71 @@
+# backend/tests/test_care_profile.py
+"""
+care_profile gegen die frühere Implementierung (has_any-Schleife je Pflanzentyp in trefle_service).
+fixtures/care_profiles.json: Datensätze mit den Profilen, die die alte derive_care_profile geliefert hat.
+"""
+import itertools
+import json
+from pathlib import Path
+
+import pytest
+
+from services import care_profile
+
+CASES = json.loads((Path(__file__).parent / "fixtures" / "care_profiles.json").read_text(encoding="utf-8"))
+KEYWORDS = sorted({w for ws in care_profile.PLANT_TYPE_KEYWORDS.values() for w in ws})
+
+
+def legacy_types(name_blob: str):
+    """Frühere Erkennung: je Typ any(w in name_blob for w in words)"""
+    return {t for t, words in care_profile.PLANT_TYPE_KEYWORDS.items() if any(w in name_blob for w in words)}
+
+
+def _name_blob(record):
+    species = record.get("main_species", {})
+    return " ".join(str(v or "") for v in (record.get("scientific_name"), record.get("common_name"),
+                                            species.get("family"), species.get("genus"))).lower()
+
+
+@pytest.mark.parametrize("case", CASES, ids=[str(c["record"]["scientific_name"]) for c in CASES])
+def test_profile_matches_previous_implementation(case):
+    assert care_profile.derive_care_profile(case["record"]) == case["expected"]
+
+
+def test_classify_matches_keyword_loop_for_fixture_names():
+    for case in CASES:
+        blob = _name_blob(case["record"])
+        assert care_profile.classify(blob) == legacy_types(blob), blob
+
+
+def test_classify_matches_keyword_loop_for_keyword_pairs():
+    # Überlappungen und Präfixe: "palme" enthält "palm", "kaktusfarn", "orangeminze" ...
+    for a, b in itertools.product(KEYWORDS, repeat=2):
+        for blob in (f"{a}{b}", f"{a} {b}", f"x{a}{b[:-1]}"):
+            assert care_profile.classify(blob) == legacy_types(blob), blob
+    assert care_profile.classify("") == set()
+
+
+def test_later_types_override_earlier_ones():
+    """Reihenfolge der Overrides wie bisher: Kaktus -> Farn -> Orchidee -> Tropisch -> Palme -> Kraut -> Zitrus"""
+    by_name = {c["record"]["scientific_name"]: c["expected"] for c in CASES}
+
+    # Kaktus + Tropisch (ficus): Gießen/Boden vom späteren Typ, Licht und Höhe bleiben vom Kaktus
+    opuntia = by_name["Opuntia ficus-indica"]
+    assert (opuntia["water_frequency_days"], opuntia["soil_type"]) == (7, "humusreich")
+    assert (opuntia["sunlight_requirement"], opuntia["max_height_cm"]) == (8, 80)
+
+    # Zitrus + Kraut + Farn: Zitrus kommt zuletzt
+    citrus = by_name["Mentha citrata"]
+    assert (citrus["water_frequency_days"], citrus["temperature_min"], citrus["max_height_cm"]) == (7, 10, 60)
+
+
+def test_batch_keeps_order_and_reports_unusable_records():
+    records = [case["record"] for case in CASES[:3]]
+    broken = {"scientific_name": "Kaputt", "main_species": {"growth": {"soil_humidity": "nass"}}}
+    errors = []
+
+    profiles = care_profile.derive_care_profiles(records[:1] + [broken] + records[1:], errors)
+
+    assert profiles == [CASES[0]["expected"], None, CASES[1]["expected"], CASES[2]["expected"]]
+    assert [(index, type(e)) for index, e in errors] == [(1, ValueError)]
+    assert care_profile.derive_care_profiles([broken]) == [None]
@@ -0,0 +1,159 @@
+# backend/tests/test_care_schedule.py
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+import care_schedule
+import models
+from conftest import add_location, add_plant, create_user, login
+
+TODAY = date.today()
+
+
+def intervals(**values):
+    defaults = {"water_frequency_days": 7, "fertilize_frequency_days": 30, "repot_frequency_days": 730,
+                "prune_frequency_days": 90, "propagate_frequency_days": 180}
+    return SimpleNamespace(**{**defaults, **values})
+
+
+def test_due_dates_from_last_values_and_acquired_date():
+    acquired = date(2024, 1, 1)
+    dues = care_schedule.due_dates({"last_watered": date(2024, 3, 1)}, acquired, intervals(prune_frequency_days=None))
+
+    assert dues["next_water_due"] == date(2024, 3, 8)
+    assert dues["next_fertilize_due"] == date(2024, 1, 31)  # ohne last_fertilized ab Kaufdatum
+    assert dues["next_prune_due"] is None
+    assert dues["next_any_due"] == date(2024, 1, 31)
+
+
+def test_due_dates_without_any_date():
+    dues = care_schedule.due_dates({}, None, intervals())
+    assert set(dues.values()) == {None}
+
+
+def _task_row(**dues):
+    values = {due_col: None for _, _, _, due_col, _ in care_schedule.TASKS}
+    values.update(dues)
+    return SimpleNamespace(id=1, nickname="Monsti", location_name="Fensterbank", plant_info_id=1,
+                           common_name=None, scientific_name="Monstera deliciosa", image_url=None,
+                           **values, **{f: None for f in care_schedule.PLANT_INFO_FULL_FIELDS})
+
+
+def test_build_task_status_and_next_task():
+    overdue = care_schedule.build_task(_task_row(next_water_due=TODAY - timedelta(days=2),
+                                                 next_fertilize_due=TODAY + timedelta(days=3)), TODAY)
+    assert (overdue["next_task"], overdue["next_task_days"], overdue["status"]) == ("water", -2, "ÜBERFÄLLIG")
+    assert overdue["species"] == "Monstera deliciosa"
+
+    # Gleichstand: Reihenfolge in TASKS entscheidet
+    today = care_schedule.build_task(_task_row(next_prune_due=TODAY, next_fertilize_due=TODAY), TODAY)
+    assert (today["next_task"], today["status"]) == ("fertilize", "HEUTE")
+
+    nothing = care_schedule.build_task(_task_row(), TODAY)
+    assert (nothing["next_task"], nothing["status"]) == (None, "OK")
+
+
+def _set_last_watered(db, plant_id, days_ago):
+    plant = db.get(models.MyPlant, plant_id)
+    plant.last_watered = TODAY - timedelta(days=days_ago)
+    care_schedule.recompute(plant)
+    db.commit()
+
+
+def _tasks(client, **params):
+    response = client.get("/dashboard/tasks", params=params)
+    assert response.status_code == 200, response.text
+    return {t["id"]: t for t in response.json()}
+
+
+def _assert_stored_dues_consistent(db, user_id):
+    db.expire_all()
+    for plant in db.query(models.MyPlant).filter(models.MyPlant.user_id == user_id):
+        last_values = {last_col: getattr(plant, last_col) for _, last_col, _, _, _ in care_schedule.TASKS}
+        expected = care_schedule.due_dates(last_values, plant.date_acquired, plant.plant_info)
+        assert {col: getattr(plant, col) for col in expected} == expected, plant.nickname
+
+
+def test_dashboard_uses_stored_due_dates(client, user, db):
+    location_id = add_location(client)
+    thirsty = add_plant(client, 9500, location_id, nickname="Durstig")
+    fine = add_plant(client, 9502, location_id, nickname="Gut")
+    _set_last_watered(db, thirsty, 10)
+
+    tasks = _tasks(client)
+    assert list(tasks) == [thirsty, fine]  # sortiert nach nächster Fälligkeit
+    assert (tasks[thirsty]["days_until_watering"], tasks[thirsty]["status"]) == (-3, "ÜBERFÄLLIG")
+    assert tasks[fine]["days_until_watering"] == 7
+
+    assert list(_tasks(client, days=0)) == [thirsty]
+    assert list(_tasks(client, days=7)) == [thirsty, fine]
+
+    assert client.post(f"/my-plants/{thirsty}/water").status_code == 200
+    assert _tasks(client)[thirsty]["days_until_watering"] == 7
+    assert list(_tasks(client, days=0)) == []
+    _assert_stored_dues_consistent(db, user[0])
+
+
+def test_changed_interval_recomputes_due_dates(client, user, db):
+    plant_id = add_plant(client, 9504, add_location(client))
+
+    response = client.put(f"/my-plants/{plant_id}/plant-info", json={"water_frequency_days": 2})
+
+    assert response.status_code == 200, response.text
+    assert _tasks(client)[plant_id]["days_until_watering"] == 2
+    _assert_stored_dues_consistent(db, user[0])
+
+
+def test_bulk_water_by_ids(app, client, user, db):
+    location_id = add_location(client)
+    first = add_plant(client, 9510, location_id, nickname="Eins")
+    second = add_plant(client, 9512, location_id, nickname="Zwei")
+    for plant_id in (first, second):
+        _set_last_watered(db, plant_id, 5)
+
+    stranger = login(TestClient(app), *create_user())
+    foreign = add_plant(stranger, 9514, add_location(stranger))
+    _set_last_watered(db, foreign, 5)
+
+    response = client.post("/my-plants/bulk/water", json={"plant_ids": [first, foreign, second, first]})
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["updated"] == 2
+    assert body["results"] == [
+        {"id": first, "status": "success", "plant": "Eins", "watered_on": str(TODAY)},
+        {"id": foreign, "status": "not_found"},
+        {"id": second, "status": "success", "plant": "Zwei", "watered_on": str(TODAY)},
+    ]
+    assert {t["days_until_watering"] for t in _tasks(client).values()} == {7}
+    assert _tasks(stranger)[foreign]["days_until_watering"] == 2  # fremde Pflanze unverändert
+    _assert_stored_dues_consistent(db, user[0])
+
+
+def test_bulk_action_for_a_location(client, user, db):
+    window = add_location(client, "Fensterbank")
+    shelf = add_location(client, "Regal")
+    inside = [add_plant(client, 9520 + 2 * i, window) for i in range(3)]
+    outside = add_plant(client, 9530, shelf)
+    for plant_id in inside + [outside]:
+        _set_last_watered(db, plant_id, 4)
+
+    response = client.post(f"/locations/{window}/water-all")
+
+    assert response.status_code == 200, response.text
+    assert sorted(r["id"] for r in response.json()["results"]) == inside
+    tasks = _tasks(client)
+    assert [tasks[p]["days_until_watering"] for p in inside] == [7, 7, 7]
+    assert tasks[outside]["days_until_watering"] == 3
+    _assert_stored_dues_consistent(db, user[0])
+
+
+def test_bulk_rejects_unknown_actions_and_foreign_locations(app, client):
+    location_id = add_location(client)
+    stranger = login(TestClient(app), *create_user())
+
+    assert client.post("/my-plants/bulk/propagate", json={"plant_ids": []}).status_code == 404
+    assert client.post(f"/locations/{location_id}/dance-all").status_code == 404
+    assert stranger.post(f"/locations/{location_id}/water-all").status_code == 404
+    assert client.post("/my-plants/bulk/water", json={"plant_ids": []}).json()["updated"] == 0
@@ -0,0 +1,44 @@
+# backend/tests/test_catalog_import.py
+import json
+
+import catalog_import
+import database
+from conftest import add_location, add_plant, add_wish
+
+
+def import_record(tmp_path, trefle_id, light, soil_humidity):
+    path = tmp_path / f"catalog-{light}-{soil_humidity}.jsonl"
+    path.write_text(json.dumps({
+        "id": trefle_id, "scientific_name": "Peperomia reimportii", "common_name": "Peperomie",
+        "main_species": {"growth": {"light": light, "soil_humidity": soil_humidity}, "specifications": {}},
+    }) + "\n")
+    return catalog_import.import_catalog(path, engine=database.engine)
+
+
+def _overview(client, location_id):
+    location = next(l for l in client.get("/locations/overview").json() if l["location"]["id"] == location_id)
+    return [w["wishlist_id"] for w in location["compatible_wishlist_plants"]]
+
+
+def test_reimport_refreshes_compatibility_and_due_dates(client, tmp_path):
+    trefle_id = 52001
+    import_record(tmp_path, trefle_id, light=5, soil_humidity=5)
+    location_id = add_location(client, light_level=5)
+    plant_id = add_plant(client, trefle_id, location_id)
+    wish = add_wish(client, trefle_id)
+
+    assert _overview(client, location_id) == [wish]
+    tasks = {t["id"]: t for t in client.get("/dashboard/tasks").json()}
+    assert tasks[plant_id]["days_until_watering"] == 7
+    tag = client.get("/dashboard/tasks").headers["etag"]
+
+    # Neuer Dump: volle Sonne, sumpfig -> passt nicht mehr ans Fenster, alle 2 Tage gießen
+    stats = import_record(tmp_path, trefle_id, light=10, soil_humidity=9)
+
+    assert stats["updated"] == 1
+    assert _overview(client, location_id) == []
+    response = client.get("/dashboard/tasks", headers={"If-None-Match": tag})
+    assert response.status_code == 200
+    tasks = {t["id"]: t for t in response.json()}
+    assert tasks[plant_id]["days_until_watering"] == 2
+    assert tasks[plant_id]["plant_info_full"]["sunlight_requirement"] == 10
@@ -0,0 +1,64 @@
+# backend/tests/test_catalog_search.py
+import json
+
+import catalog_import
+import catalog_search
+import database
+
+
+def import_records(tmp_path, names):
+    path = tmp_path / "catalog.jsonl"
+    with open(path, "w") as f:
+        for trefle_id, name in names:
+            f.write(json.dumps({"id": trefle_id, "scientific_name": name, "common_name": name,
+                                "main_species": {"growth": {}, "specifications": {}}}) + "\n")
+    return catalog_import.import_catalog(path, engine=database.engine)
+
+
+def search_calls(trefle):
+    return [q for path, q in trefle.calls if path == "/plants/search"]
+
+
+def test_local_hits_are_served_without_trefle(client, trefle, tmp_path):
+    import_records(tmp_path, [(50001, "Zamioculcas zamiifolia"), (50002, "Zamioculcas zenzi")])
+
+    results = client.get("/plants/search/zamio").json()
+
+    assert [p["id"] for p in results] == [50001, 50002]
+    assert search_calls(trefle) == []
+
+
+def test_fill_tops_up_local_hits_with_trefle(client, trefle, tmp_path):
+    import_records(tmp_path, [(50011, "Aglaonema commutatum"), (9001, "Aglaonema pictum")])
+
+    results = client.get("/plants/search/aglaonema", params={"fill": "true"}).json()
+
+    assert [p["id"] for p in results] == [50011, 9001, 9000, 9002]
+    assert search_calls(trefle) == ["aglaonema"]
+
+
+def test_local_miss_falls_back_to_trefle(client, trefle):
+    results = client.get("/plants/search/nirgendwo-lokal").json()
+
+    assert [p["id"] for p in results] == [9000, 9001, 9002]
+    assert search_calls(trefle) == ["nirgendwo-lokal"]
+
+
+def test_full_page_of_local_hits_skips_trefle(client, trefle, tmp_path):
+    import_records(tmp_path, [(51000 + i, f"Sansevieria trifasciata {i}") for i in range(catalog_search.SEARCH_LIMIT + 5)])
+
+    results = client.get("/plants/search/sansevieria").json()
+
+    assert len(results) == catalog_search.SEARCH_LIMIT
+    assert all(51000 <= p["id"] < 51100 for p in results)
+    assert search_calls(trefle) == []
+
+
+def test_wishlist_plant_infos_are_not_catalog_hits(client, trefle):
+    # Legt eine geteilte PlantInfo (owner NULL) "Monstera testii 4711" an, aber nicht aus dem Katalog
+    assert client.post("/wishlist/", json={"trefle_id": 4711}).status_code == 200
+
+    results = client.get("/plants/search/testii 4711").json()
+
+    assert 4711 not in [p["id"] for p in results]
+    assert search_calls(trefle) == ["testii 4711"]
@@ -0,0 +1,127 @@
+# backend/tests/test_compatibility.py
+from types import SimpleNamespace
+
+import compatibility
+import models
+from conftest import add_location, add_plant, add_wish
+
+
+def plant(**values):
+    defaults = {"sunlight_requirement": 5, "humidity_requirement": 5, "temperature_min": 15,
+                "temperature_max": 25, "max_height_cm": 100, "is_toxic": False}
+    return SimpleNamespace(**{**defaults, **values})
+
+
+def location(id=1, name="Fensterbank", **values):
+    defaults = {"light_level": 5, "humidity_level": 5, "temperature_avg": 20,
+                "available_space_cm": 200, "has_pets_or_children": False}
+    return SimpleNamespace(id=id, name=name, **{**defaults, **values})
+
+
+def test_each_rule_sets_its_bit():
+    cases = [
+        (plant(), location(), 0),
+        (plant(sunlight_requirement=9), location(light_level=6), compatibility.LIGHT),
+        (plant(sunlight_requirement=8), location(light_level=6), 0),  # innerhalb der Toleranz
+        (plant(humidity_requirement=1), location(humidity_level=4), compatibility.HUMIDITY),
+        (plant(temperature_min=22), location(), compatibility.TEMPERATURE),
+        (plant(temperature_max=18), location(), compatibility.TEMPERATURE),
+        (plant(max_height_cm=250), location(), compatibility.SPACE),
+        (plant(is_toxic=True), location(), 0),
+        (plant(is_toxic=True), location(has_pets_or_children=True), compatibility.TOXIC),
+        (plant(sunlight_requirement=1, max_height_cm=300), location(light_level=10),
+         compatibility.LIGHT | compatibility.SPACE),
+    ]
+    for p, l, bits in cases:
+        assert compatibility.evaluate([p], [l])[0][0] == bits, (p, l)
+
+
+def test_null_values_fall_back_to_model_defaults():
+    p = plant(sunlight_requirement=None, temperature_min=None, is_toxic=None)
+    l = location(light_level=None, available_space_cm=None, has_pets_or_children=None)
+    assert compatibility.evaluate([p], [l])[0][0] == 0
+
+
+def test_matrix_shape_and_empty_inputs():
+    plants = [plant(), plant(max_height_cm=500), plant(sunlight_requirement=10)]
+    locations = [location(1), location(2, light_level=10, available_space_cm=1000)]
+
+    reasons = compatibility.evaluate(plants, locations)
+
+    assert reasons.tolist() == [[0, compatibility.LIGHT], [compatibility.SPACE, compatibility.LIGHT], [compatibility.LIGHT, 0]]
+    assert compatibility.evaluate([], locations).shape == (0, 2)
+    assert compatibility.evaluate(plants, []).shape == (3, 0)
+
+
+def test_recommendations_sort_recommended_first():
+    locations = [location(1, "Zimmer", light_level=10), location(2, "bad"), location(3, "Arbeitszimmer")]
+
+    result = compatibility.recommendations(plant(), locations)
+
+    assert [(r["name"], r["recommended"]) for r in result] == [("Arbeitszimmer", True), ("bad", True), ("Zimmer", False)]
+    assert result[2]["reasons"] == ["Licht passt nicht"]
+
+
+def _stored(db, user_id):
+    """Zeilen der PlantInfos, die der User verwendet (nach einem Fork bleiben die des Katalog-Eintrags liegen)"""
+    c = models.PlantLocationCompatibility
+    in_use = {info.id for info in compatibility._user_plant_infos(db, user_id)}
+    return {
+        (row.plant_info_id, row.location_id): (row.ok, row.reasons)
+        for row in db.query(c).join(models.Location, models.Location.id == c.location_id)
+        .filter(models.Location.user_id == user_id, c.plant_info_id.in_(in_use))
+    }
+
+
+def _expected(db, user_id):
+    infos = compatibility._user_plant_infos(db, user_id)
+    locations = db.query(models.Location).filter(models.Location.user_id == user_id).all()
+    reasons = compatibility.evaluate(infos, locations)
+    return {
+        (info.id, loc.id): (bool(bits == 0), int(bits))
+        for info, row in zip(infos, reasons)
+        for loc, bits in zip(locations, row)
+    }
+
+
+def test_table_follows_locations_wishlist_and_edits(client, user, db):
+    sunny = add_location(client, "Südfenster", light_level=9)
+    wish = add_wish(client, 9400)
+    add_location(client, "Flur", light_level=2, has_pets_or_children=True)
+    owned = add_plant(client, 9401, sunny)
+    assert _stored(db, user[0]) == _expected(db, user[0])
+
+    # Eigene Pflegewerte (Fork) -> Zeilen des Forks werden berechnet
+    assert client.put(f"/my-plants/{owned}/plant-info", json={"sunlight_requirement": 1}).status_code == 200
+    assert client.put(f"/wishlist/{wish}/plant-info", json={"is_toxic": True}).status_code == 200
+    db.expire_all()
+    assert _stored(db, user[0]) == _expected(db, user[0])
+
+
+def test_endpoints_agree_with_the_table(client, user, db):
+    sunny = add_location(client, "Südfenster", light_level=9)
+    flur = add_location(client, "Flur", light_level=2, available_space_cm=30)
+    wish = add_wish(client, 9410)
+
+    recommended = {r["id"] for r in client.get(f"/wishlist/{wish}/recommended-locations").json() if r["recommended"]}
+    info_id = db.query(models.Wishlist.plant_info_id).filter(models.Wishlist.id == wish).scalar()
+    stored = {lid for (pid, lid), (ok, _) in _stored(db, user[0]).items() if pid == info_id and ok}
+    assert recommended == stored == {sunny}
+
+    for location_id in (sunny, flur):
+        details = client.get(f"/locations/{location_id}/details").json()
+        compatible = [w["wishlist_id"] for w in details["compatible_wishlist_plants"]]
+        assert compatible == ([wish] if location_id in stored else [])
+
+
+def test_rebuild_all_matches_incremental_state(client, user, db):
+    window = add_location(client, "Fensterbank", light_level=7)
+    add_location(client, "Keller", light_level=1, temperature_avg=8)
+    add_plant(client, 9420, window)
+    add_wish(client, 9421)
+    incremental = _stored(db, user[0])
+
+    compatibility.rebuild_all(db)
+
+    assert _stored(db, user[0]) == incremental
+    assert incremental == _expected(db, user[0])
@@ -0,0 +1,61 @@
+# backend/tests/test_detail_cache.py
+from services.detail_cache import DetailCache
+
+
+def last_access(cache, trefle_id):
+    return cache._conn.execute("SELECT last_access FROM plant_details WHERE trefle_id = ?", (trefle_id,)).fetchone()[0]
+
+
+def test_hit_and_miss():
+    cache = DetailCache(":memory:")
+    assert cache.get(1) is None
+    cache.put(1, {"common_name": "Monstera"})
+    assert cache.get(1) == {"common_name": "Monstera"}
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_expired_entries_are_dropped(monkeypatch):
+    cache = DetailCache(":memory:", ttl_seconds=60)
+    monkeypatch.setattr("services.detail_cache.time.time", lambda: 1000.0)
+    cache.put(1, {"x": 1})
+    monkeypatch.setattr("services.detail_cache.time.time", lambda: 1061.0)
+    assert cache.get(1) is None
+    assert cache.expired == 1
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_is_evicted(monkeypatch):
+    clock = iter(range(1000, 10000, 100))
+    monkeypatch.setattr("services.detail_cache.time.time", lambda: float(next(clock)))
+    cache = DetailCache(":memory:", max_entries=2, touch_interval_seconds=0)
+    cache.put(1, {"x": 1})
+    cache.put(2, {"x": 2})
+    cache.get(1)              # 2 ist jetzt am längsten nicht benutzt
+    cache.put(3, {"x": 3})
+    assert cache.get(2) is None
+    assert cache.get(1) == {"x": 1}
+    assert cache.evictions == 1
+
+
+def test_hits_only_write_access_time_after_touch_interval(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("services.detail_cache.time.time", lambda: now[0])
+    cache = DetailCache(":memory:", touch_interval_seconds=300)
+    cache.put(1, {"x": 1})
+
+    now[0] = 1299.0
+    assert cache.get(1) == {"x": 1}
+    assert last_access(cache, 1) == 1000.0
+
+    now[0] = 1300.0
+    cache.get(1)
+    assert last_access(cache, 1) == 1300.0
+
+
+def test_invalidate_single_and_all():
+    cache = DetailCache(":memory:")
+    cache.put(1, {"x": 1})
+    cache.put(2, {"x": 2})
+    assert cache.invalidate(1) == 1
+    assert cache.invalidate() == 1
+    assert cache.get(2) is None
@@ -0,0 +1,160 @@
+# backend/tests/test_enrichment.py
+"""Anreicherungs-Queue: Worker werden hier direkt über run_once angestoßen (ohne Threads der App)"""
+import threading
+from datetime import timedelta
+
+import pytest
+
+import enrichment
+import models
+from conftest import StubResponse, StubTrefleClient, add_location
+from services import trefle_service
+
+
+class FlakyTrefleClient(StubTrefleClient):
+    """Die ersten `failures` Detail-Abfragen schlagen mit 500 fehl"""
+
+    def __init__(self, failures: int = 0):
+        super().__init__()
+        self.failures = failures
+
+    def get(self, path: str, params: dict = None, with_token: bool = True):
+        if path.startswith("/plants/") and path != "/plants/search" and self.failures:
+            self.failures -= 1
+            self.calls.append((path, None))
+            return StubResponse(500, {"error": "kaputt"})
+        return super().get(path, params, with_token)
+
+
+@pytest.fixture
+def pool(app, trefle):
+    """Eigener Pool; die Worker der App pausieren, liegengebliebene Jobs anderer Tests werden abgearbeitet"""
+    enrichment.worker_pool.stop()
+    pool = enrichment.EnrichmentWorkerPool(worker_count=0)
+    while pool.run_once():
+        pass
+    yield pool
+    enrichment.worker_pool.start()
+
+
+def use_trefle(monkeypatch, failures):
+    stub = FlakyTrefleClient(failures)
+    monkeypatch.setattr(trefle_service, "client", stub)
+    return stub
+
+
+def queue_wish(client, trefle_id):
+    response = client.post("/wishlist/", params={"background": "true"}, json={"trefle_id": trefle_id})
+    assert response.status_code == 200, response.text
+    assert response.json()["enrichment_status"] == "pending"
+    return response.json()["id"]
+
+
+def job_for(db, trefle_id):
+    db.expire_all()
+    return db.query(models.EnrichmentJob).filter(models.EnrichmentJob.trefle_id == trefle_id).one()
+
+
+def make_due(db, job):
+    job.next_attempt_at = enrichment._utcnow() - timedelta(seconds=1)
+    db.commit()
+
+
+def test_queued_job_enriches_the_placeholder(client, db, pool):
+    location_id = add_location(client)
+    wish = queue_wish(client, 9800)
+
+    assert pool.run_once() is True
+    assert pool.run_once() is False
+
+    job = job_for(db, 9800)
+    assert (job.status, job.attempts, job.last_error) == ("done", 1, None)
+    info = db.get(models.PlantInfo, job.plant_info_id)
+    assert (info.enrichment_status, info.common_name) == ("ready", "Monstera 9800")
+    assert client.get(f"/wishlist/{wish}/enrichment").json()["enrichment_status"] == "ready"
+    pairs = db.query(models.PlantLocationCompatibility).filter_by(plant_info_id=info.id, location_id=location_id)
+    assert pairs.count() == 1
+
+
+def test_failures_are_retried_with_exponential_backoff(client, db, pool, monkeypatch):
+    stub = use_trefle(monkeypatch, failures=2)
+    queue_wish(client, 9802)
+
+    before = enrichment._utcnow()
+    assert pool.run_once() is True
+    job = job_for(db, 9802)
+    assert (job.status, job.attempts) == ("queued", 1)
+    assert job.last_error == "Keine Details von Trefle"
+    first_delay = job.next_attempt_at - before
+    assert timedelta(seconds=enrichment.RETRY_BASE_SECONDS - 1) <= first_delay <= timedelta(seconds=enrichment.RETRY_BASE_SECONDS + 5)
+
+    assert pool.run_once() is False  # noch nicht fällig
+
+    make_due(db, job)
+    before = enrichment._utcnow()
+    assert pool.run_once() is True
+    job = job_for(db, 9802)
+    assert job.attempts == 2
+    second_delay = job.next_attempt_at - before
+    assert timedelta(seconds=2 * enrichment.RETRY_BASE_SECONDS - 1) <= second_delay <= timedelta(seconds=2 * enrichment.RETRY_BASE_SECONDS + 5)
+
+    make_due(db, job)
+    assert pool.run_once() is True
+    job = job_for(db, 9802)
+    assert (job.status, job.attempts) == ("done", 3)
+    assert db.get(models.PlantInfo, job.plant_info_id).enrichment_status == "ready"
+    assert len([c for c in stub.calls if c[0] == "/plants/9802"]) == 3
+
+
+def test_job_fails_permanently_after_max_attempts(client, db, pool, monkeypatch):
+    use_trefle(monkeypatch, failures=100)
+    wish = queue_wish(client, 9804)
+    job = job_for(db, 9804)
+    job.max_attempts = 2
+    db.commit()
+
+    pool.run_once()
+    make_due(db, job_for(db, 9804))
+    pool.run_once()
+
+    job = job_for(db, 9804)
+    assert (job.status, job.attempts) == ("failed", 2)
+    assert db.get(models.PlantInfo, job.plant_info_id).enrichment_status == "failed"
+    assert client.get(f"/wishlist/{wish}/enrichment").json()["enrichment_status"] == "failed"
+    assert pool.run_once() is False
+
+
+def test_abandoned_running_jobs_are_recovered_on_start(client, db, pool):
+    queue_wish(client, 9806)
+    job = job_for(db, 9806)
+    job.status = "running"  # Prozess ist während der Bearbeitung abgestürzt
+    job.attempts = 1
+    db.commit()
+    assert pool.run_once() is False
+
+    pool.start()  # worker_count=0: nur Wiederherstellung, keine Threads
+
+    assert job_for(db, 9806).status == "queued"
+    assert pool.run_once() is True
+    assert (job_for(db, 9806).status, job_for(db, 9806).attempts) == ("done", 2)
+
+
+def test_a_job_is_claimed_by_exactly_one_worker(client, db, pool, monkeypatch):
+    stub = use_trefle(monkeypatch, failures=0)
+    queue_wish(client, 9808)
+    barrier = threading.Barrier(6)
+    results = []
+
+    def worker():
+        barrier.wait()
+        results.append(pool.run_once())
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(10)
+
+    assert results.count(True) == 1
+    assert job_for(db, 9808).attempts == 1
+    assert [c for c in stub.calls if c[0] == "/plants/9808"] == [("/plants/9808", None)]
@@ -0,0 +1,107 @@
+# backend/tests/test_etags.py
+from datetime import date
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+
+import data_version
+import models
+from conftest import add_location, add_plant, add_wish, create_user, login
+
+COLLECTIONS = ["/locations/", "/wishlist/", "/locations/overview", "/dashboard/tasks"]
+
+
+def etag(client, path):
+    response = client.get(path)
+    assert response.status_code == 200, response.text
+    return response.headers["etag"]
+
+
+def test_if_none_match_comparison():
+    tag = '"tasks-1-4"'
+    assert data_version._matches(tag, tag)
+    assert data_version._matches(f'"other", W/{tag}', tag)
+    assert data_version._matches("*", tag)
+    assert not data_version._matches('"tasks-1-5"', tag)
+    assert not data_version._matches(None, tag)
+
+
+@pytest.mark.parametrize("path", COLLECTIONS)
+def test_unchanged_collection_answers_304(client, path):
+    add_plant(client, 9600, add_location(client))
+    first = client.get(path)
+    tag = first.headers["etag"]
+    assert (first.headers["cache-control"], first.headers["vary"]) == ("private, no-cache", "Cookie")
+
+    again = client.get(path, headers={"If-None-Match": tag})
+
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["etag"] == tag
+    # Nur Version nachschlagen, die eigentlichen Abfragen entfallen
+    assert int(again.headers["x-sql-queries"]) < int(first.headers["x-sql-queries"])
+
+
+def test_dashboard_tag_depends_on_date_and_filter(client):
+    add_location(client)
+    tag = etag(client, "/dashboard/tasks")
+    assert date.today().isoformat() in tag  # "in X Tagen" ändert sich über Nacht
+    assert etag(client, "/dashboard/tasks?days=3") != tag
+
+
+def test_every_kind_of_change_invalidates(client, admin_client):
+    location_id = add_location(client)
+    plant_id = add_plant(client, 9610, location_id)
+    wish = add_wish(client, 9612)
+
+    changes = [
+        lambda: client.post("/locations/", json={"name": "Regal"}),
+        lambda: admin_client.post(f"/admin/my-plants/{plant_id}/simulate/3"),
+        lambda: client.post(f"/my-plants/{plant_id}/water"),
+        lambda: client.post("/my-plants/bulk/fertilize", json={"plant_ids": [plant_id]}),
+        lambda: client.put(f"/wishlist/{wish}/plant-info", json={"water_frequency_days": 4}),
+        lambda: client.post("/import", files={"file": ("w.jsonl", orjson.dumps({"type": "wishlist", "trefle_id": 9614}))}),
+        lambda: client.delete(f"/wishlist/{wish}"),
+    ]
+    for change in changes:
+        before = {path: etag(client, path) for path in COLLECTIONS}
+        assert change().status_code == 200
+        after = {path: etag(client, path) for path in COLLECTIONS}
+        assert [p for p in COLLECTIONS if after[p] == before[p]] == []
+
+
+def test_shared_plant_info_update_invalidates_its_users(app, client, db):
+    add_wish(client, 9620)
+    bystander = login(TestClient(app), *create_user())
+    add_wish(bystander, 9622)
+    mine, theirs = etag(client, "/wishlist/"), etag(bystander, "/wishlist/")
+
+    # z.B. Anreicherung im Hintergrund: geteilte PlantInfo ändert sich
+    info = db.query(models.PlantInfo).filter(models.PlantInfo.trefle_id == 9620,
+                                             models.PlantInfo.owner_user_id.is_(None)).one()
+    info.common_name = "Neu angereichert"
+    db.commit()
+
+    assert etag(client, "/wishlist/") != mine
+    assert etag(bystander, "/wishlist/") == theirs
+
+
+def test_tags_are_per_user(app, client):
+    add_location(client)
+    other = login(TestClient(app), *create_user())
+    tag = etag(client, "/locations/")
+
+    add_location(other, "Balkon")
+
+    assert etag(client, "/locations/") == tag
+    assert other.get("/locations/", headers={"If-None-Match": tag}).status_code == 200
+
+
+def test_no_op_write_keeps_the_tag(client):
+    plant_id = add_plant(client, 9630, add_location(client))
+    tag = etag(client, "/dashboard/tasks")
+
+    assert client.post(f"/my-plants/{plant_id}/water").status_code == 200  # heute schon gegossen
+
+    assert etag(client, "/dashboard/tasks") == tag
@@ -0,0 +1,145 @@
+# backend/tests/test_export_import.py
+import io
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+
+import bulk_import
+import export
+import models
+from conftest import add_location, add_plant, add_wish, create_user, login
+
+
+def _seed(client):
+    """Zwei Standorte, zwei Pflanzen (eine mit eigenen Pflegewerten), ein offener Wunsch"""
+    window = add_location(client, "Fensterbank", light_level=8)
+    shelf = add_location(client, "Regal", light_level=3, has_pets_or_children=True)
+    add_plant(client, 9100, window, nickname="Monsti")
+    forked = add_plant(client, 9101, shelf, nickname="Farni")
+    response = client.put(f"/my-plants/{forked}/plant-info", json={"water_frequency_days": 3, "sunlight_requirement": 2})
+    assert response.status_code == 200, response.text
+    add_wish(client, 9102)
+
+
+def _export(client, fmt):
+    response = client.get("/export", params={"format": fmt})
+    assert response.status_code == 200, response.text
+    return response.content
+
+
+def _import(client, payload, fmt):
+    response = client.post("/import", files={"file": (f"backup.{fmt}", payload)})
+    assert response.status_code == 200, response.text
+    return [orjson.loads(line) for line in response.content.splitlines()]
+
+
+def _snapshot(db, user_id):
+    """Inhalt eines Kontos ohne ids: vergleichbar zwischen Quelle und Ziel"""
+    locations = sorted(
+        (l.name, l.light_level, l.has_pets_or_children)
+        for l in db.query(models.Location).filter(models.Location.user_id == user_id)
+    )
+    wishlist = sorted(t for (t,) in db.query(models.Wishlist.trefle_id).filter(models.Wishlist.user_id == user_id))
+    plants = sorted(
+        (p.nickname, p.plant_info.trefle_id, p.plant_info.owner_user_id is not None, p.location.name,
+         p.date_acquired, p.last_watered, p.next_water_due,
+         p.plant_info.water_frequency_days, p.plant_info.sunlight_requirement)
+        for p in db.query(models.MyPlant).filter(models.MyPlant.user_id == user_id)
+    )
+    # Nur PlantInfos, die das Konto verwendet (nach einem Fork bleiben die Zeilen des Katalog-Eintrags liegen)
+    in_use = {w.plant_info_id for w in db.query(models.Wishlist).filter(models.Wishlist.user_id == user_id)}
+    in_use |= {p.plant_info_id for p in db.query(models.MyPlant).filter(models.MyPlant.user_id == user_id)}
+    compatible = sorted(
+        (info.trefle_id, location.name, row.ok)
+        for row, info, location in (
+            db.query(models.PlantLocationCompatibility, models.PlantInfo, models.Location)
+            .join(models.PlantInfo, models.PlantInfo.id == models.PlantLocationCompatibility.plant_info_id)
+            .join(models.Location, models.Location.id == models.PlantLocationCompatibility.location_id)
+            .filter(models.Location.user_id == user_id, models.PlantInfo.id.in_(in_use))
+        )
+    )
+    return {"locations": locations, "wishlist": wishlist, "plants": plants, "compatible": compatible}
+
+
+@pytest.mark.parametrize("fmt", ["jsonl", "csv"])
+def test_export_can_be_imported_into_another_account(app, client, user, trefle, db, fmt):
+    _seed(client)
+    payload = _export(client, fmt)
+
+    target = login(TestClient(app), *create_user())
+    events = _import(target, payload, fmt)
+
+    assert [e for e in events if e["event"] == "error"] == []
+    done = events[-1]
+    assert done["event"] == "done"
+    assert done["created"] == {"location": 2, "plant_info": 1, "wishlist": 1, "plant": 2}
+
+    target_id = target.get("/auth/me").json()["id"]
+    assert _snapshot(db, target_id) == _snapshot(db, user[0])
+    dashboard = [(t["plant"], t["location"], t["days_until_watering"]) for t in client.get("/dashboard/tasks").json()]
+    assert len(dashboard) == 2
+    assert [(t["plant"], t["location"], t["days_until_watering"]) for t in target.get("/dashboard/tasks").json()] == dashboard
+
+
+def test_reimport_into_same_account_reuses_locations_and_forks(client, user, db):
+    _seed(client)
+    payload = _export(client, "jsonl")
+
+    done = _import(client, payload, "jsonl")[-1]
+
+    assert done["skipped"] == {"location": 2, "plant_info": 1, "wishlist": 1}
+    assert done["created"] == {"location": 0, "plant_info": 0, "wishlist": 0, "plant": 2}
+    owned = db.query(models.PlantInfo).filter(models.PlantInfo.owner_user_id == user[0]).count()
+    assert owned == 1
+    assert db.query(models.Location).filter(models.Location.user_id == user[0]).count() == 2
+    # Die neuen Pflanzen hängen an den vorhandenen Standorten und am vorhandenen Fork
+    names = sorted(p.location.name for p in db.query(models.MyPlant).filter(models.MyPlant.user_id == user[0]))
+    assert names == ["Fensterbank", "Fensterbank", "Regal", "Regal"]
+
+
+def test_aborted_import_keeps_compatibility_of_committed_batches(user, trefle, db):
+    rows = [{"type": "location", "name": f"Standort {i}"} for i in range(3)]
+    rows += [{"type": "wishlist", "trefle_id": 9200 + i} for i in range(6)]
+    payload = io.BytesIO(b"".join(orjson.dumps(r) + b"\n" for r in rows))
+
+    events = bulk_import.run(payload, "jsonl", user[0], batch_size=4)
+    assert next(events)["event"] == "progress"
+    events.close()  # Client hat die Verbindung getrennt
+
+    locations = db.query(models.Location).filter(models.Location.user_id == user[0]).all()
+    wishes = db.query(models.Wishlist).filter(models.Wishlist.user_id == user[0]).all()
+    assert (len(locations), len(wishes)) == (3, 1)
+    pairs = db.query(models.PlantLocationCompatibility).filter(
+        models.PlantLocationCompatibility.location_id.in_([l.id for l in locations])
+    ).count()
+    assert pairs == 3
+
+
+def test_unmapped_plant_info_id_falls_back_to_catalog(client, user, db):
+    location_id = add_location(client)
+    line = {"type": "plant", "nickname": "Alt", "trefle_id": 9300, "plant_info_id": 123456, "location_id": location_id}
+
+    events = _import(client, orjson.dumps(line), "jsonl")
+
+    assert events[-1]["created"]["plant"] == 1
+    plant = db.query(models.MyPlant).filter(models.MyPlant.user_id == user[0]).one()
+    assert (plant.plant_info.trefle_id, plant.plant_info.owner_user_id) == (9300, None)
+
+
+def test_export_streams_one_block_per_batch(client, user):
+    _seed(client)
+
+    blocks = list(export.stream(user[0], "jsonl", ["location", "plant"], batch_size=1))
+
+    assert len(blocks) == 4
+    assert [orjson.loads(b)["type"] for b in blocks] == ["location", "location", "plant", "plant"]
+
+
+def test_export_rejects_unknown_options(client):
+    assert client.get("/export", params={"format": "xml"}).status_code == 400
+    assert client.get("/export", params={"type": "secrets"}).status_code == 400
+    lines = _export(client, "jsonl").splitlines()
+    assert lines == []
+    csv_lines = client.get("/export", params={"format": "csv", "type": "location"}).content.decode().splitlines()
+    assert csv_lines == [",".join(["type"] + export.columns("location"))]
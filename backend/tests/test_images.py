@@ -0,0 +1,245 @@
+# backend/tests/test_images.py
+"""Bild-Proxy gegen einen lokalen Ersatz-Bildserver (http.server im Thread)"""
+import struct
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import orjson
+import pytest
+
+import models
+from conftest import create_user
+from services import image_service
+from services.image_cache import ImageCache
+
+
+def tiny_png():
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    header = struct.pack(">IIBBBBB", 1, 1, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(b"\x00\x00\x80\x00")) + chunk(b"IEND", b"")
+
+
+PNG = tiny_png()
+
+
+class OriginHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requests = []
+
+    def do_GET(self):
+        OriginHandler.requests.append(self.path)
+        if self.path.startswith("/plant"):
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(PNG)))
+            self.end_headers()
+            self.wfile.write(PNG)
+        elif self.path.startswith("/garbage"):
+            body = b"<html>kein Bild</html>"
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif self.path.startswith("/redirect-internal"):
+            # Öffentlich aussehende URL, die auf eine interne Adresse weiterleitet
+            self.send_response(302)
+            self.send_header("Location", f"http://127.0.0.1:{self.server.server_address[1]}/plant-internal.png")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        elif self.path.startswith("/declared-huge"):
+            # Größe steht im Header -> Proxy darf den Body gar nicht erst lesen
+            self.send_response(200)
+            self.send_header("Content-Length", str(image_service.MAX_SOURCE_BYTES + 1))
+            self.end_headers()
+            self.wfile.write(b"x" * 10)
+        elif self.path.startswith("/chunked-huge"):
+            # Ohne Content-Length: erst beim Lesen merkt der Proxy, dass es zu viel wird
+            self.send_response(200)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            try:
+                for _ in range(image_service.MAX_SOURCE_BYTES // 1000 + 10):
+                    self.wfile.write(b"3e8\r\n" + b"x" * 1000 + b"\r\n")
+                self.wfile.write(b"0\r\n\r\n")
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+        else:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class OriginServer(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        pass  # Proxy bricht zu große Downloads absichtlich ab
+
+
+@pytest.fixture(scope="module")
+def origin_server():
+    server = OriginServer(("127.0.0.1", 0), OriginHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.port = server.server_address[1]
+    yield server
+    server.shutdown()
+
+
+@pytest.fixture
+def origin(origin_server):
+    """Basis-URL des Ersatz-Bildservers; "localhost" ist als privater Bild-Host freigegeben"""
+    return f"http://localhost:{origin_server.port}"
+
+
+@pytest.fixture(autouse=True)
+def small_limit(monkeypatch):
+    monkeypatch.setattr(image_service, "MAX_SOURCE_BYTES", 50_000)
+    monkeypatch.setattr(image_service, "ALLOWED_PRIVATE_HOSTS", {"localhost"})
+    OriginHandler.requests.clear()
+
+
+def plant_info(db, image_url, owner_user_id=None):
+    info = models.PlantInfo(trefle_id=None, scientific_name="Bildtest", image_url=image_url, owner_user_id=owner_user_id)
+    db.add(info)
+    db.commit()
+    return info.id
+
+
+def test_thumbnail_is_fetched_once_and_cached(client, db, origin):
+    info_id = plant_info(db, f"{origin}/plant-{id(db)}.png")
+
+    first = client.get(f"/images/{info_id}")
+    second = client.get(f"/images/{info_id}", headers={"If-None-Match": first.headers["etag"]})
+
+    assert first.status_code == 200
+    if image_service.Image is None:
+        assert first.content == PNG  # ohne Pillow wird das Original ausgeliefert
+    else:
+        assert first.headers["content-type"] == "image/webp"
+    assert second.status_code == 304
+    assert len(OriginHandler.requests) == 1
+
+
+@pytest.mark.parametrize("name", ["declared-huge", "chunked-huge"])
+def test_oversized_originals_are_rejected(client, db, origin, name):
+    info_id = plant_info(db, f"{origin}/{name}-{id(db)}.png")
+
+    response = client.get(f"/images/{info_id}")
+
+    assert response.status_code == 502
+    assert "zu groß" in response.json()["detail"]
+
+
+def test_streamed_read_stops_at_the_limit(origin, monkeypatch):
+    read = []
+    original_iter = image_service.requests.Response.iter_content
+
+    def counting_iter(self, chunk_size=1, decode_unicode=False):
+        for chunk in original_iter(self, chunk_size, decode_unicode):
+            read.append(len(chunk))
+            yield chunk
+
+    monkeypatch.setattr(image_service.requests.Response, "iter_content", counting_iter)
+    with pytest.raises(image_service.ImageFetchError):
+        image_service._fetch_original(f"{origin}/chunked-huge-direct.png")
+    assert sum(read) <= image_service.MAX_SOURCE_BYTES + image_service.CHUNK_SIZE
+
+
+def test_origin_errors_become_502(client, db, origin):
+    info_id = plant_info(db, f"{origin}/missing.png")
+    assert client.get(f"/images/{info_id}").status_code == 502
+
+
+def test_images_require_login(anonymous, db, origin):
+    info_id = plant_info(db, f"{origin}/plant-anon.png")
+    assert anonymous.get(f"/images/{info_id}").status_code == 401
+    assert OriginHandler.requests == []
+
+
+def test_other_users_plant_infos_are_hidden(client, db, origin):
+    other_id, _ = create_user()
+    info_id = plant_info(db, f"{origin}/plant-private.png", owner_user_id=other_id)
+    assert client.get(f"/images/{info_id}").status_code == 404
+    assert OriginHandler.requests == []
+
+
+@pytest.mark.parametrize("url", [
+    "http://127.0.0.1/x.png",
+    "http://10.0.0.5/x.png",
+    "http://169.254.169.254/latest/meta-data/",
+    "http://[::1]/x.png",
+    "file:///etc/passwd",
+    "ftp://example.com/x.png",
+])
+def test_non_public_urls_are_rejected(url):
+    with pytest.raises(image_service.ImageURLRejected):
+        image_service.check_url(url)
+
+
+def test_imported_internal_image_url_is_never_fetched(client, user, db, origin_server):
+    line = {"type": "plant_info", "trefle_id": 4242, "scientific_name": "SSRF",
+            "image_url": f"http://127.0.0.1:{origin_server.port}/plant-secret.png"}
+    assert client.post("/import", files={"file": ("x.jsonl", orjson.dumps(line))}).status_code == 200
+    info_id = db.query(models.PlantInfo.id).filter(models.PlantInfo.owner_user_id == user[0]).scalar()
+
+    response = client.get(f"/images/{info_id}")
+
+    assert response.status_code == 404
+    assert OriginHandler.requests == []
+
+
+def test_redirect_to_internal_address_is_rejected(client, db, origin):
+    info_id = plant_info(db, f"{origin}/redirect-internal-{id(db)}.png")
+
+    assert client.get(f"/images/{info_id}").status_code == 404
+    assert OriginHandler.requests == [f"/redirect-internal-{id(db)}.png"]  # Ziel nie abgerufen
+
+
+class FakePIL:
+    """Verhält sich bei kaputten Daten wie Pillow (UnidentifiedImageError ist ein OSError)"""
+    LANCZOS = 1
+
+    class DecompressionBombError(Exception):
+        pass
+
+    @staticmethod
+    def open(buffer):
+        raise OSError("cannot identify image file")
+
+
+def test_undecodable_original_becomes_502(client, db, origin, monkeypatch):
+    monkeypatch.setattr(image_service, "Image", FakePIL)
+    info_id = plant_info(db, f"{origin}/garbage-{id(db)}.png")
+
+    response = client.get(f"/images/{info_id}")
+
+    assert response.status_code == 502
+    assert "Kein gültiges Bild" in response.json()["detail"]
+
+
+def test_undecodable_original_with_pillow():
+    pytest.importorskip("PIL")
+    with pytest.raises(image_service.ImageFetchError):
+        image_service._resize(b"<html>kein Bild</html>", 160)
+
+
+def test_cache_hits_only_write_after_the_touch_interval(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("services.image_cache.time.time", lambda: now[0])
+    cache = ImageCache(str(tmp_path), touch_interval_seconds=60)
+    cache.put("k", PNG, "image/png", '"e"')
+
+    def last_access():
+        return cache._conn.execute("SELECT last_access FROM thumbnails WHERE key = 'k'").fetchone()[0]
+
+    now[0] += 30
+    assert cache.get("k") is not None
+    assert last_access() == 1000.0
+    now[0] += 31
+    assert cache.get("k") is not None
+    assert last_access() == 1061.0
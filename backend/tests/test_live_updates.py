@@ -0,0 +1,98 @@
+# backend/tests/test_live_updates.py
+"""Broker direkt auf einem eigenen Event-Loop (asyncio.run), Endpoints über den TestClient im Thread"""
+import asyncio
+import json
+
+import live_updates
+from conftest import add_location, add_plant
+
+
+async def next_message(subscriber, timeout: float = 5):
+    return await asyncio.wait_for(subscriber.queue.get(), timeout)
+
+
+def test_publish_reaches_only_subscribers_of_that_user():
+    async def scenario():
+        broker = live_updates.EventBroker()
+        mine, also_mine = broker.subscribe(1), broker.subscribe(1)
+        other = broker.subscribe(2)
+        assert broker.stats()["connections"] == 3
+
+        assert broker.publish(1, "plant_removed", {"id": 7}) == 2
+        assert await next_message(mine) == ("plant_removed", '{"id": 7}')
+        assert await next_message(also_mine) == ("plant_removed", '{"id": 7}')
+        assert other.queue.empty()
+
+        broker.unsubscribe(mine)
+        broker.unsubscribe(also_mine)
+        assert not broker.has_subscribers(1)
+        assert broker.publish(1, "plant_removed", {"id": 8}) == 0
+        assert broker.stats() == {"users": 1, "connections": 1, "published": 1}
+
+    asyncio.run(scenario())
+
+
+def test_queue_overflow_is_replaced_by_resync():
+    async def scenario():
+        subscriber = live_updates.Subscriber(1, asyncio.get_running_loop(), queue_size=2)
+        for i in range(3):
+            subscriber.offer(("task_updated", str(i)))
+
+        assert subscriber.queue.qsize() == 1
+        assert subscriber.queue.get_nowait() == ("resync", "{}")
+
+        # Danach geht es normal weiter
+        subscriber.offer(("task_updated", "3"))
+        assert subscriber.queue.get_nowait() == ("task_updated", "3")
+
+    asyncio.run(scenario())
+
+
+def test_publish_to_a_closed_loop_unsubscribes():
+    broker = live_updates.EventBroker()
+
+    async def subscribe():
+        return broker.subscribe(1)
+
+    subscriber = asyncio.run(subscribe())  # Loop ist danach geschlossen
+
+    assert broker.publish(1, "resync", {}) == 1
+    assert not broker.has_subscribers(1)
+    assert subscriber.queue.empty()
+
+
+def test_stream_formats_events_and_unsubscribes_on_disconnect(monkeypatch):
+    broker = live_updates.EventBroker()
+    monkeypatch.setattr(live_updates, "broker", broker)
+
+    async def scenario():
+        stream = live_updates.stream(5, keepalive=0.05)
+        assert await stream.__anext__() == "retry: 3000\nid: 0\nevent: ready\ndata: {}\n\n"
+        assert await stream.__anext__() == ": keepalive\n\n"
+
+        broker.publish(5, "plant_removed", {"id": 3})
+        assert await stream.__anext__() == 'id: 1\nevent: plant_removed\ndata: {"id": 3}\n\n'
+
+        await stream.aclose()  # Client trennt die Verbindung
+        assert broker.stats()["connections"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_write_endpoint_pushes_task_to_subscriber(client, user):
+    plant_id = add_plant(client, 9950, add_location(client))
+
+    async def scenario():
+        subscriber = live_updates.broker.subscribe(user[0])
+        try:
+            response = await asyncio.to_thread(client.post, f"/my-plants/{plant_id}/water")
+            assert response.status_code == 200, response.text
+            return await next_message(subscriber)
+        finally:
+            live_updates.broker.unsubscribe(subscriber)
+
+    event, payload = asyncio.run(scenario())
+
+    assert event == "task_updated"
+    [task] = json.loads(payload)["tasks"]
+    assert (task["id"], task["days_until_watering"]) == (plant_id, 7)
@@ -0,0 +1,68 @@
+# backend/tests/test_migrations.py
+from datetime import date
+
+from sqlalchemy import create_engine, inspect, text
+
+import migrations
+import models
+
+# Schema der ursprünglichen plants.db (vor Mehrbenutzer-Betrieb und Migrationen)
+BASELINE_SCHEMA = [
+    """CREATE TABLE plant_infos (
+        id INTEGER NOT NULL, trefle_id INTEGER, scientific_name VARCHAR, common_name VARCHAR, image_url VARCHAR,
+        water_frequency_days INTEGER, fertilize_frequency_days INTEGER, repot_frequency_days INTEGER,
+        prune_frequency_days INTEGER, propagate_frequency_days INTEGER, sunlight_requirement INTEGER,
+        humidity_requirement INTEGER, temperature_min INTEGER, temperature_max INTEGER, max_height_cm INTEGER,
+        soil_type VARCHAR, is_toxic BOOLEAN, PRIMARY KEY (id), UNIQUE (trefle_id))""",
+    """CREATE TABLE locations (
+        id INTEGER NOT NULL, name VARCHAR, light_level INTEGER, humidity_level INTEGER, temperature_avg INTEGER,
+        available_space_cm INTEGER, has_pets_or_children BOOLEAN, PRIMARY KEY (id))""",
+    """CREATE TABLE my_plants (
+        id INTEGER NOT NULL, nickname VARCHAR, date_acquired DATE, last_watered DATE, last_fertilized DATE,
+        last_repotted DATE, last_pruned DATE, last_propagated DATE, plant_info_id INTEGER, location_id INTEGER,
+        PRIMARY KEY (id), FOREIGN KEY(plant_info_id) REFERENCES plant_infos (id),
+        FOREIGN KEY(location_id) REFERENCES locations (id))""",
+    """CREATE TABLE wishlist (
+        id INTEGER NOT NULL, trefle_id INTEGER, plant_info_id INTEGER, added_date DATE, PRIMARY KEY (id),
+        UNIQUE (trefle_id), FOREIGN KEY(plant_info_id) REFERENCES plant_infos (id))""",
+]
+
+
+def baseline_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'baseline.db'}")
+    with engine.begin() as conn:
+        for ddl in BASELINE_SCHEMA:
+            conn.execute(text(ddl))
+        conn.execute(text("INSERT INTO plant_infos (id, trefle_id, scientific_name) VALUES (1, 42, 'Ficus lyrata')"))
+        conn.execute(text("INSERT INTO locations (id, name) VALUES (1, 'Fensterbank')"))
+        conn.execute(text("INSERT INTO my_plants (id, nickname, last_watered, plant_info_id, location_id) "
+                          "VALUES (1, 'Fidi', '2024-03-01', 1, 1)"))
+    return engine
+
+
+def test_upgrade_brings_baseline_db_to_model_schema(tmp_path):
+    engine = baseline_engine(tmp_path)
+
+    done = migrations.upgrade(engine)
+
+    versions = [version for version, _ in migrations.discover()]
+    assert versions[:5] == ["0001", "0002", "0003", "0004", "0005"]
+    assert done == versions
+    with engine.connect() as conn:
+        recorded = [row[0] for row in conn.execute(text("SELECT version FROM schema_migrations ORDER BY version"))]
+    assert recorded == versions
+
+    inspector = inspect(engine)
+    for table in models.Base.metadata.sorted_tables:
+        columns = {c["name"] for c in inspector.get_columns(table.name)}
+        assert columns == {c.name for c in table.columns}, table.name
+    indexes = {i["name"] for i in inspector.get_indexes("my_plants")}
+    assert {"ix_my_plants_user_next_any_due", "ix_my_plants_next_water_due"} <= indexes
+
+    # Bestehende Zeilen bleiben erhalten, neue Spalten sind NULL
+    with engine.connect() as conn:
+        row = conn.execute(text("SELECT nickname, last_watered, user_id, next_water_due FROM my_plants")).one()
+    assert (row[0], row[1], row[2], row[3]) == ("Fidi", str(date(2024, 3, 1)), None, None)
+
+    assert migrations.upgrade(engine) == []
+    assert all(s["applied"] for s in migrations.status(engine))
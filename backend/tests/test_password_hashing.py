@@ -0,0 +1,70 @@
+# backend/tests/test_password_hashing.py
+import threading
+
+from passlib.context import CryptContext
+
+import auth
+import database
+import models
+import password_hashing
+from conftest import create_user
+
+
+def bcrypt_ctx(rounds):
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__default_rounds=rounds,
+                        bcrypt__min_rounds=rounds, bcrypt__max_rounds=rounds)
+
+
+def user_with_password(password, rounds):
+    user_id, username = create_user()
+    db = database.SessionLocal()
+    try:
+        db.get(models.User, user_id).password_hash = bcrypt_ctx(rounds).hash(password)
+        db.commit()
+    finally:
+        db.close()
+    return user_id, username
+
+
+def stored_hash(user_id):
+    db = database.SessionLocal()
+    try:
+        return db.get(models.User, user_id).password_hash
+    finally:
+        db.close()
+
+
+def test_login_answers_503_when_hash_pool_is_full(anonymous, monkeypatch):
+    _, username = user_with_password("geheim", rounds=4)
+    hasher = password_hashing.PasswordHasher(workers=1, queue_size=0)
+    monkeypatch.setattr(auth, "hasher", hasher)
+    release = threading.Event()
+    blocker = hasher._submit(release.wait)  # einziger Slot belegt
+    try:
+        response = anonymous.post("/auth/login", data={"username": username, "password": "geheim"})
+    finally:
+        release.set()
+        blocker.result(5)
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    assert hasher.rejected == 1
+    # Slot ist wieder frei
+    assert anonymous.post("/auth/login", data={"username": username, "password": "geheim"}).status_code == 200
+
+
+def test_login_rehashes_after_cost_factor_change(anonymous, monkeypatch):
+    user_id, username = user_with_password("geheim", rounds=4)
+    old_hash = stored_hash(user_id)
+    # BCRYPT_ROUNDS wurde von 4 auf 5 erhöht
+    monkeypatch.setattr(password_hashing, "pwd_ctx", bcrypt_ctx(5))
+
+    assert anonymous.post("/auth/login", data={"username": username, "password": "geheim"}).status_code == 200
+
+    new_hash = stored_hash(user_id)
+    assert new_hash != old_hash and new_hash.startswith("$2b$05$")
+    assert bcrypt_ctx(5).verify("geheim", new_hash)
+    # Beim nächsten Login passt der Kostenfaktor, kein weiterer Schreibzugriff
+    assert anonymous.post("/auth/login", data={"username": username, "password": "geheim"}).status_code == 200
+    assert stored_hash(user_id) == new_hash
+    assert anonymous.post("/auth/login", data={"username": username, "password": "falsch"}).status_code == 401
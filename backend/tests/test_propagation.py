@@ -0,0 +1,87 @@
+# backend/tests/test_propagation.py
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+
+import models
+import propagation
+from conftest import add_location, add_plant, create_user, login
+
+
+def propagate(client, plant_id, **params):
+    return client.post(f"/my-plants/{plant_id}/propagate", params=params)
+
+
+def test_cuttings_are_spread_over_locations_in_turn(client, user, db):
+    window = add_location(client, "Fensterbank")
+    shelf = add_location(client, "Regal")
+    balcony = add_location(client, "Balkon")
+    mother = add_plant(client, 9960, window, nickname="Mama")
+
+    response = propagate(client, mother, count=7, location_id=[shelf, balcony, shelf])
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert (body["created"], len(body["ids"])) == (7, 7)
+    cuttings = [db.get(models.MyPlant, i) for i in body["ids"]]
+    assert [c.location_id for c in cuttings] == [shelf, balcony] * 3 + [shelf]
+    assert [c.nickname for c in cuttings] == [f"Ableger von Mama #{n}" for n in range(1, 8)]
+    assert {(c.user_id, c.last_watered, c.next_water_due is not None) for c in cuttings} == {(user[0], date.today(), True)}
+
+    db.expire_all()
+    assert db.get(models.MyPlant, mother).last_propagated == date.today()
+    tasks = {t["id"] for t in client.get("/dashboard/tasks").json()}
+    assert set(body["ids"]) <= tasks
+
+
+def test_without_locations_cuttings_stay_with_the_mother(client, db):
+    shelf = add_location(client, "Regal")
+    mother = add_plant(client, 9962, shelf)
+
+    ids = propagate(client, mother, count=2).json()["ids"]
+
+    assert [db.get(models.MyPlant, i).location_id for i in ids] == [shelf, shelf]
+
+
+def test_count_is_bounded(client, user, db, monkeypatch):
+    monkeypatch.setattr(propagation, "MAX_CUTTINGS", 3)
+    mother = add_plant(client, 9964, add_location(client))
+
+    assert propagate(client, mother, count=0).status_code == 400
+    too_many = propagate(client, mother, count=4)
+    assert too_many.status_code == 400
+    assert "max 3" in too_many.json()["detail"]
+    assert propagate(client, mother, count=3).status_code == 200
+    assert db.query(models.MyPlant).filter(models.MyPlant.user_id == user[0]).count() == 1 + 3
+
+
+def test_foreign_plant_or_location_is_not_found(app, client, user, db):
+    location_id = add_location(client)
+    mother = add_plant(client, 9966, location_id)
+    stranger = login(TestClient(app), *create_user())
+    foreign_location = add_location(stranger, "Fremder Balkon")
+    foreign_plant = add_plant(stranger, 9968, foreign_location)
+
+    assert propagate(client, foreign_plant).status_code == 404
+    assert propagate(stranger, mother).status_code == 404
+    response = propagate(client, mother, count=2, location_id=[location_id, foreign_location])
+    assert response.status_code == 404
+
+    db.expire_all()
+    assert db.query(models.MyPlant).filter(models.MyPlant.user_id == user[0]).count() == 1
+
+
+@pytest.mark.parametrize("returning", [True, False])
+def test_insert_cuttings_returns_ids_in_row_order(client, db, monkeypatch, returning):
+    location_id = add_location(client)
+    mother = db.get(models.MyPlant, add_plant(client, 9970, location_id))
+    # Ältere SQLite ohne RETURNING: ein INSERT pro Zeile
+    monkeypatch.setattr(db.get_bind().dialect, "insert_returning", returning)
+    rows = propagation.cutting_rows(mother, mother.plant_info, 12, [location_id], date.today())
+
+    ids = propagation.insert_cuttings(db, rows)
+    db.commit()
+
+    assert [db.get(models.MyPlant, i).nickname for i in ids] == [r["nickname"] for r in rows]
+    assert propagation.insert_cuttings(db, []) == []
@@ -0,0 +1,80 @@
+# backend/tests/test_query_budget.py
+"""
+SQL-Statements pro Request für die Listen-Endpoints: konstant, egal wie viele Pflanzen ein User hat
+(kein N+1 über lazy Relationships). Gezählt wird über den X-SQL-Queries-Header der Middleware.
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+import query_budget
+from conftest import add_location, add_plant, add_wish, create_user, login
+
+READ_PATHS = {
+    "/dashboard/tasks": 2,
+    "/wishlist/": 3,
+    "/locations/": 2,
+    "/locations/overview": 4,
+    "/locations/{location_id}/details": 3,
+}
+
+
+def fill(client, plants: int, wishes: int):
+    location_id = add_location(client)
+    add_location(client, "Bad", light_level=2, humidity_level=9)
+    for i in range(plants):
+        add_plant(client, 100 + i, location_id)
+    for i in range(wishes):
+        add_wish(client, 500 + i)
+    return location_id
+
+
+def statements(client, path: str):
+    response = client.get(path)
+    assert response.status_code == 200, response.text
+    return int(response.headers["x-sql-queries"])
+
+
+@pytest.fixture
+def counts(app, trefle):
+    """Statements je Pfad für einen kleinen und einen großen Bestand"""
+    result = {}
+    for size in (1, 12):
+        client = login(TestClient(app), *create_user())
+        location_id = fill(client, plants=size, wishes=size)
+        result[size] = {
+            path: statements(client, path.format(location_id=location_id)) for path in READ_PATHS
+        }
+    return result
+
+
+def test_read_paths_do_not_grow_with_the_data(counts):
+    assert counts[12] == counts[1]
+
+
+@pytest.mark.parametrize("path,limit", READ_PATHS.items())
+def test_read_paths_stay_within_budget(counts, path, limit):
+    assert counts[12][path] <= limit
+
+
+def test_assert_max_queries_fails_over_the_limit(db):
+    with query_budget.assert_max_queries(2) as counter:
+        for _ in range(2):
+            db.connection().exec_driver_sql("SELECT 1")
+    assert counter.count == 2
+
+    with pytest.raises(query_budget.QueryBudgetExceeded):
+        with query_budget.assert_max_queries(2):
+            for _ in range(3):
+                db.connection().exec_driver_sql("SELECT 1")
+
+
+def test_strict_mode_turns_the_response_into_a_500(client, monkeypatch):
+    add_location(client)
+    monkeypatch.setattr(query_budget, "STRICT", True)
+    monkeypatch.setitem(query_budget.budgets, "/locations/", 1)
+
+    response = client.get("/locations/")
+
+    assert response.status_code == 500
+    assert "SQL-Budget" in response.json()["detail"]
+    assert int(response.headers["x-sql-queries"]) > 1
@@ -0,0 +1,64 @@
+# backend/tests/test_schemas.py
+"""
+Die heißen Endpoints umgehen mit schemas.fast_response() die Validierung durch FastAPI.
+Hier wird jede dieser Antworten gegen ihr response_model geprüft: Felder, Typen und keine zusätzlichen Keys.
+"""
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.routing import APIRoute
+from pydantic import parse_obj_as
+
+import main
+from conftest import add_location, add_plant, add_wish
+
+FAST_PATHS = [
+    "/plants/search/{query}",
+    "/locations/",
+    "/wishlist/",
+    "/locations/overview",
+    "/locations/{location_id}/details",
+    "/dashboard/tasks",
+    "/my-plants/{plant_id}/history",
+    "/my-plants/{plant_id}/recommended-locations",
+    "/wishlist/{wishlist_id}/recommended-locations",
+]
+
+
+def response_model(path: str):
+    for route in main.app.routes:
+        if isinstance(route, APIRoute) and route.path == path and "GET" in route.methods:
+            return route.response_model
+    raise LookupError(path)
+
+
+@pytest.fixture
+def ids(client):
+    location_id = add_location(client, has_pets_or_children=True)
+    add_location(client, "Bad", light_level=2, humidity_level=9)
+    plant_id = add_plant(client, 201, location_id)
+    add_plant(client, 202, location_id)
+    wishlist_id = add_wish(client, 203)
+    client.post(f"/my-plants/{plant_id}/water")
+    client.post(f"/my-plants/{plant_id}/fertilize")
+    return {"location_id": location_id, "plant_id": plant_id, "wishlist_id": wishlist_id, "query": "monstera"}
+
+
+@pytest.mark.parametrize("path", FAST_PATHS)
+def test_fast_responses_match_their_schema(client, ids, path):
+    response = client.get(path.format(**ids))
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body, f"{path}: leere Antwort prüft nichts"
+
+    parsed = parse_obj_as(response_model(path), body)
+
+    assert jsonable_encoder(parsed) == body
+
+
+def test_every_fast_response_endpoint_is_covered():
+    import inspect
+    used = {
+        route.path for route in main.app.routes
+        if isinstance(route, APIRoute) and "fast_response" in inspect.getsource(route.endpoint)
+    }
+    assert used == set(FAST_PATHS)
@@ -0,0 +1,169 @@
+# backend/tests/test_search_cache.py
+import asyncio
+import threading
+import time
+
+import pytest
+
+from services.search_cache import SearchCache
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def test_keys_are_normalized():
+    cache = SearchCache()
+    calls = []
+    fetch = lambda q: calls.append(q) or [{"id": 1}]
+
+    assert cache.get_or_fetch("  Rose ", fetch) == [{"id": 1}]
+    assert cache.get_or_fetch("rOSE", fetch) == [{"id": 1}]
+
+    assert calls == ["rose"]
+    assert (cache.stats()["misses"], cache.stats()["hits"]) == (1, 1)
+
+
+def test_failed_fetch_is_not_cached():
+    cache = SearchCache()
+    results = iter([None, [{"id": 2}]])
+
+    assert cache.get_or_fetch("ficus", lambda q: next(results)) is None
+    assert cache.get_or_fetch("ficus", lambda q: next(results)) == [{"id": 2}]
+
+
+def test_entries_expire(monkeypatch):
+    cache = SearchCache(ttl_seconds=10)
+    now = [1000.0]
+    monkeypatch.setattr("services.search_cache.time.monotonic", lambda: now[0])
+    cache.put("rose", [1])
+
+    now[0] += 9
+    assert cache.get_or_fetch("rose", lambda q: [2]) == [1]
+    now[0] += 2
+    assert cache.get_or_fetch("rose", lambda q: [2]) == [2]
+
+
+def test_lru_eviction_by_entries_and_bytes():
+    cache = SearchCache(max_entries=2)
+    cache.put("a", [1])
+    cache.put("b", [2])
+    cache.get_or_fetch("a", lambda q: None)  # a zuletzt benutzt
+    cache.put("c", [3])
+
+    assert cache.stats()["evictions"] == 1
+    assert cache.get_or_fetch("a", lambda q: "neu") == [1]
+    assert cache.get_or_fetch("b", lambda q: "neu") == "neu"
+
+    small = SearchCache(max_bytes=20)
+    small.put("x", "x" * 10)
+    small.put("y", "y" * 10)
+    assert small.stats()["entries"] == 1
+    assert small.stats()["bytes"] <= 20
+
+
+def test_concurrent_identical_queries_share_one_fetch():
+    cache = SearchCache()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fetch(query):
+        calls.append(query)
+        started.set()
+        release.wait(5)
+        return [{"id": 3}]
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_fetch("Monstera", fetch))) for _ in range(8)]
+    threads[0].start()
+    started.wait(5)
+    for t in threads[1:]:
+        t.start()
+    wait_until(lambda: cache.stats()["coalesced"] == 7)
+    release.set()
+    for t in threads:
+        t.join(5)
+
+    assert calls == ["monstera"]
+    assert results == [[{"id": 3}]] * 8
+    assert cache.stats()["inflight"] == 0
+
+
+def test_followers_see_the_leaders_error():
+    cache = SearchCache()
+    started = threading.Event()
+    release = threading.Event()
+
+    def fetch(query):
+        started.set()
+        release.wait(5)
+        raise RuntimeError("Trefle weg")
+
+    errors = []
+
+    def call():
+        try:
+            cache.get_or_fetch("rose", fetch)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=call)
+    follower.start()
+    wait_until(lambda: cache.stats()["coalesced"] == 1)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert errors == ["Trefle weg", "Trefle weg"]
+    assert cache.stats()["entries"] == 0
+
+
+def test_async_coalescing():
+    cache = SearchCache()
+    calls = []
+
+    async def fetch(query):
+        calls.append(query)
+        await asyncio.sleep(0.01)
+        return [{"id": 4}]
+
+    async def main():
+        return await asyncio.gather(*[cache.get_or_fetch_async("Aloe", fetch) for _ in range(5)])
+
+    assert asyncio.run(main()) == [[{"id": 4}]] * 5
+    assert calls == ["aloe"]
+    assert cache.stats()["coalesced"] == 4
+
+
+def test_async_followers_are_released_when_the_leader_is_cancelled():
+    cache = SearchCache()
+
+    async def fetch(query):
+        await asyncio.sleep(10)
+
+    async def main():
+        leader = asyncio.ensure_future(cache.get_or_fetch_async("aloe", fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(cache.get_or_fetch_async("aloe", fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(follower, 1)
+
+    asyncio.run(main())
+    assert cache.stats()["inflight"] == 0
+
+
+def test_search_endpoint_asks_trefle_once(client, trefle):
+    first = client.get("/plants/search/Calathea").json()
+    second = client.get("/plants/search/calathea ").json()
+
+    assert first == second
+    assert [q for path, q in trefle.calls if path == "/plants/search"] == ["calathea"]
@@ -0,0 +1,75 @@
+# backend/tests/test_sessions.py
+import threading
+
+import sessions
+from conftest import create_user
+
+
+def test_issue_and_verify_roundtrip():
+    token = sessions.issue(7, "anna", version=3, now=1_000_000)
+    principal = sessions.verify(token, now=1_000_100)
+    assert (principal.user_id, principal.username, principal.version) == (7, "anna", 3)
+
+
+def test_tampered_token_is_rejected():
+    version, period, payload, signature = sessions.issue(7, "anna").split(".")
+    forged = sessions.issue(8, "mallory").split(".")[2]
+    assert sessions.verify(".".join([version, period, forged, signature])) is None
+    assert sessions.verify("kein-token") is None
+
+
+def test_expired_token_is_rejected():
+    token = sessions.issue(7, "anna", now=1_000_000)
+    assert sessions.verify(token, now=1_000_000 + sessions.SESSION_TTL_SECONDS + 1) is None
+
+
+def test_token_survives_key_rotation():
+    token = sessions.issue(7, "anna", now=1_000_000)
+    later = 1_000_000 + 3 * sessions.KEY_ROTATION_SECONDS
+    assert sessions.verify(token, now=later).user_id == 7
+
+
+def test_logout_revokes_the_token(client, user):
+    token = client.cookies.get("care_for_plants_session")
+    assert client.get("/auth/me").status_code == 200
+
+    assert client.post("/auth/logout").status_code == 200
+
+    client.cookies.set("care_for_plants_session", token)  # gestohlenes/aufbewahrtes Token
+    assert client.get("/auth/me").status_code == 401
+
+
+def test_revoke_invalidates_all_sessions_of_the_user(app):
+    user_id, username = create_user()
+    first = sessions.issue(user_id, username)
+    second = sessions.issue(user_id, username)
+    cache = sessions.principal_cache
+    assert cache.get(first) and cache.get(second)
+
+    sessions.revoke(user_id)
+
+    assert cache.get(first) is None and cache.get(second) is None
+    assert cache.get(sessions.issue(user_id, username, version=1)).user_id == user_id
+
+
+def test_version_is_checked_on_cache_miss_only():
+    lookups = []
+    cache = sessions.PrincipalCache(version_lookup=lambda user_id: lookups.append(user_id) or 0)
+    token = sessions.issue(5, "bob")
+    for _ in range(3):
+        assert cache.get(token).user_id == 5
+    assert lookups == [5]
+
+
+def test_generated_secret_is_persisted_and_shared(tmp_path):
+    path = str(tmp_path / "session_secret")
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(sessions._read_or_create_secret(path))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(set(results)) == 1 and len(results[0]) == 64
+    assert sessions._read_or_create_secret(path) == results[0]
+    assert (tmp_path / "session_secret").stat().st_mode & 0o077 == 0
@@ -0,0 +1,98 @@
+# backend/tests/test_static_assets.py
+import gzip
+from types import SimpleNamespace
+
+import pytest
+
+import main
+import static_assets
+
+CSS = "body { color: green; }\n" * 100  # groß genug zum Komprimieren
+
+PAGE = """<!doctype html>
+<link rel="stylesheet" href="css/site.css">
+<img src="img/logo.svg" data-src="img/logo.svg" alt="img/logo.svg">
+<a href='img/logo.svg.txt'>Lizenz</a>
+<script>const fallback = "img/logo.svg";</script>
+"""
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    monkeypatch.setattr(static_assets, "brotli", SimpleNamespace(compress=lambda body, quality: b"br:" + body))
+    (tmp_path / "css").mkdir()
+    (tmp_path / "img").mkdir()
+    (tmp_path / "css" / "site.css").write_text(CSS)
+    (tmp_path / "img" / "logo.svg").write_text("<svg/>")
+    (tmp_path / "img" / "logo.svg.txt").write_text("CC-BY")
+    (tmp_path / "index.html").write_text(PAGE)
+    assets = static_assets.StaticAssets(tmp_path)
+    assets.build()
+    return assets
+
+
+def request(**headers):
+    return SimpleNamespace(headers={k.replace("_", "-"): v for k, v in headers.items()})
+
+
+def test_page_rewrites_only_src_and_href_attributes(site):
+    html = site.pages[("index.html", False)].variants["identity"].decode()
+    logo, css, license_url = site.url_for("img/logo.svg"), site.url_for("css/site.css"), site.url_for("img/logo.svg.txt")
+
+    assert f'href="{css}"' in html
+    assert f'<img src="{logo}" data-src="img/logo.svg" alt="img/logo.svg">' in html
+    assert f"href='{license_url}'" in html
+    assert 'const fallback = "img/logo.svg";' in html
+    assert license_url.startswith("/assets/img/logo.svg.") and license_url.endswith(".txt")
+
+
+@pytest.mark.parametrize("accept, encoding", [
+    ("gzip, deflate, br", "br"),
+    ("gzip;q=1.0, deflate", "gzip"),
+    ("", None),
+])
+def test_encoding_follows_accept_encoding(site, accept, encoding):
+    path = site.url_for("css/site.css")[len(static_assets.PREFIX) + 1:]
+
+    response = site.asset_response(path, request(accept_encoding=accept))
+
+    assert response.headers.get("content-encoding") == encoding
+    assert response.headers["vary"] == "Accept-Encoding"
+    if encoding == "gzip":
+        assert gzip.decompress(response.body).decode() == CSS
+    elif encoding == "br":
+        assert response.body == b"br:" + CSS.encode()
+    else:
+        assert response.body.decode() == CSS
+
+
+def test_small_files_are_not_compressed(site):
+    path = site.url_for("img/logo.svg")[len(static_assets.PREFIX) + 1:]
+    assert "content-encoding" not in site.asset_response(path, request(accept_encoding="gzip, br")).headers
+
+
+def test_hashed_asset_is_immutable_and_revalidates(anonymous):
+    url = main.assets.url_for("img/icons/water.png")
+    assert url != "/assets/img/icons/water.png"
+
+    response = anonymous.get(url)
+
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == static_assets.IMMUTABLE
+    assert response.headers["content-type"] == "image/png"
+    again = anonymous.get(url, headers={"If-None-Match": response.headers["etag"]})
+    assert (again.status_code, again.content) == (304, b"")
+    assert anonymous.get("/assets/img/icons/water.png").status_code == 404
+
+
+def test_page_revalidates_per_encoding(anonymous):
+    plain = anonymous.get("/", headers={"Accept-Encoding": "identity"})
+    zipped = anonymous.get("/", headers={"Accept-Encoding": "gzip"})
+
+    assert plain.headers["cache-control"] == "no-cache"
+    assert main.assets.url_for("img/icons/water.png") in plain.text
+    assert zipped.headers["content-encoding"] == "gzip"
+    assert zipped.headers["etag"] != plain.headers["etag"]
+    assert zipped.text == plain.text
+    assert anonymous.get("/", headers={"Accept-Encoding": "gzip", "If-None-Match": zipped.headers["etag"]}).status_code == 304
+    assert anonymous.get("/", headers={"Accept-Encoding": "identity", "If-None-Match": zipped.headers["etag"]}).status_code == 200
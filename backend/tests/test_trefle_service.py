@@ -0,0 +1,75 @@
+# backend/tests/test_trefle_service.py
+import asyncio
+
+import pytest
+
+import models
+from conftest import StubTrefleClient
+from services import trefle_service
+
+
+class AsyncStubTrefleClient:
+    """Ersetzt trefle_service.async_client; gleiche Antworten wie der synchrone Stub"""
+
+    def __init__(self):
+        self._sync = StubTrefleClient()
+        self.calls = self._sync.calls
+
+    async def get(self, path: str, params: dict = None, with_token: bool = True):
+        await asyncio.sleep(0)
+        return self._sync.get(path, params, with_token)
+
+
+@pytest.fixture
+def async_trefle(trefle, monkeypatch):
+    stub = AsyncStubTrefleClient()
+    monkeypatch.setattr(trefle_service, "async_client", stub)
+    return stub
+
+
+def test_details_async_uses_async_client_and_cache(trefle, async_trefle):
+    details = asyncio.run(trefle_service.get_plant_details_async(9980))
+
+    assert details["common_name"] == "Monstera 9980"
+    assert (details["water_frequency_days"], details["sunlight_requirement"]) == (7, 7)
+    assert async_trefle.calls == [("/plants/9980", None)]
+    assert trefle.calls == []
+
+    # Zweiter Aufruf (auch synchron) kommt aus dem Detail-Cache
+    assert asyncio.run(trefle_service.get_plant_details_async(9980)) == details
+    assert trefle_service.get_plant_details(9980) == details
+    assert len(async_trefle.calls) == 1 and trefle.calls == []
+
+
+def test_details_async_falls_back_to_thread_without_httpx(trefle, monkeypatch):
+    monkeypatch.setattr(trefle_service, "async_client", None)
+
+    details = asyncio.run(trefle_service.get_plant_details_async(9982))
+
+    assert details["common_name"] == "Monstera 9982"
+    assert trefle.calls == [("/plants/9982", None)]
+
+
+def test_wishlist_fetches_details_with_async_client(client, db, trefle, async_trefle):
+    response = client.post("/wishlist/", json={"trefle_id": 9984})
+
+    assert response.status_code == 200, response.text
+    assert response.json()["enrichment_status"] == "ready"
+    assert async_trefle.calls == [("/plants/9984", None)]
+    assert trefle.calls == []
+    info = db.query(models.PlantInfo).filter(models.PlantInfo.trefle_id == 9984).one()
+    assert (info.common_name, info.water_frequency_days) == ("Monstera 9984", 7)
+
+    # Vorhandener Eintrag bzw. vorhandene PlantInfo: kein Trefle-Aufruf
+    assert client.post("/wishlist/", json={"trefle_id": 9984}).json()["status"] == "exists"
+    assert len(async_trefle.calls) == 1
+
+
+def test_wishlist_unknown_plant_is_not_found(client, async_trefle, monkeypatch):
+    async def missing(trefle_id):
+        return None
+
+    monkeypatch.setattr(trefle_service, "get_plant_details_async", missing)
+
+    assert client.post("/wishlist/", json={"trefle_id": 9986}).status_code == 404
+    assert client.get("/wishlist/").json() == []
@@ -0,0 +1,231 @@
+# benchmarks/fixtures.py
+"""
+Synthetische Daten für die Benchmarks:
+- ein User mit N Pflanzen, M Standorten und W Wunschlisten-Einträgen auf einer frischen SQLite-Datenbank
+- lokale Trefle-Attrappe (StubTrefleClient), die deterministische Trefle-Datensätze liefert
+
+configure() muss vor dem ersten Import aus backend/ laufen (DB-URL, Cache-Pfade werden beim Import gelesen).
+"""
+import os
+import random
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+
+SEED = 42
+BENCH_USER = "bench"
+
+# Gattungen aus allen Bereichen der Heuristik (Kakteen, Farne, Kräuter ...) plus "neutrale"
+GENERA = [
+    ("Monstera", "Araceae", "Monstera"),
+    ("Philodendron", "Araceae", "Philodendron"),
+    ("Opuntia", "Cactaceae", "Prickly pear cactus"),
+    ("Mammillaria", "Cactaceae", "Pincushion cactus"),
+    ("Echeveria", "Crassulaceae", "Echeveria"),
+    ("Aloe", "Asphodelaceae", "Aloe"),
+    ("Nephrolepis", "Lomariopsidaceae", "Boston fern"),
+    ("Asplenium", "Aspleniaceae", "Bird's nest fern"),
+    ("Ocimum", "Lamiaceae", "Sweet basil"),
+    ("Mentha", "Lamiaceae", "Peppermint"),
+    ("Phalaenopsis", "Orchidaceae", "Moth orchid"),
+    ("Chamaedorea", "Arecaceae", "Parlour palm"),
+    ("Citrus", "Rutaceae", "Lemon tree"),
+    ("Ficus", "Moraceae", "Weeping fig"),
+    ("Rosa", "Rosaceae", "Garden rose"),
+    ("Quercus", "Fagaceae", "Oak"),
+    ("Lavandula", "Lamiaceae", "Lavender"),
+    ("Hedera", "Araliaceae", "Ivy"),
+]
+
+# Szenarien: Pflanzen pro User, Standorte, Wunschliste, verschiedene Arten (PlantInfos)
+SCENARIOS = {
+    "small": {"plants": 10, "locations": 1, "wishlist": 10, "species": 10},
+    "medium": {"plants": 1000, "locations": 20, "wishlist": 100, "species": 200},
+    "large": {"plants": 100000, "locations": 200, "wishlist": 500, "species": 1000},
+}
+
+
+def configure(workdir):
+    """Umgebung für das Backend setzen: alle Dateien (DB, Caches) landen in workdir"""
+    workdir = Path(workdir)
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir / 'bench.db'}"
+    os.environ["TREFLE_DETAIL_CACHE_PATH"] = str(workdir / "trefle_detail_cache.db")
+    os.environ["IMAGE_CACHE_DIR"] = str(workdir / "image_cache")
+    os.environ["TREFLE_API_TOKEN"] = ""
+    os.environ.setdefault("SESSION_SECRET_KEYS", "benchmark-secret")
+    # Budget-Warnungen würden die Messung stören; X-SQL-Queries wird trotzdem gesetzt
+    os.environ["SQL_QUERY_BUDGET"] = "0"
+    if str(BACKEND_DIR) not in sys.path:
+        sys.path.insert(0, str(BACKEND_DIR))
+
+
+# --- Trefle-Attrappe ----------------------------------------------------------
+
+def trefle_record(trefle_id: int):
+    """Deterministischer Trefle-Datensatz; Felder fehlen zufällig, damit auch die Heuristik greift"""
+    rng = random.Random(trefle_id)
+    genus, family, common = GENERA[trefle_id % len(GENERA)]
+    growth = {}
+    specifications = {}
+    if rng.random() < 0.5:
+        growth["light"] = rng.randint(1, 10)
+    if rng.random() < 0.4:
+        growth["soil_humidity"] = rng.randint(1, 10)
+    if rng.random() < 0.3:
+        growth["minimum_temperature"] = {"deg_c": rng.randint(-5, 18)}
+        growth["maximum_temperature"] = {"deg_c": rng.randint(25, 40)}
+    if rng.random() < 0.3:
+        growth["soil_texture"] = rng.randint(0, 10)
+    if rng.random() < 0.3:
+        growth["atmospheric_humidity"] = rng.randint(1, 10)
+    if rng.random() < 0.4:
+        specifications["growth_rate"] = rng.choice(["slow", "moderate", "fast"])
+    if rng.random() < 0.3:
+        specifications["maximum_height"] = {"cm": rng.randint(10, 2000)}
+    if rng.random() < 0.2:
+        specifications["toxicity"] = rng.choice(["none", "low", "medium", "high"])
+
+    return {
+        "id": trefle_id,
+        "scientific_name": f"{genus} benchmarkii {trefle_id}",
+        "common_name": f"{common} {trefle_id}",
+        "image_url": f"https://bs.plantnet.org/image/o/{trefle_id:08x}.jpg",
+        "family": family,
+        "genus": genus,
+        "main_species": {
+            "family": {"name": family} if trefle_id % 2 else family,
+            "genus": {"name": genus} if trefle_id % 2 else genus,
+            "growth": growth,
+            "specifications": specifications,
+        },
+    }
+
+
+class StubResponse:
+    def __init__(self, status_code: int, payload):
+        self.status_code = status_code
+        self._payload = payload
+        self.text = str(payload)
+
+    def json(self):
+        return self._payload
+
+
+class StubTrefleClient:
+    """Ersetzt trefle_service.client: beantwortet /plants/{id} und /plants/search ohne Netzwerk"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def get(self, path: str, params: dict = None, with_token: bool = True):
+        self.calls += 1
+        if path == "/plants/search":
+            query = (params or {}).get("q", "")
+            start = sum(map(ord, query)) % 10000
+            return StubResponse(200, {"data": [trefle_record(start + i) for i in range(20)]})
+        if path.startswith("/plants/"):
+            return StubResponse(200, {"data": trefle_record(int(path.rsplit("/", 1)[1]))})
+        return StubResponse(404, {"error": "not found"})
+
+    def close(self):
+        pass
+
+
+def install_trefle_stub():
+    from services import trefle_service
+
+    stub = StubTrefleClient()
+    trefle_service.client = stub
+    trefle_service.async_client = None  # Async-Pfad fällt auf den (gestubbten) Sync-Client zurück
+    return stub
+
+
+# --- Datenbank ----------------------------------------------------------------
+
+def populate(db, plants: int, locations: int, wishlist: int, species: int, seed: int = SEED):
+    """
+    Legt den Benchmark-User samt Daten mit Sammel-INSERTs an (ohne Trefle, ohne Einzel-Requests).
+    Gibt die user_id zurück.
+    """
+    from sqlalchemy import insert
+
+    import models, care_schedule, compatibility
+
+    rng = random.Random(seed)
+    today = date.today()
+
+    user = models.User(username=BENCH_USER, password_hash="-")
+    db.add(user)
+    db.flush()
+
+    infos = []
+    for i in range(species):
+        record = trefle_record(i + 1)
+        infos.append({
+            "trefle_id": i + 1,
+            "scientific_name": record["scientific_name"],
+            "common_name": record["common_name"] if i % 7 else None,
+            "image_url": record["image_url"] if i % 3 else None,
+            "family": record["family"],
+            "genus": record["genus"],
+            "water_frequency_days": rng.choice([2, 3, 5, 7, 10, 14, 21]),
+            "fertilize_frequency_days": rng.choice([14, 30, 60]),
+            "repot_frequency_days": rng.choice([365, 730]),
+            "prune_frequency_days": 90,
+            "propagate_frequency_days": 180,
+            "sunlight_requirement": rng.randint(1, 10),
+            "humidity_requirement": rng.randint(1, 10),
+            "temperature_min": rng.randint(5, 18),
+            "temperature_max": rng.randint(22, 32),
+            "max_height_cm": rng.randint(20, 300),
+            "soil_type": rng.choice(["universal", "sandig", "lehmig", "humusreich"]),
+            "is_toxic": rng.random() < 0.2,
+            "enrichment_status": "ready",
+        })
+    info_ids = list(db.execute(insert(models.PlantInfo).returning(models.PlantInfo.id), infos).scalars())
+    info_by_id = {pid: models.PlantInfo(**values) for pid, values in zip(info_ids, infos)}
+
+    location_ids = list(db.execute(insert(models.Location).returning(models.Location.id), [
+        {
+            "user_id": user.id,
+            "name": f"Standort {i + 1}",
+            "light_level": rng.randint(1, 10),
+            "humidity_level": rng.randint(1, 10),
+            "temperature_avg": rng.randint(12, 28),
+            "available_space_cm": rng.randint(40, 300),
+            "has_pets_or_children": rng.random() < 0.3,
+        }
+        for i in range(locations)
+    ]).scalars())
+
+    wish_ids = rng.sample(info_ids, min(wishlist, len(info_ids)))
+    db.execute(insert(models.Wishlist), [
+        {"user_id": user.id, "trefle_id": info_by_id[pid].trefle_id, "plant_info_id": pid, "added_date": today}
+        for pid in wish_ids
+    ])
+
+    rows = []
+    for i in range(plants):
+        pid = rng.choice(info_ids)
+        values = {
+            "user_id": user.id,
+            "nickname": f"Pflanze {i + 1}",
+            "plant_info_id": pid,
+            "location_id": rng.choice(location_ids),
+            "date_acquired": today - timedelta(days=rng.randint(30, 900)),
+            "last_watered": today - timedelta(days=rng.randint(0, 20)),
+            "last_fertilized": today - timedelta(days=rng.randint(0, 60)),
+            "last_repotted": today - timedelta(days=rng.randint(0, 700)),
+            "last_pruned": today - timedelta(days=rng.randint(0, 90)),
+            "last_propagated": None,
+        }
+        values.update(care_schedule.due_dates(values, values["date_acquired"], info_by_id[pid]))
+        rows.append(values)
+    for start in range(0, len(rows), 10000):
+        db.execute(insert(models.MyPlant), rows[start:start + 10000])
+
+    compatibility.rebuild_user(db, user.id)
+    db.commit()
+    return user.id
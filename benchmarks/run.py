@@ -0,0 +1,226 @@
+# benchmarks/run.py
+"""
+Micro-Benchmarks der Backend-Hot-Paths mit synthetischen Daten (Trefle lokal gestubbt).
+
+Aufruf aus dem Repo-Root:
+    python benchmarks/run.py                                  # alle Szenarien (small, medium, large)
+    python benchmarks/run.py -s small -s medium --repeat 20
+    python benchmarks/run.py --baseline benchmarks/results/<alt>.json   # Vergleich mit früherem Lauf
+
+Jedes Szenario läuft in einem eigenen Prozess mit eigener Datenbank (die DB-URL wird beim Import gelesen).
+Ergebnis: JSON unter benchmarks/results/ (Median/p95/min in ms, SQL-Statements, Antwortgröße).
+"""
+import argparse
+import atexit
+import json
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import fixtures
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# Wiederholungen pro Szenario (große Szenarien brauchen pro Aufruf Sekunden)
+DEFAULT_REPEAT = {"small": 200, "medium": 50, "large": 5}
+WARMUP = 2
+# Datensätze für den Durchsatz der Pflegeprofil-Heuristik
+PROFILE_RECORDS = 5000
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return {
+        "runs": len(ordered),
+        "min_ms": round(ordered[0] * 1000, 3),
+        "median_ms": round(statistics.median(ordered) * 1000, 3),
+        "p95_ms": round(p95 * 1000, 3),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+    }
+
+
+def time_call(fn, repeat: int):
+    for _ in range(WARMUP):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def bench_endpoint(client, path: str, repeat: int):
+    last = {}
+
+    def call():
+        response = client.get(path)
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {path} -> {response.status_code}: {response.text[:200]}")
+        last["response"] = response
+
+    result = time_call(call, repeat)
+    response = last["response"]
+    result.update({
+        "path": path,
+        "sql_queries": int(response.headers.get("x-sql-queries", 0)),
+        "bytes": len(response.content),
+    })
+    return result
+
+
+def run_scenario(name: str, repeat: int):
+    """Läuft im Kind-Prozess: Daten anlegen, alle Fälle messen, Ergebnis-Dict zurückgeben"""
+    params = fixtures.SCENARIOS[name]
+    workdir = tempfile.mkdtemp(prefix=f"cfp-bench-{name}-")
+    atexit.register(shutil.rmtree, workdir, ignore_errors=True)
+    fixtures.configure(workdir)
+
+    import json as stdlib_json
+    import orjson
+    from fastapi.testclient import TestClient
+
+    import main, auth, database, models, sessions, care_schedule
+    from services import care_profile, trefle_service
+
+    stub = fixtures.install_trefle_stub()
+    results = {}
+
+    with TestClient(main.app) as client:
+        start = time.perf_counter()
+        db = database.SessionLocal()
+        try:
+            user_id = fixtures.populate(db, **params)
+            location_id = db.query(models.Location.id).filter(models.Location.user_id == user_id).order_by(models.Location.id).first()[0]
+            plant_id = db.query(models.MyPlant.id).filter(models.MyPlant.user_id == user_id).order_by(models.MyPlant.id).first()[0]
+            wishlist_id = db.query(models.Wishlist.id).filter(models.Wishlist.user_id == user_id).order_by(models.Wishlist.id).first()[0]
+        finally:
+            db.close()
+        setup_seconds = time.perf_counter() - start
+
+        client.cookies.set(auth.SESSION_COOKIE, sessions.issue(user_id, fixtures.BENCH_USER))
+
+        endpoints = {
+            "dashboard_tasks": "/dashboard/tasks",
+            "dashboard_tasks_7d": "/dashboard/tasks?days=7",
+            "get_wishlist": "/wishlist/",
+            "get_location_details": f"/locations/{location_id}/details",
+            "get_locations_overview": "/locations/overview",
+            "recommended_locations_myplant": f"/my-plants/{plant_id}/recommended-locations",
+            "recommended_locations_wishlist": f"/wishlist/{wishlist_id}/recommended-locations",
+        }
+        for case, path in endpoints.items():
+            results[case] = bench_endpoint(client, path, repeat)
+            print(f"  {name:8s} {case:32s} median {results[case]['median_ms']:10.3f} ms", file=sys.stderr)
+
+        # Serialisierung der größten Antwort (Dashboard) getrennt vom Rest des Requests
+        db = database.SessionLocal()
+        try:
+            today = datetime.now().date()
+            rows = care_schedule.task_query(db, user_id).order_by(models.MyPlant.next_any_due, models.MyPlant.id).all()
+            tasks = [care_schedule.build_task(row, today) for row in rows]
+            results["build_tasks"] = time_call(
+                lambda: [care_schedule.build_task(row, today) for row in rows], repeat)
+        finally:
+            db.close()
+        results["serialize_tasks_orjson"] = time_call(lambda: orjson.dumps(tasks), repeat)
+        results["serialize_tasks_json"] = time_call(lambda: stdlib_json.dumps(tasks).encode(), repeat)
+
+    # Pflegeprofil-Ableitung (Heuristik-Layer), Batch-API wie beim Katalog-Import
+    records = [fixtures.trefle_record(i) for i in range(PROFILE_RECORDS)]
+    start = time.perf_counter()
+    care_profile.derive_care_profiles(records)
+    elapsed = time.perf_counter() - start
+    results["derive_care_profile"] = {
+        "records": len(records),
+        "total_ms": round(elapsed * 1000, 3),
+        "records_per_second": round(len(records) / elapsed),
+    }
+
+    cold_ids = iter(range(10**6, 10**7))
+    results["get_plant_details_cold"] = time_call(lambda: trefle_service.get_plant_details(next(cold_ids)), repeat)
+    results["get_plant_details_warm"] = time_call(lambda: trefle_service.get_plant_details(1), repeat)
+
+    return {
+        "params": params,
+        "repeat": repeat,
+        "setup_seconds": round(setup_seconds, 3),
+        "trefle_stub_calls": stub.calls,
+        "results": results,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=Path(__file__).resolve().parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: dict, baseline_path: Path):
+    """Median-Vergleich mit einem früheren Lauf (positiv = langsamer geworden)"""
+    baseline = json.loads(baseline_path.read_text())
+    print(f"\nVergleich mit {baseline_path} ({baseline['meta'].get('git_revision')}):")
+    for name, scenario in current["scenarios"].items():
+        old_results = baseline["scenarios"].get(name, {}).get("results", {})
+        for case, result in scenario["results"].items():
+            old = old_results.get(case, {}).get("median_ms")
+            if old and "median_ms" in result:
+                delta = (result["median_ms"] - old) / old * 100
+                print(f"  {name:8s} {case:32s} {old:10.3f} -> {result['median_ms']:10.3f} ms ({delta:+6.1f} %)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks der Backend-Hot-Paths")
+    parser.add_argument("-s", "--scenario", action="append", choices=sorted(fixtures.SCENARIOS),
+                        help="Szenario (mehrfach möglich), Standard: alle")
+    parser.add_argument("--repeat", type=int, help="Wiederholungen pro Fall (Standard je nach Szenario)")
+    parser.add_argument("--output", type=Path, help="Ergebnisdatei (Standard: benchmarks/results/<Zeit>-<Commit>.json)")
+    parser.add_argument("--baseline", type=Path, help="früheres Ergebnis zum Vergleich")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        # Kind-Prozess: ein Szenario, Ergebnis als JSON auf stdout; Debug-Ausgaben des Backends nach stderr
+        stdout, sys.stdout = sys.stdout, sys.stderr
+        result = run_scenario(args.child, args.repeat or DEFAULT_REPEAT[args.child])
+        stdout.write(json.dumps(result))
+        return
+
+    revision = git_revision()
+    report = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_revision": revision,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "scenarios": {},
+    }
+    for name in args.scenario or list(fixtures.SCENARIOS):
+        print(f"Szenario {name} ...", file=sys.stderr)
+        command = [sys.executable, __file__, "--child", name]
+        if args.repeat:
+            command += ["--repeat", str(args.repeat)]
+        proc = subprocess.run(command, stdout=subprocess.PIPE, text=True, check=True)
+        report["scenarios"][name] = json.loads(proc.stdout)
+
+    output = args.output or RESULTS_DIR / f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{revision or 'local'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"Ergebnis: {output}", file=sys.stderr)
+
+    if args.baseline:
+        compare(report, args.baseline)
+
+
+if __name__ == "__main__":
+    main()